@@ -0,0 +1,105 @@
+import numpy as np
+
+from csrGraph import CSRGraph, graph_to_csr, induced_subgraph
+
+# Arestas processadas por bloco na união vetorizada
+CHUNK_EDGES = 1_000_000
+
+
+class UnionFind:
+    """
+    Union-find em arrays sobre índices densos 0..n-1.
+    As uniões são feitas em blocos de arestas: cada raiz maior é pendurada na menor com
+    np.minimum.at e os caminhos são comprimidos por saltos de ponteiro (parent = parent[parent]).
+    """
+
+    def __init__(self, n: int):
+        self.parent = np.arange(n, dtype=np.int64)
+
+    @property
+    def n(self) -> int:
+        return len(self.parent)
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return int(root)
+
+    def union(self, u: int, v: int):
+        ru, rv = self.find(u), self.find(v)
+        if ru != rv:
+            self.parent[max(ru, rv)] = min(ru, rv)
+
+    def _compress(self):
+        parent = self.parent
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                return
+            parent[:] = grandparent
+
+    def union_edges(self, src, dst):
+        """Une os extremos de um bloco de arestas de forma vetorizada."""
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        parent = self.parent
+        while len(src):
+            self._compress()
+            ru, rv = parent[src], parent[dst]
+            pending = ru != rv
+            if not pending.any():
+                return
+            src, dst, ru, rv = src[pending], dst[pending], ru[pending], rv[pending]
+            # Sempre pendura a raiz maior na menor: nunca forma ciclos, mesmo com conflitos no bloco
+            np.minimum.at(parent, np.maximum(ru, rv), np.minimum(ru, rv))
+
+    def roots(self) -> np.ndarray:
+        """Raiz de cada nó após compressão completa."""
+        self._compress()
+        return self.parent.copy()
+
+    def component_labels(self) -> np.ndarray:
+        """Rótulo denso do componente de cada nó; o componente 0 é o maior."""
+        _, inverse, sizes = np.unique(self.roots(), return_inverse=True, return_counts=True)
+        order = np.argsort(-sizes, kind="stable")
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        return rank[inverse]
+
+    def component_sizes(self) -> np.ndarray:
+        """Tamanhos dos componentes em ordem decrescente."""
+        sizes = np.bincount(self.roots(), minlength=self.n)
+        return np.sort(sizes[sizes > 0])[::-1]
+
+
+def components_from_edge_stream(n: int, edge_chunks) -> UnionFind:
+    """Processa um fluxo de blocos (src, dst) numa única passada, sem materializar o grafo."""
+    uf = UnionFind(n)
+    for src, dst in edge_chunks:
+        uf.union_edges(src, dst)
+    return uf
+
+
+def components_from_csr(csr: CSRGraph, chunk_edges: int = CHUNK_EDGES) -> UnionFind:
+    """Componentes conexos de um grafo CSR, percorrendo as arestas em blocos."""
+    rows = np.repeat(np.arange(csr.n, dtype=np.int64), csr.degrees)
+    upper = rows < csr.indices
+    src, dst = rows[upper], csr.indices[upper]
+    chunks = ((src[i:i + chunk_edges], dst[i:i + chunk_edges]) for i in range(0, len(src), chunk_edges))
+    return components_from_edge_stream(csr.n, chunks)
+
+
+def giant_component(csr: CSRGraph) -> tuple:
+    """Extrai o maior componente conexo como CSR compacto, junto com os índices originais dos nós."""
+    labels = components_from_csr(csr).component_labels()
+    return induced_subgraph(csr, labels == 0)
+
+
+def restrict_to_giant_component(G):
+    """Restringe um grafo NetworkX ao seu maior componente conexo, descartando nós isolados."""
+    giant, _ = giant_component(graph_to_csr(G))
+    return G.subgraph(giant.nodes).copy()
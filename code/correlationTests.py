@@ -0,0 +1,180 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import stats
+
+METHODS = ("pearson", "spearman")
+# Elementos (permutações ou reamostragens x conexões) materializados por lote
+CHUNK_ELEMENTS = 8_000_000
+
+# Estado de cada processo worker, preenchido uma vez pelo initializer (evita reenviar os dados por lote)
+_worker_state = {}
+
+
+def _standardize(values: np.ndarray) -> np.ndarray:
+    centered = values - values.mean()
+    norm = np.sqrt(np.dot(centered, centered))
+    return centered / norm if norm > 0 else centered
+
+
+def _prepare(x, y, methods) -> tuple:
+    """x e y padronizados (n x métodos): no Spearman, os postos padronizados."""
+    for method in methods:
+        if method not in METHODS:
+            raise ValueError(f"Método desconhecido: {method}. Use um de {METHODS}.")
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    zx, zy = [], []
+    for method in methods:
+        mx, my = (stats.rankdata(x), stats.rankdata(y)) if method == "spearman" else (x, y)
+        zx.append(_standardize(mx))
+        zy.append(_standardize(my))
+    return np.stack(zx, axis=1), np.stack(zy, axis=1)
+
+
+def _batches(total: int, n: int, seed: np.random.SeedSequence) -> list:
+    """Lotes (tamanho, semente) com uma semente filha por lote: o resultado não depende do número de workers."""
+    batch = max(1, CHUNK_ELEMENTS // max(1, n))
+    sizes = [min(batch, total - start) for start in range(0, total, batch)]
+    return list(zip(sizes, seed.spawn(len(sizes))))
+
+
+def _init_worker(packed, weights, features):
+    _worker_state.update(packed=packed, weights=weights, features=features)
+
+
+def _run_batches(function, batches: list, initargs: tuple, workers: int = None) -> list:
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(batches) <= 1:
+        _init_worker(*initargs)
+        return [function(size, seed) for size, seed in batches]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as executor:
+        sizes, seeds = zip(*batches)
+        return list(executor.map(function, sizes, seeds))
+
+
+def _pack(zy: np.ndarray) -> np.ndarray:
+    """
+    Empacota até dois y padronizados (float32) num único valor de 8 bytes por conexão: um só shuffle
+    permuta os dois métodos juntos, pelo caminho rápido do NumPy para itens de 8 bytes.
+    """
+    n, k = zy.shape
+    if k > 2:
+        raise ValueError("No máximo dois métodos por teste de permutação.")
+    pairs = np.zeros((n, 2), dtype=np.float32)
+    pairs[:, :k] = zy
+    return pairs.view(np.int64).ravel()
+
+
+def _permutation_block(size: int, seed) -> np.ndarray:
+    """Correlações (size x métodos) de size permutações: x padronizado contra a matriz de y permutados."""
+    packed, weights = _worker_state["packed"], _worker_state["weights"]
+    rng = np.random.default_rng(seed)
+    values = packed.copy()
+    block = np.empty((size, len(values)), dtype=values.dtype)
+    # Embaralhar de novo o vetor já embaralhado continua dando permutações uniformes e independentes
+    for row in block:
+        rng.shuffle(values)
+        row[:] = values
+    return block.view(np.float32) @ weights
+
+
+def _bootstrap_block(size: int, seed) -> np.ndarray:
+    """Somas ponderadas [x, y, x², y², xy] de cada método (size x 5·métodos) em size reamostragens."""
+    features = _worker_state["features"]
+    n = len(features)
+    rng = np.random.default_rng(seed)
+    draws = rng.integers(0, n, size=(size, n), dtype=np.int32)
+    counts = np.empty((size, n))
+    for row, drawn in zip(counts, draws):
+        row[:] = np.bincount(drawn, minlength=n)
+    return counts @ features
+
+
+def _weighted_pearson(n: int, sums: np.ndarray) -> np.ndarray:
+    """Pearson de cada reamostragem a partir das somas ponderadas [x, y, x², y², xy] (matriz size x 5)."""
+    sx, sy, sxx, syy, sxy = sums.T
+    numerator = n * sxy - sx * sy
+    denominator = np.sqrt(np.clip(n * sxx - sx ** 2, 0, None) * np.clip(n * syy - sy ** 2, 0, None))
+    return np.divide(numerator, denominator, out=np.zeros(len(numerator)), where=denominator > 0)
+
+
+def _correlation_tests(x, y, methods, n_permutations: int, n_resamples: int, confidence: float, seed,
+                       workers: int = None) -> dict:
+    """
+    Permutações e reamostragens compartilhadas pelos métodos pedidos: cada lote de permutações é um
+    shuffle por linha seguido de um produto matriz x pesos, e cada lote de reamostragens um bincount
+    por linha seguido de um produto pelas somas de todos os métodos.
+    """
+    zx, zy = _prepare(x, y, methods)
+    n, k = zx.shape
+    observed = np.einsum("ij,ij->j", zx, zy)
+
+    packed = _pack(zy.astype(np.float32))
+    # Pesos (2n x métodos): a coluna j tem x do método j nas posições do y empacotado desse método
+    weights = np.zeros((n, 2, k), dtype=np.float32)
+    weights[:, np.arange(k), np.arange(k)] = zx
+    features = np.concatenate([np.stack((zx[:, j], zy[:, j], zx[:, j] ** 2, zy[:, j] ** 2, zx[:, j] * zy[:, j]),
+                                        axis=1) for j in range(k)], axis=1)
+    initargs = (packed, weights.reshape(2 * n, k), features)
+
+    # Sementes separadas para permutações e reamostragens, como se fossem chamadas independentes
+    permutation_seed, resample_seed = np.random.SeedSequence(seed).spawn(2)
+    extreme = np.zeros(k, dtype=np.int64)
+    for block in _run_batches(_permutation_block, _batches(n_permutations, n, permutation_seed), initargs, workers):
+        # Tolerância relativa para não perder empates por arredondamento em float32
+        extreme += np.count_nonzero(np.abs(block) >= np.abs(observed) - 1e-6, axis=0)
+    sums = _run_batches(_bootstrap_block, _batches(n_resamples, n, resample_seed), initargs, workers)
+    sums = np.concatenate(sums) if sums else np.zeros((0, 5 * k))
+
+    alpha = (1 - confidence) / 2
+    report = {}
+    for j, method in enumerate(methods):
+        estimates = _weighted_pearson(n, sums[:, 5 * j:5 * j + 5])
+        low, high = np.quantile(estimates, [alpha, 1 - alpha]) if len(estimates) else (np.nan, np.nan)
+        report[method] = {
+            "r": float(observed[j]),
+            "p": (int(extreme[j]) + 1) / (n_permutations + 1),
+            "permutacoes": n_permutations,
+            "extremos": int(extreme[j]),
+            "ic_inferior": float(low),
+            "ic_superior": float(high),
+            "confianca": confidence,
+        }
+    return report
+
+
+def correlation(x, y, method: str = "pearson") -> float:
+    zx, zy = _prepare(x, y, (method,))
+    return float(np.dot(zx[:, 0], zy[:, 0]))
+
+
+def permutation_test(x, y, method: str = "pearson", n_permutations: int = 1_000, seed=None,
+                     workers: int = None) -> dict:
+    """
+    Teste de permutação bicaudal para a correlação entre x e y. extremos é o número de permutações
+    com correlação pelo menos tão extrema quanto a observada; com 0, o p-valor só diz p < 1/(permutações+1).
+    """
+    result = _correlation_tests(x, y, (method,), n_permutations, 0, 0.95, seed, workers)[method]
+    return {key: result[key] for key in ("r", "p", "permutacoes", "extremos")}
+
+
+def bootstrap_ci(x, y, method: str = "pearson", n_resamples: int = 1_000, confidence: float = 0.95,
+                 seed=None, workers: int = None) -> dict:
+    """
+    Intervalo de confiança percentil por bootstrap para a correlação entre x e y. No Spearman os
+    postos são calculados uma vez, nos dados originais, e cada reamostragem usa o Pearson desses postos.
+    """
+    result = _correlation_tests(x, y, (method,), 0, n_resamples, confidence, seed, workers)[method]
+    return {key: result[key] for key in ("r", "ic_inferior", "ic_superior", "confianca")}
+
+
+def correlation_report(x, y, n_permutations: int = 1_000, n_resamples: int = 1_000, confidence: float = 0.95,
+                       seed=None, workers: int = None) -> dict:
+    """
+    Pearson e Spearman com p-valor de permutação e IC por bootstrap, indexados pelo método.
+    Os dois métodos usam as mesmas permutações e reamostragens, geradas uma vez; os lotes são
+    distribuídos entre workers processos.
+    """
+    return _correlation_tests(x, y, METHODS, n_permutations, n_resamples, confidence, seed, workers)
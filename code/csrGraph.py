@@ -0,0 +1,169 @@
+from typing import NamedTuple
+
+import numpy as np
+import scipy.sparse as sp
+
+
+class CSRGraph(NamedTuple):
+    """
+    Grafo não-direcionado em formato CSR: vizinhos de i em indices[indptr[i]:indptr[i+1]], ordenados.
+    Nós identificados por inteiros (SteamIDs) ficam em ids, um array uint64; só grafos com outros
+    rótulos (texto) usam labels. O texto dos SteamIDs só é gerado na saída (GML, CSV).
+    """
+    indptr: np.ndarray
+    indices: np.ndarray
+    ids: np.ndarray = None
+    labels: list = None
+
+    @property
+    def n(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def nodes(self) -> list:
+        """Rótulo de cada nó, como chave de nx.Graph e dicionários: SteamIDs como int, ou os rótulos originais."""
+        return self.ids.tolist() if self.ids is not None else self.labels
+
+    @property
+    def degrees(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def neighbors(self, i: int) -> np.ndarray:
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+
+def sorted_unique(values: np.ndarray) -> np.ndarray:
+    """Valores únicos em ordem crescente, por ordenação + máscara de vizinhos (bem mais rápido que np.unique em dezenas de milhões de chaves)."""
+    values = np.sort(values)
+    if len(values) == 0:
+        return values
+    keep = np.empty(len(values), dtype=bool)
+    keep[0] = True
+    np.not_equal(values[1:], values[:-1], out=keep[1:])
+    return values[keep]
+
+
+def _node_fields(nodes) -> dict:
+    """ids (uint64) se os nós são inteiros sem sinal de 64 bits (array uint64 ou ints), senão labels."""
+    if isinstance(nodes, np.ndarray) and nodes.dtype.kind in "ui" and (nodes.dtype.kind == "u" or (nodes >= 0).all()):
+        return {"ids": nodes.astype(np.uint64, copy=False)}
+    nodes = list(nodes)
+    if all(type(node) is int and 0 <= node < 2 ** 64 for node in nodes):
+        return {"ids": np.array(nodes, dtype=np.uint64)}
+    return {"labels": nodes}
+
+
+def edges_to_csr(n: int, src, dst, nodes=None) -> CSRGraph:
+    """
+    Monta o CSR simétrico a partir de arrays de arestas (índices densos 0..n-1).
+    Laços e arestas repetidas são descartados, como no nx.Graph. nodes são os rótulos (ou um
+    array uint64 de SteamIDs); sem eles, os nós são 0..n-1.
+    """
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    mask = src != dst
+    src, dst = src[mask], dst[mask]
+
+    # Cada aresta entra nas duas direções; a chave linha*n+coluna ordena e deduplica de uma vez
+    keys = np.unique(np.concatenate((src * n + dst, dst * n + src)))
+    rows = keys // n
+    indices = (keys % n).astype(np.int64)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+
+    if nodes is None:
+        nodes = np.arange(n, dtype=np.uint64)
+    return CSRGraph(indptr, indices, **_node_fields(nodes))
+
+
+def graph_to_csr(G) -> CSRGraph:
+    """
+    Converte um grafo NetworkX não-direcionado para CSR, preservando a ordem e os rótulos de G.nodes()
+    (csr.nodes volta igual às chaves de G; nós int viram ids uint64).
+    """
+    nodes = list(G.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    m = G.number_of_edges()
+    src = np.fromiter((index[u] for u, _ in G.edges()), dtype=np.int64, count=m)
+    dst = np.fromiter((index[v] for _, v in G.edges()), dtype=np.int64, count=m)
+    return edges_to_csr(len(nodes), src, dst, nodes)
+
+
+def adjacency_matrix(csr: CSRGraph, dtype=np.float32) -> sp.csr_matrix:
+    """Matriz de adjacência esparsa (SciPy) compartilhando indptr/indices com o CSR."""
+    data = np.ones(len(csr.indices), dtype=dtype)
+    return sp.csr_matrix((data, csr.indices, csr.indptr), shape=(csr.n, csr.n))
+
+
+def edge_keys(csr: CSRGraph) -> np.ndarray:
+    """Chaves ordenadas linha*n+coluna de todas as entradas do CSR, para testes de adjacência com searchsorted."""
+    rows = np.repeat(np.arange(csr.n, dtype=np.int64), csr.degrees)
+    return rows * csr.n + csr.indices
+
+
+def has_edges(keys: np.ndarray, n: int, u, v) -> np.ndarray:
+    """Testa em lote se (u[i], v[i]) é aresta, por busca binária nas chaves ordenadas."""
+    if len(keys) == 0:
+        return np.zeros(len(np.atleast_1d(u)), dtype=bool)
+    q = np.asarray(u, dtype=np.int64) * n + np.asarray(v, dtype=np.int64)
+    pos = np.minimum(np.searchsorted(keys, q), len(keys) - 1)
+    return keys[pos] == q
+
+
+def induced_subgraph(csr: CSRGraph, keep) -> tuple:
+    """
+    Subgrafo induzido compacto pelos nós marcados em keep (máscara booleana ou índices).
+    Retorna (CSRGraph reindexado 0..k-1, índices originais dos nós mantidos).
+    """
+    mask = np.zeros(csr.n, dtype=bool)
+    mask[keep] = True
+    old_ids = np.flatnonzero(mask)
+    new_id = np.full(csr.n, -1, dtype=np.int64)
+    new_id[old_ids] = np.arange(len(old_ids))
+
+    rows = np.repeat(np.arange(csr.n, dtype=np.int64), csr.degrees)
+    inside = mask[rows] & mask[csr.indices]
+    # Linhas e colunas continuam ordenadas porque a renumeração preserva a ordem
+    indices = new_id[csr.indices[inside]]
+    indptr = np.zeros(len(old_ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(new_id[rows[inside]], minlength=len(old_ids)), out=indptr[1:])
+    if csr.ids is not None:
+        return CSRGraph(indptr, indices, ids=csr.ids[old_ids]), old_ids
+    return CSRGraph(indptr, indices, labels=[csr.labels[i] for i in old_ids]), old_ids
+
+
+def with_steamids(csr: CSRGraph) -> CSRGraph:
+    """
+    Converte os rótulos em texto para ids uint64 quando todos são inteiros em forma canônica que
+    cabem em uint64 (SteamIDs lidos de um GML). Zeros à esquerda, números grandes demais ou texto
+    mantêm os rótulos como estão, para voltarem idênticos na saída.
+    """
+    if csr.ids is not None or not csr.labels:
+        return csr
+    labels = [str(label) for label in csr.labels]
+    if not all(_is_uint64_label(label) for label in labels):
+        return csr
+    return CSRGraph(csr.indptr, csr.indices, ids=np.asarray(labels).astype(np.uint64))
+
+
+def _is_uint64_label(label: str) -> bool:
+    return label.isascii() and label.isdigit() and str(int(label)) == label and int(label) < 2 ** 64
+
+
+def save_csr(path, csr: CSRGraph, **metadata):
+    """
+    Grava o CSR em .npz (sem compressão, para carregar rápido): ids como uint64, ou os rótulos como
+    texto. metadata são arrays/escalares extras gravados junto.
+    """
+    nodes = {"node_ids": csr.ids} if csr.ids is not None else {"node_labels": np.asarray([str(label) for label in csr.labels])}
+    index_dtype = np.int32 if csr.n < 2 ** 31 else np.int64
+    np.savez(path, indptr=csr.indptr, indices=csr.indices.astype(index_dtype), **nodes, **metadata)
+
+
+def load_csr(path) -> tuple:
+    """Lê um .npz gravado por save_csr. Retorna (CSRGraph com os ids uint64 ou rótulos gravados, dict com os metadados)."""
+    with np.load(path) as data:
+        nodes = {"ids": data["node_ids"]} if "node_ids" in data else {"labels": data["node_labels"].tolist()}
+        csr = CSRGraph(data["indptr"].astype(np.int64), data["indices"].astype(np.int64), **nodes)
+        metadata = {key: data[key] for key in data.files if key not in ("indptr", "indices", "node_ids", "node_labels")}
+    return csr, metadata
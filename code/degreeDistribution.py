@@ -0,0 +1,157 @@
+import numpy as np
+from scipy import optimize, special, stats
+
+
+def degree_counts(degrees) -> np.ndarray:
+    """Contagem de nós por grau (counts[k] = nós com grau k) com um único bincount."""
+    return np.bincount(np.asarray(degrees, dtype=np.int64))
+
+
+def counts_from_degree_stream(chunks) -> np.ndarray:
+    """
+    Acumula as contagens de grau a partir de blocos de graus, sem materializar o grafo.
+    A memória depende apenas do maior grau observado.
+    """
+    counts = np.zeros(0, dtype=np.int64)
+    for chunk in chunks:
+        chunk_counts = degree_counts(chunk)
+        if len(chunk_counts) > len(counts):
+            counts = np.pad(counts, (0, len(chunk_counts) - len(counts)))
+        counts[:len(chunk_counts)] += chunk_counts
+    return counts
+
+
+def log_binned_histogram(counts, bins_per_decade: int = 10) -> tuple:
+    """
+    Histograma com bins logarítmicos para graus >= 1.
+    Retorna (bordas dos bins, densidade), com a densidade normalizada pelo número de
+    graus inteiros em cada bin, para que a inclinação em escala log-log não seja distorcida.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    max_degree = len(counts) - 1
+    if max_degree < 1:
+        return np.array([1.0, 2.0]), np.zeros(1)
+
+    num_bins = max(1, int(np.ceil(np.log10(max_degree + 1) * bins_per_decade)))
+    edges = np.unique(np.floor(np.logspace(0, np.log10(max_degree + 1), num_bins + 1)).astype(np.int64))
+    edges[-1] = max_degree + 1
+
+    cumulative = np.concatenate(([0], np.cumsum(counts)))
+    in_bin = cumulative[edges[1:]] - cumulative[edges[:-1]]
+    widths = np.diff(edges)
+    total = counts[1:].sum()
+    density = in_bin / (widths * total) if total else np.zeros(len(widths))
+    return edges, density
+
+
+def ccdf(counts) -> tuple:
+    """Função de distribuição complementar P(K >= k) para os graus k >= 1 observados."""
+    counts = np.asarray(counts, dtype=np.int64)
+    degrees = np.flatnonzero(counts)
+    degrees = degrees[degrees >= 1]
+    tail = np.cumsum(counts[::-1])[::-1]
+    return degrees, tail[degrees] / tail[1] if len(degrees) else np.zeros(0)
+
+
+def _tail(counts, xmin: int) -> tuple:
+    degrees = np.arange(xmin, len(counts))
+    return degrees, np.asarray(counts[xmin:], dtype=np.float64)
+
+
+def _power_law_alpha(degrees, weights, xmin) -> float:
+    # Aproximação de Clauset, Shalizi & Newman (2009) para o MLE discreto
+    n = weights.sum()
+    return 1.0 + n / np.dot(weights, np.log(degrees / (xmin - 0.5)))
+
+
+def _power_law_ks(degrees, weights, xmin, alpha) -> float:
+    empirical = np.cumsum(weights) / weights.sum()
+    model = 1.0 - ((degrees + 0.5) / (xmin - 0.5)) ** (1.0 - alpha)
+    return float(np.max(np.abs(empirical - model)))
+
+
+def fit_power_law(counts, xmin: int = None, min_tail: int = 50) -> dict:
+    """
+    Ajusta uma cauda em lei de potência P(k) ~ k^-alpha por máxima verossimilhança.
+    Se xmin não for dado, escolhe o que minimiza a distância de Kolmogorov-Smirnov entre
+    os candidatos que deixam pelo menos min_tail observações na cauda.
+    Sem nenhum grau >= xmin (ex.: todos os nós isolados) não há cauda: alpha, erro e KS valem 0.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    if not counts[max(1, xmin or 1):].any():
+        return {"alpha": 0.0, "alpha_erro": 0.0, "xmin": int(xmin or 1), "n_cauda": 0, "ks": 0.0}
+    if xmin is None:
+        tail_sizes = np.cumsum(counts[::-1])[::-1]
+        candidates = [k for k in np.flatnonzero(counts) if k >= 1 and tail_sizes[k] >= min_tail]
+        if not candidates:
+            candidates = [1]
+        best = None
+        for k in candidates:
+            degrees, weights = _tail(counts, int(k))
+            alpha = _power_law_alpha(degrees, weights, k)
+            ks = _power_law_ks(degrees, weights, k, alpha)
+            if best is None or ks < best[2]:
+                best = (int(k), alpha, ks)
+        xmin, alpha, ks = best
+    else:
+        degrees, weights = _tail(counts, xmin)
+        alpha = _power_law_alpha(degrees, weights, xmin)
+        ks = _power_law_ks(degrees, weights, xmin, alpha)
+
+    n_tail = int(counts[xmin:].sum())
+    return {
+        "alpha": float(alpha),
+        "alpha_erro": float((alpha - 1) / np.sqrt(n_tail)),
+        "xmin": int(xmin),
+        "n_cauda": n_tail,
+        "ks": float(ks),
+    }
+
+
+def _lognormal_loglik(degrees, mu, sigma, xmin):
+    # Lognormal contínua truncada em xmin - 0.5 (mesma correção de continuidade da lei de potência)
+    x = degrees.astype(np.float64)
+    log_tail = stats.norm.logsf((np.log(xmin - 0.5) - mu) / sigma)
+    return stats.norm.logpdf((np.log(x) - mu) / sigma) - np.log(x * sigma) - log_tail
+
+
+def fit_lognormal(counts, xmin: int = 1) -> dict:
+    """Ajusta uma lognormal truncada em xmin à cauda dos graus por máxima verossimilhança."""
+    degrees, weights = _tail(np.asarray(counts, dtype=np.int64), xmin)
+    mask = weights > 0
+    degrees, weights = degrees[mask], weights[mask]
+    logs = np.log(degrees)
+    mu0 = np.average(logs, weights=weights)
+    sigma0 = max(np.sqrt(np.average((logs - mu0) ** 2, weights=weights)), 1e-3)
+
+    def neg_loglik(params):
+        mu, log_sigma = params
+        return -np.dot(weights, _lognormal_loglik(degrees, mu, np.exp(log_sigma), xmin))
+
+    result = optimize.minimize(neg_loglik, x0=[mu0, np.log(sigma0)], method="Nelder-Mead")
+    mu, sigma = result.x[0], float(np.exp(result.x[1]))
+    return {"mu": float(mu), "sigma": sigma, "xmin": int(xmin), "loglik": float(-result.fun)}
+
+
+def compare_power_law_lognormal(counts, xmin: int) -> dict:
+    """
+    Teste de razão de verossimilhança de Vuong entre lei de potência e lognormal na mesma cauda.
+    R > 0 favorece a lei de potência; p pequeno indica que o sinal de R é significativo.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    power_law = fit_power_law(counts, xmin=xmin)
+    lognormal = fit_lognormal(counts, xmin=xmin)
+    degrees, weights = _tail(counts, xmin)
+    mask = weights > 0
+    degrees, weights = degrees[mask], weights[mask]
+
+    # Log-verossimilhança pontual da lei de potência discreta (normalizada pela zeta de Hurwitz)
+    alpha = power_law["alpha"]
+    ll_pl = -alpha * np.log(degrees) - np.log(special.zeta(alpha, xmin))
+    ll_ln = _lognormal_loglik(degrees, lognormal["mu"], lognormal["sigma"], xmin)
+    diff = ll_pl - ll_ln
+    n = weights.sum()
+    ratio = float(np.dot(weights, diff))
+    std = np.sqrt(np.dot(weights, (diff - ratio / n) ** 2) / n)
+    p_value = float(special.erfc(abs(ratio) / (np.sqrt(2 * n) * std))) if std > 0 else 1.0
+    return {"R": ratio, "p": p_value, "lei_potencia": power_law, "lognormal": lognormal}
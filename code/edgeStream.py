@@ -0,0 +1,107 @@
+import os
+
+import numpy as np
+
+from csrGraph import CSRGraph, sorted_unique
+from steamIds import STEAMID_DTYPE, SteamIdIndex, parse_steamids
+
+# Cada registro do arquivo é um par (menor, maior) de SteamIDs uint64 little-endian
+EDGE_DTYPE = np.dtype("<u8")
+# Pares lidos por vez na finalização ao converter SteamIDs para índices densos
+FINALIZE_CHUNK = 4_000_000
+
+
+class EdgeStreamWriter:
+    """
+    Grava as amizades do crawl num arquivo binário só de acréscimo, como pares canônicos
+    (min, max) de SteamIDs. Nada fica em memória além do lote atual: a mesma amizade vista pelos
+    dois lados é gravada duas vezes e só é deduplicada em finalize_edge_stream.
+    """
+
+    def __init__(self, path, append: bool = False):
+        self.path = path
+        self._file = open(path, "ab" if append else "wb")
+        self.count = os.path.getsize(path) // (2 * EDGE_DTYPE.itemsize) if append else 0
+
+    def append(self, steamid, friends):
+        """Acrescenta as arestas steamid—amigo (laços são descartados)."""
+        friends = parse_steamids(friends)
+        friends = friends[friends != STEAMID_DTYPE(steamid)]
+        if len(friends) == 0:
+            return
+        own = np.full(len(friends), steamid, dtype=STEAMID_DTYPE)
+        pairs = np.empty((len(friends), 2), dtype=EDGE_DTYPE)
+        pairs[:, 0] = np.minimum(own, friends)
+        pairs[:, 1] = np.maximum(own, friends)
+        pairs.tofile(self._file)
+        self._file.flush()
+        self.count += len(friends)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self) -> "EdgeStreamWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_edge_stream(path) -> np.ndarray:
+    """Pares gravados (com repetições) como array (m, 2) uint64 mapeado do disco."""
+    if os.path.getsize(path) == 0:
+        return np.zeros((0, 2), dtype=EDGE_DTYPE)
+    return np.memmap(path, dtype=EDGE_DTYPE, mode="r").reshape(-1, 2)
+
+
+def finalize_edge_stream(path, nodes=None) -> CSRGraph:
+    """
+    Ordena e deduplica os pares do arquivo e monta o CSR. Os nós são os SteamIDs de nodes (nessa
+    ordem, incluindo os isolados) ou, sem nodes, os que aparecem nas arestas, em ordem crescente.
+    Pares com algum SteamID fora de nodes são descartados. Os nós do CSR são os SteamIDs uint64
+    (csr.ids), como no CSR lido do GML (graphCache.load_csr_cached).
+    """
+    pairs = read_edge_stream(path)
+    if nodes is None:
+        nodes = sorted_unique(pairs.ravel()) if len(pairs) else np.zeros(0, dtype=STEAMID_DTYPE)
+    index = nodes if isinstance(nodes, SteamIdIndex) else SteamIdIndex(nodes)
+    n = len(index)
+
+    # Cada bloco vira chaves int64 menor*n+maior, já sem repetições; a ordenação final junta os blocos
+    keys = [np.zeros(0, dtype=np.int64)]
+    for start in range(0, len(pairs), FINALIZE_CHUNK):
+        chunk = np.asarray(pairs[start:start + FINALIZE_CHUNK])
+        u = index.lookup(chunk[:, 0]).astype(np.int64)
+        v = index.lookup(chunk[:, 1]).astype(np.int64)
+        valid = (u >= 0) & (v >= 0) & (u != v)
+        u, v = u[valid], v[valid]
+        keys.append(sorted_unique(np.minimum(u, v) * n + np.maximum(u, v)))
+    keys = sorted_unique(np.concatenate(keys))
+    return CSRGraph(*_canonical_keys_to_csr(keys, n), ids=index.ids)
+
+
+def _canonical_keys_to_csr(keys: np.ndarray, n: int) -> tuple:
+    """
+    indptr/indices do CSR simétrico a partir das chaves u*n+v (u < v) ordenadas e únicas. Na linha r
+    os vizinhos menores que r (arestas vistas como (u, r)) vêm antes dos maiores ((r, v)); cada
+    metade já sai ordenada das chaves, então basta uma ordenação extra (a das chaves invertidas).
+    """
+    m = len(keys)
+    low, high = keys // n, keys % n
+    up_degree = np.bincount(low, minlength=n)
+    down_degree = np.bincount(high, minlength=n)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(up_degree + down_degree, out=indptr[1:])
+    rank = np.arange(m, dtype=np.int64)
+    indices = np.empty(2 * m, dtype=np.int64)
+
+    # Vizinhos maiores: as chaves já estão agrupadas por low e ordenadas por high
+    up_start = np.cumsum(up_degree) - up_degree
+    indices[indptr[low] + down_degree[low] + rank - up_start[low]] = high
+
+    # Vizinhos menores: chaves invertidas high*n+low, agrupadas por high e ordenadas por low
+    reversed_keys = np.sort(high * n + low)
+    rows, columns = reversed_keys // n, reversed_keys % n
+    down_start = np.cumsum(down_degree) - down_degree
+    indices[indptr[rows] + rank - down_start[rows]] = columns
+    return indptr, indices
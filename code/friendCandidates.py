@@ -0,0 +1,99 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy.sparse as sp
+
+from csrGraph import CSRGraph, adjacency_matrix
+
+METRICS = ("common_neighbors", "adamic_adar", "resource_allocation")
+# Linhas de A² materializadas por bloco: a memória cresce com BLOCK_SIZE x (amigos de amigos), não com n²
+BLOCK_SIZE = 1024
+
+# Estado de cada processo worker, preenchido uma vez pelo initializer
+_worker_state = {}
+
+
+def _neighbor_weights(degrees: np.ndarray, metric: str) -> np.ndarray:
+    """Peso de cada vizinho comum z: 1, 1/log(grau(z)) ou 1/grau(z). Só nós de grau >= 2 são vizinhos comuns."""
+    degrees = degrees.astype(np.float64)
+    if metric == "common_neighbors":
+        return np.ones(len(degrees))
+    if metric == "adamic_adar":
+        return np.divide(1.0, np.log(degrees), out=np.zeros(len(degrees)), where=degrees > 1)
+    return np.divide(1.0, degrees, out=np.zeros(len(degrees)), where=degrees > 0)
+
+
+def sparse_top_k(scores: sp.csr_matrix, k: int) -> tuple:
+    """
+    Top-k de cada linha de uma matriz esparsa, sem densificar: ordena as entradas por
+    (linha, -score, coluna) e guarda as k primeiras de cada linha. Faltas ficam com -1 e score 0.
+    """
+    scores = scores.tocsr()
+    scores.eliminate_zeros()
+    n_rows = scores.shape[0]
+    neighbors = np.full((n_rows, k), -1, dtype=np.int64)
+    best = np.zeros((n_rows, k))
+    rows = np.repeat(np.arange(n_rows), np.diff(scores.indptr))
+    order = np.lexsort((scores.indices, -scores.data, rows))
+    rank = np.arange(len(order)) - scores.indptr[rows[order]]
+    keep = order[rank < k]
+    neighbors[rows[keep], rank[rank < k]] = scores.indices[keep]
+    best[rows[keep], rank[rank < k]] = scores.data[keep]
+    return neighbors, best
+
+
+def _init_worker(adjacency, weighted, k):
+    _worker_state.update(adjacency=adjacency, weighted=weighted, k=k)
+
+
+def _candidates_block(start: int, stop: int) -> tuple:
+    """Top-k de cada métrica para um bloco de linhas: A[bloco] @ diag(w) @ A, sem a diagonal e sem os amigos."""
+    state = _worker_state
+    block = state["adjacency"][start:stop]
+    # Entradas a remover: o próprio usuário e quem já é amigo
+    known = block + sp.csr_matrix((np.ones(stop - start), (np.arange(stop - start), np.arange(start, stop))),
+                                  shape=block.shape)
+    result = {}
+    for metric, weighted in state["weighted"].items():
+        scores = (block @ weighted).tocsr()
+        scores = scores - scores.multiply(known.astype(bool))
+        result[metric] = sparse_top_k(scores, state["k"])
+    return start, result
+
+
+def friend_of_friend_candidates(csr: CSRGraph, k: int = 10, metrics=METRICS, block_size: int = BLOCK_SIZE,
+                                workers: int = None) -> dict:
+    """
+    Para cada usuário, os k não-amigos com maior pontuação de vizinhos comuns ("pessoas que você talvez conheça").
+    Calcula A² em blocos de linhas (processos paralelos): vizinhos comuns, Adamic-Adar (Σ 1/log grau)
+    e alocação de recursos (Σ 1/grau). Retorna {métrica: (candidatos n x k, scores n x k)}, com -1 nas faltas.
+    """
+    unknown = [metric for metric in metrics if metric not in METRICS]
+    if unknown:
+        raise ValueError(f"Métricas desconhecidas: {unknown}. Use as de {METRICS}.")
+    adjacency = adjacency_matrix(csr, dtype=np.float64)
+    weighted = {metric: (sp.diags(_neighbor_weights(csr.degrees, metric)) @ adjacency).tocsr() for metric in metrics}
+    initargs = (adjacency, weighted, k)
+
+    n = csr.n
+    output = {metric: (np.full((n, k), -1, dtype=np.int64), np.zeros((n, k))) for metric in metrics}
+    blocks = [(start, min(start + block_size, n)) for start in range(0, n, block_size)]
+
+    def store(start, result):
+        for metric, (block_neighbors, block_scores) in result.items():
+            output[metric][0][start:start + len(block_neighbors)] = block_neighbors
+            output[metric][1][start:start + len(block_scores)] = block_scores
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(blocks) <= 1:
+        _init_worker(*initargs)
+        for start, stop in blocks:
+            store(*_candidates_block(start, stop))
+        return output
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as executor:
+        starts, stops = zip(*blocks)
+        for start, result in executor.map(_candidates_block, starts, stops):
+            store(start, result)
+    return output
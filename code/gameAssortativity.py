@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from csrGraph import CSRGraph, adjacency_matrix
+
+
+def owner_edge_counts(csr: CSRGraph, ownership: sp.csr_matrix) -> np.ndarray:
+    """
+    Número de amizades com as duas pontas donas de cada jogo, para todos os jogos de uma vez:
+    é a diagonal de MᵀAM / 2, obtida como a soma por coluna de (A @ M) ∘ M, sem formar MᵀAM.
+    """
+    adjacency = adjacency_matrix(csr)
+    binary = ownership.tocsr(copy=True).astype(np.float32)
+    binary.data[:] = 1.0
+    both = (adjacency @ binary).multiply(binary)
+    return np.asarray(both.sum(axis=0), dtype=np.float64).ravel() / 2
+
+
+def game_assortativity(csr: CSRGraph, ownership: sp.csr_matrix, appids) -> pd.DataFrame:
+    """
+    Assortatividade de Newman do atributo binário "possui o jogo" para cada appid.
+    Com m arestas, c arestas entre donos e d = soma dos graus dos donos, a matriz de mistura é
+    e11 = c/m, e00 = (m - d + c)/m e a fração de pontas de aresta em donos é a = d/2m, então
+    r = (e11 + e00 - a² - (1-a)²) / (1 - a² - (1-a)²). Jogos que todos ou ninguém possuem ficam NaN.
+    """
+    m = len(csr.indices) / 2
+    binary = ownership.tocsr(copy=True).astype(np.float32)
+    binary.data[:] = 1.0
+    owners = np.asarray(binary.sum(axis=0), dtype=np.int64).ravel()
+    degree_sums = np.asarray(binary.T @ csr.degrees.astype(np.float64)).ravel()
+    owner_edges = owner_edge_counts(csr, binary)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        share = degree_sums / (2 * m)
+        trace = (m - degree_sums + 2 * owner_edges) / m
+        expected = share ** 2 + (1 - share) ** 2
+        r = (trace - expected) / (1 - expected)
+        # Arestas entre donos esperadas se as pontas se ligassem ao acaso, preservando os graus
+        random_edges = degree_sums ** 2 / (4 * m)
+        ratio = owner_edges / random_edges
+    r[~(1 - expected > 1e-12)] = np.nan
+
+    return pd.DataFrame({
+        "appid": np.asarray(appids),
+        "donos": owners,
+        "arestas_entre_donos": owner_edges.astype(np.int64),
+        "arestas_esperadas": random_edges,
+        "razao_homofilia": ratio,
+        "assortatividade": r,
+    })
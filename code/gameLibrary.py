@@ -0,0 +1,39 @@
+import numpy as np
+import scipy.sparse as sp
+
+from ownershipMatrix import build_ownership_matrix, edge_jaccard, library_sizes, owner_counts
+
+
+class LibraryMatrix:
+    """
+    Bibliotecas de muitos usuários como a matriz de posse CSR de ownershipMatrix (usuários x jogos),
+    junto com o appid de cada coluna. Só reúne as funções de ownershipMatrix sob uma interface.
+    """
+
+    def __init__(self, matrix: sp.csr_matrix, appids: np.ndarray):
+        self.matrix = matrix
+        self.appids = appids
+
+    @classmethod
+    def from_libraries(cls, libraries, appids=None) -> "LibraryMatrix":
+        """Bibliotecas como conjuntos de appids ou dicts appid -> playtime_forever (ausentes viram vazias)."""
+        return cls(*build_ownership_matrix(libraries, appids))
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    @property
+    def sizes(self) -> np.ndarray:
+        return library_sizes(self.matrix)
+
+    def library(self, row: int) -> np.ndarray:
+        """Appids da biblioteca de um usuário."""
+        return self.appids[self.matrix.indices[self.matrix.indptr[row]:self.matrix.indptr[row + 1]]]
+
+    def pairwise_jaccard(self, u, v) -> np.ndarray:
+        """Jaccard de todos os pares (u[i], v[i])."""
+        return edge_jaccard(self.matrix, u, v)
+
+    def game_frequencies(self) -> np.ndarray:
+        """Número de donos de cada jogo, alinhado com appids."""
+        return owner_counts(self.matrix)
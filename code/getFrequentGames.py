@@ -1,8 +1,12 @@
 import requests
 import time
 import csv
-from collections import Counter
 import os
+import numpy as np
+
+from gameLibrary import LibraryMatrix
+from ownershipMatrix import build_playtime_matrix
+from steamStore import SteamStore
 
 API_KEY = os.getenv("STEAM_API_KEY")
 if not API_KEY:
@@ -29,20 +33,35 @@ def get_owned_games(steam_id):
 with open("steam_ids.txt", "r") as f:
     steam_ids = [line.strip() for line in f.readlines()]
 
-jogo_freq = Counter()
+bibliotecas = []
+nomes_jogos = {}
+store = SteamStore()
+store.insert_users(steam_ids)
 
 for i, steamid in enumerate(steam_ids):
     print(f"[{i+1}/{len(steam_ids)}] Coletando jogos de {steamid}")
     jogos = get_owned_games(steamid)
+    bibliotecas.append({jogo["appid"]: jogo.get("playtime_forever", 0) for jogo in jogos})
+    store.insert_ownership(steamid, jogos)
     for jogo in jogos:
-        jogo_freq[(jogo["appid"], jogo["name"])] += 1
+        nomes_jogos[jogo["appid"]] = jogo["name"]
     time.sleep(0.3)  # Espera para evitar throttling da API
 
+store.insert_apps(nomes_jogos)
+store.close()
+
+# Conta os donos de cada jogo sobre a matriz esparsa das bibliotecas (usuários x appids)
+matriz_bibliotecas = LibraryMatrix.from_libraries(bibliotecas)
+frequencias = matriz_bibliotecas.game_frequencies()
+ordem = np.argsort(-frequencias, kind="stable")
+minutos_jogados = np.asarray(build_playtime_matrix(bibliotecas, matriz_bibliotecas.appids).sum(axis=0)).ravel()
+
 # Salva no CSV
 with open("jogos_mais_frequentes.csv", "w", newline='', encoding="utf-8") as f:
     writer = csv.writer(f)
-    writer.writerow(["appid", "game_name", "players_with_game"])  # Cabeçalho do CSV
-    for (appid, nome), freq in jogo_freq.most_common():
-        writer.writerow([appid, nome, freq])  # Escreve os dados
+    writer.writerow(["appid", "game_name", "players_with_game", "total_playtime_minutes"])  # Cabeçalho do CSV
+    for j in ordem:
+        appid = int(matriz_bibliotecas.appids[j])
+        writer.writerow([appid, nomes_jogos[appid], int(frequencias[j]), int(minutos_jogados[j])])  # Escreve os dados
 
 print("\n✅ Dados salvos em 'jogos_mais_frequentes.csv'.")
@@ -1,5 +1,6 @@
 import os
 import sys
+import argparse
 import time
 import random
 import requests
@@ -10,10 +11,37 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.preprocessing import MinMaxScaler
 
+from connectedComponents import restrict_to_giant_component
+from correlationTests import correlation_report
+from csrGraph import edge_keys, edges_to_csr, graph_to_csr, has_edges
+from friendCandidates import friend_of_friend_candidates
+from gameAssortativity import game_assortativity
+from graphCache import load_graph_cached
+from kCore import core_numbers, restrict_to_min_core
+from linkPrediction import link_prediction
+from minhashLSH import friendship_rate_among_similar, non_edge_jaccard_distribution, similar_pairs
+from nullModel import null_distribution
+from ownershipMatrix import (build_ownership_matrix, build_playtime_matrix, edge_cosine, edge_jaccard,
+                             edge_weighted_jaccard, log_scale)
+from ownershipStore import write_ownership
+from steamIds import SteamIdIndex
+from steamStore import SteamStore
+from topkSimilarity import top_k_similar
+from triangleCounting import clustering_dict
+
 # --- ETAPA 0: Configuração ---
 
 API_KEY = ""
 GML_FILE_PATH = "networks/rede_steam_bannerlord_group.gml"
+ARQUIVO_POSSE = "datasets/steam_ownership.parquet"
+LIMIAR_SIMILARIDADE = 0.3  # Jaccard mínimo para um par ser considerado "de gostos parecidos" (LSH)
+AMOSTRAS_NAO_AMIGOS = 100_000  # Pares aleatórios de não-amigos usados como referência
+K_VIZINHOS_GOSTO = 5  # Quantos usuários de biblioteca mais parecida são buscados para cada usuário
+REDES_NULAS = 100  # Reconfigurações da rede (mesmos graus) usadas como modelo nulo do Jaccard médio
+MIN_DONOS_ASSORTATIVIDADE = 5  # Jogos com menos donos ficam fora do ranking de assortatividade
+K_CANDIDATOS = 10  # Sugestões de amizade (amigos de amigos) geradas para cada usuário
+PERMUTACOES_CORRELACAO = 1_000  # Permutações do teste de significância (compartilhadas por Pearson e Spearman)
+REAMOSTRAGENS_CORRELACAO = 1_000  # Reamostragens bootstrap do IC de cada correlação
 
 # --- Funções Auxiliares ---
 
@@ -59,24 +87,48 @@ if __name__ == "__main__":
 
 if __name__ == "__main__":
 
+    parser = argparse.ArgumentParser(description="Pipeline KDD: coleta de jogos e análise da hipótese de similaridade.")
+    parser.add_argument("--giant-component", action="store_true",
+                        help="Analisa apenas o maior componente conexo (evita coletar jogos de membros isolados).")
+    parser.add_argument("--min-core", type=int, default=0,
+                        help="Analisa apenas o k-core com k >= MIN_CORE (menos chamadas à API e métricas mais baratas).")
+    args = parser.parse_args()
+
     # --- INÍCIO DA LÓGICA DE AMOSTRAGEM HÍBRIDA ---
     
     print("--- ETAPA 1: Carregamento do Grafo Completo ---")
     try:
-        G_full = nx.read_gml(GML_FILE_PATH)
+        G_full = load_graph_cached(GML_FILE_PATH)
         print(f"Grafo '{GML_FILE_PATH}' carregado com sucesso: {G_full.number_of_nodes()} nós e {G_full.number_of_edges()} arestas.")
     except FileNotFoundError:
         print(f"[ERRO] Arquivo do grafo não encontrado em: '{GML_FILE_PATH}'")
         sys.exit()
     
     G = G_full.copy()
-    print("\nAnalisando o grafo completo.")
+    if args.min_core > 0:
+        G = restrict_to_min_core(G, args.min_core)
+        print(f"\nAnalisando apenas o {args.min_core}-core.")
+    if args.giant_component:
+        G = restrict_to_giant_component(G)
+        print("\nAnalisando apenas o maior componente conexo.")
+    if args.min_core <= 0 and not args.giant_component:
+        print("\nAnalisando o grafo completo.")
     
     print(f"Grafo de trabalho tem {G.number_of_nodes()} nós e {G.number_of_edges()} arestas.")
 
     # --- ETAPA 2: Coleta e Estruturação dos Dados (KDD Passos 1 e 2) ---
     print("\n--- ETAPA 2: Coleta de Dados da API e Estruturação ---")
     
+    # Métricas da rede calculadas uma única vez, fora do laço de coleta
+    G_csr = graph_to_csr(G)
+    centralidade_grau = nx.degree_centrality(G)
+    coef_cluster = clustering_dict(G_csr)
+    numero_core = dict(zip(G_csr.nodes, core_numbers(G_csr).tolist()))
+
+    store = SteamStore()
+    store.insert_users(G.nodes(), group_member=True)
+    store.insert_friendships(G.edges())
+
     user_data = []
     total_nodes = G.number_of_nodes()
     for i, node_id in enumerate(G.nodes()):
@@ -85,23 +137,31 @@ if __name__ == "__main__":
         # Coleta de dados da API
         jogos_raw = get_owned_games(node_id, API_KEY)
         set_jogos = {jogo['appid'] for jogo in jogos_raw}
+        playtime_jogos = {jogo['appid']: jogo.get('playtime_forever', 0) for jogo in jogos_raw}
+        store.insert_ownership(node_id, jogos_raw)
         
         # Cálculo das métricas da rede
         user_data.append({
             "steamid": node_id,
             "grau": G.degree(node_id),
-            "centralidade_grau": nx.degree_centrality(G)[node_id],
-            "coef_cluster": nx.clustering(G)[node_id],
+            "centralidade_grau": centralidade_grau[node_id],
+            "coef_cluster": coef_cluster[node_id],
+            "numero_core": numero_core[node_id],
             "total_jogos": len(set_jogos),
-            "set_jogos": set_jogos
+            "set_jogos": set_jogos,
+            "playtime_jogos": playtime_jogos
         })
         time.sleep(1.2) # Pausa para respeitar os limites da API Steam
 
     df_users = pd.DataFrame(user_data).set_index("steamid")
-    df_users_to_save = df_users
+    df_users_to_save = df_users.drop(columns=['set_jogos', 'playtime_jogos'])
     df_users_to_save.to_csv("datasets/steam_users_dataset.csv")
-    df_users_to_save = df_users.drop(columns=['set_jogos'])
+    # Posse de jogos em formato longo e tipado (steamid, appid, playtime_forever), em vez de sets como texto no CSV
+    write_ownership(ARQUIVO_POSSE, df_users.index, df_users['playtime_jogos'])
     print("\nDataset de USUÁRIOS criado e salvo em 'datasets/steam_users_dataset.csv'")
+    print(f"Posse de jogos salva em '{ARQUIVO_POSSE}'")
+    store.upsert_user_metrics(df_users_to_save)
+    store.close()
     
     # --- ETAPA 3: Análise Exploratória (KDD Passos 3 e 4) ---
     print("\n--- ETAPA 3: Análise Exploratória dos Dados dos Usuários ---")
@@ -110,6 +170,7 @@ if __name__ == "__main__":
     print(" - grau: Número de conexões diretas (amigos) que um usuário tem na rede.")
     print(" - centralidade_grau: Grau normalizado; indica a importância relativa do usuário.")
     print(" - coef_cluster: Mede o quão conectados os vizinhos de um usuário estão entre si.")
+    print(" - numero_core: Maior k tal que o usuário pertence ao k-core da rede.")
     print(" - total_jogos: Quantidade total de jogos distintos que o usuário possui.")
 
     print("\n[PASSO 3.2] Estatísticas Descritivas Básicas:")
@@ -140,26 +201,34 @@ if __name__ == "__main__":
     # --- ETAPA 5: Mineração e Análise da Hipótese (KDD Passo 8) ---
     print("\n--- ETAPA 5: Análise da Hipótese (Similaridade de Jogos vs. Conexões) ---")
     
-    connection_data = []
-    for u, v in G.edges():
-        if u in df_users.index and v in df_users.index:
-            jogos_u = df_users.loc[u]['set_jogos']
-            jogos_v = df_users.loc[v]['set_jogos']
-            
-            similaridade = jaccard_similarity(jogos_u, jogos_v)
-            media_centralidade = (df_users.loc[u]['centralidade_grau'] + df_users.loc[v]['centralidade_grau']) / 2
-            
-            media_coef_cluster = (df_users.loc[u]['coef_cluster'] + df_users.loc[v]['coef_cluster']) / 2
-            
-            connection_data.append({
-                "usuario_u": u,
-                "usuario_v": v,
-                "similaridade_jaccard": similaridade,
-                "media_centralidade_grau": media_centralidade,
-                "media_coef_cluster": media_coef_cluster 
-            })
-
-    df_conexoes = pd.DataFrame(connection_data)
+    # Posse de jogos codificada uma única vez como matriz CSR usuário x appid
+    usuarios = SteamIdIndex(df_users.index)
+    # Montadas das bibliotecas já em memória (as mesmas gravadas em ARQUIVO_POSSE), sem reler o Parquet
+    matriz_posse, appids = build_ownership_matrix(df_users['playtime_jogos'])
+    matriz_playtime = build_playtime_matrix(df_users['playtime_jogos'], appids)
+    # Horas jogadas em escala log: um jogo de bundle nunca aberto não pesa como 2.000 horas de Bannerlord
+    matriz_horas = log_scale(matriz_playtime)
+
+    # Arestas como pares de índices densos, por busca vetorizada dos SteamIDs uint64 do CSR
+    linhas = np.repeat(np.arange(G_csr.n), G_csr.degrees)
+    acima = linhas < G_csr.indices
+    idx_u = usuarios.lookup(G_csr.ids[linhas[acima]])
+    idx_v = usuarios.lookup(G_csr.ids[G_csr.indices[acima]])
+    validas = (idx_u >= 0) & (idx_v >= 0)
+    idx_u, idx_v = idx_u[validas].astype(np.int64), idx_v[validas].astype(np.int64)
+
+    # Jaccard de todas as arestas numa única chamada vetorizada; médias por indexação de arrays
+    centralidade = df_users['centralidade_grau'].to_numpy()
+    cluster = df_users['coef_cluster'].to_numpy()
+    df_conexoes = pd.DataFrame({
+        "usuario_u": usuarios.ids[idx_u],
+        "usuario_v": usuarios.ids[idx_v],
+        "similaridade_jaccard": edge_jaccard(matriz_posse, idx_u, idx_v),
+        "similaridade_jaccard_ponderada": edge_weighted_jaccard(matriz_horas, idx_u, idx_v),
+        "similaridade_cosseno_horas": edge_cosine(matriz_horas, idx_u, idx_v),
+        "media_centralidade_grau": (centralidade[idx_u] + centralidade[idx_v]) / 2,
+        "media_coef_cluster": (cluster[idx_u] + cluster[idx_v]) / 2,
+    })
     df_conexoes.to_csv("datasets/steam_connections_dataset.csv", index=False)
     df_conexoes = df_conexoes.drop(columns=['usuario_u'])
     df_conexoes = df_conexoes.drop(columns=['usuario_v'])
@@ -175,6 +244,18 @@ if __name__ == "__main__":
     plt.close()
     print("Gráfico de correlação geral salvo em 'images/correlacao_geral_conexoes.png'")
 
+    print("\nSignificância das correlações (testes de permutação e IC de 95% por bootstrap):")
+    for coluna in ['media_centralidade_grau', 'media_coef_cluster']:
+        relatorio = correlation_report(df_conexoes[coluna], df_conexoes['similaridade_jaccard'],
+                                       n_permutations=PERMUTACOES_CORRELACAO,
+                                       n_resamples=REAMOSTRAGENS_CORRELACAO, seed=42)
+        for metodo, resultado in relatorio.items():
+            # Sem nenhuma permutação tão extrema quanto o observado, o teste só limita p por 1/(permutações+1)
+            p_texto = (f"p < {1 / (resultado['permutacoes'] + 1):.4f}" if resultado['extremos'] == 0
+                       else f"p = {resultado['p']:.4f}")
+            print(f" - Jaccard vs. {coluna} ({metodo}): r = {resultado['r']:.3f}, {p_texto}, "
+                  f"IC [{resultado['ic_inferior']:.3f}, {resultado['ic_superior']:.3f}]")
+
     # --- VISUALIZAÇÃO DAS HIPÓTESES ---
     # Gráfico 1: Hipótese Original (Similaridade vs. Centralidade)
     plt.figure(figsize=(10, 6))
@@ -199,6 +280,94 @@ if __name__ == "__main__":
     plt.close()
     print("Gráficos de dispersão para as hipóteses salvos.")
 
+    print("\n[PASSO 5.2] Comparando amigos e não-amigos (MinHash/LSH)...")
+    rede_indices = edges_to_csr(len(usuarios), idx_u, idx_v)
+    similaridade_amigos = df_conexoes['similaridade_jaccard'].to_numpy()
+    nao_amigos = non_edge_jaccard_distribution(matriz_posse, rede_indices, AMOSTRAS_NAO_AMIGOS)
+    print(f" - Jaccard médio entre amigos: {similaridade_amigos.mean():.4f}")
+    print(f" - Jaccard médio entre não-amigos: {nao_amigos['media']:.4f} (± {nao_amigos['erro_padrao']:.4f})")
+
+    pares_similares, _ = similar_pairs(matriz_posse, LIMIAR_SIMILARIDADE)
+    taxa_amizade, densidade = friendship_rate_among_similar(rede_indices, pares_similares)
+    print(f" - {len(pares_similares)} pares com Jaccard >= {LIMIAR_SIMILARIDADE}; "
+          f"{taxa_amizade:.2%} deles são amigos (densidade da rede: {densidade:.2%})")
+
+    plt.figure(figsize=(10, 6))
+    bins = np.linspace(0, 1, 41)
+    plt.hist(nao_amigos['amostra'], bins=bins, density=True, alpha=0.5, label='Não-amigos (amostra)')
+    plt.hist(similaridade_amigos, bins=bins, density=True, alpha=0.5, label='Amigos')
+    plt.title('Similaridade de Jaccard: Amigos vs. Não-Amigos')
+    plt.xlabel('Similaridade de Jaccard dos Jogos')
+    plt.ylabel('Densidade')
+    plt.legend()
+    plt.savefig("images/distribuicao_jaccard_amigos_vs_nao_amigos.png")
+    plt.close()
+    print("Gráfico salvo em 'images/distribuicao_jaccard_amigos_vs_nao_amigos.png'")
+
+    print(f"\n[PASSO 5.3] Comparando os {K_VIZINHOS_GOSTO} vizinhos de gosto de cada usuário com seus amigos...")
+    vizinhos_gosto, _ = top_k_similar(matriz_posse, k=K_VIZINHOS_GOSTO)
+    linhas = np.broadcast_to(np.arange(len(vizinhos_gosto))[:, None], vizinhos_gosto.shape)
+    validos = vizinhos_gosto >= 0
+    vizinho_e_amigo = has_edges(edge_keys(rede_indices), rede_indices.n, linhas[validos], vizinhos_gosto[validos])
+    if len(vizinho_e_amigo):
+        print(f" - {vizinho_e_amigo.mean():.2%} dos vizinhos de gosto também são amigos "
+              f"(densidade da rede: {densidade:.2%})")
+
+    print(f"\n[PASSO 5.4] Modelo nulo: Jaccard médio em {REDES_NULAS} redes reconfiguradas com os mesmos graus...")
+    modelo_nulo = null_distribution(matriz_posse, idx_u, idx_v, n_rewirings=REDES_NULAS, seed=42)
+    print(f" - Jaccard médio observado: {modelo_nulo['observado']:.4f}")
+    print(f" - Jaccard médio no modelo nulo: {modelo_nulo['media_nula']:.4f} (± {modelo_nulo['desvio_nulo']:.4f})")
+    print(f" - z = {modelo_nulo['z']:.2f}, p (observado >= nulo) = {modelo_nulo['p']:.4f}")
+
+    plt.figure(figsize=(10, 6))
+    plt.hist(modelo_nulo['nulo'], bins=30, alpha=0.7, label='Redes reconfiguradas')
+    plt.axvline(modelo_nulo['observado'], color='red', linestyle='--', label='Rede observada')
+    plt.title('Jaccard Médio das Conexões: Rede Observada vs. Modelo Nulo')
+    plt.xlabel('Jaccard Médio das Conexões')
+    plt.ylabel('Frequência')
+    plt.legend()
+    plt.savefig("images/modelo_nulo_jaccard.png")
+    plt.close()
+    print("Gráfico salvo em 'images/modelo_nulo_jaccard.png'")
+
+    print("\n[PASSO 5.5] Assortatividade da posse de cada jogo na rede de amizades...")
+    df_assortatividade = game_assortativity(rede_indices, matriz_posse, appids)
+    df_assortatividade.to_csv("datasets/assortatividade_jogos.csv", index=False)
+    print("Tabela salva em 'datasets/assortatividade_jogos.csv'")
+    ranking = df_assortatividade[df_assortatividade['donos'] >= MIN_DONOS_ASSORTATIVIDADE]
+    print(f"Jogos mais assortativos (mínimo de {MIN_DONOS_ASSORTATIVIDADE} donos):")
+    for _, jogo in ranking.nlargest(10, 'assortatividade').iterrows():
+        print(f" - appid {int(jogo['appid'])}: r = {jogo['assortatividade']:.3f}, "
+              f"{int(jogo['arestas_entre_donos'])} amizades entre {int(jogo['donos'])} donos "
+              f"({jogo['razao_homofilia']:.2f}x o esperado)")
+
+    print(f"\n[PASSO 5.6] Gerando {K_CANDIDATOS} candidatos de amizade (amigos de amigos) por usuário...")
+    candidatos = friend_of_friend_candidates(rede_indices, k=K_CANDIDATOS)
+    steamids = usuarios.ids
+    tabelas_candidatos = []
+    for metrica, (vizinhos, pontuacoes) in candidatos.items():
+        linhas, posicoes = np.nonzero(vizinhos >= 0)
+        sugeridos = vizinhos[linhas, posicoes]
+        similaridade = edge_jaccard(matriz_posse, linhas, sugeridos)
+        print(f" - {metrica}: {len(sugeridos)} sugestões, Jaccard médio com o usuário {similaridade.mean():.4f}"
+              if len(sugeridos) else f" - {metrica}: nenhuma sugestão")
+        tabelas_candidatos.append(pd.DataFrame({
+            "usuario": steamids[linhas],
+            "candidato": steamids[sugeridos],
+            "metrica": metrica,
+            "posicao": posicoes + 1,
+            "pontuacao": pontuacoes[linhas, posicoes],
+            "similaridade_jaccard": similaridade,
+        }))
+    pd.concat(tabelas_candidatos, ignore_index=True).to_csv("datasets/candidatos_amizade.csv", index=False)
+    print("Candidatos salvos em 'datasets/candidatos_amizade.csv'")
+
+    print("\n[PASSO 5.7] Previsão de amizades a partir de atributos de biblioteca e de grafo...")
+    for modelo in ("sgd", "boosting"):
+        previsao = link_prediction(rede_indices, matriz_posse, matriz_horas, model=modelo, seed=42)
+        print(f" - {modelo}: AUC = {previsao['auc']:.3f} (só Jaccard: {previsao['auc_jaccard']:.3f}; "
+              f"{previsao['n_treino']} pares de treino, {previsao['n_teste']} de teste)")
+
 else:
     print("\n[AVISO] Nenhuma conexão foi encontrada na amostra de nós selecionada.")
 
@@ -3,6 +3,9 @@ import pandas as pd
 import time
 from urllib.parse import quote_plus
 
+from reviewStore import REVIEWS_DIR, write_reviews
+from steamStore import SteamStore
+
 print("Iniciando a coleta de reviews da Steam...")
 
 # --- Configurações ---
@@ -12,6 +15,7 @@ reviews_por_pagina = 100 # A API permite até 100 por página
 
 # --- Coleta com Paginação ---
 reviews_coletadas = []
+store = SteamStore()
 cursor = '*'  # O cursor inicial é um asterisco
 
 while len(reviews_coletadas) < target_reviews:
@@ -36,6 +40,7 @@ while len(reviews_coletadas) < target_reviews:
             print("Não há mais reviews para coletar.")
             break # Interrompe o loop se não vierem mais reviews
             
+        inicio_lote = len(reviews_coletadas)
         for review in reviews_lote_atual:
             reviews_coletadas.append({
                 'steamid': review['author']['steamid'],
@@ -45,6 +50,8 @@ while len(reviews_coletadas) < target_reviews:
                 'data_postagem': review['timestamp_created']
             })
 
+        store.insert_reviews(app_id, reviews_coletadas[inicio_lote:])
+
         cursor = data.get("cursor", "*")
         
         print(f"Coletados {len(reviews_coletadas)} de {target_reviews} reviews...")
@@ -55,12 +62,15 @@ while len(reviews_coletadas) < target_reviews:
         print(f"Ocorreu um erro na requisição: {e}")
         break
 
+store.close()
+
 # --- Criação do DataFrame ---
 df_reviews = pd.DataFrame(reviews_coletadas)
 
-df_reviews.to_csv("datasets/steam_reviews_bannerlord.csv", index=False)
+# Parquet particionado por app_id e mês, com colunas tipadas
+write_reviews(app_id, df_reviews)
 
 print("\n✅ Coleta concluída com sucesso!")
-print(f"Total de {len(df_reviews)} reviews salvas em 'datasets/steam_reviews_bannerlord.csv'")
+print(f"Total de {len(df_reviews)} reviews salvas em '{REVIEWS_DIR}'")
 print("Amostra do DataFrame:")
 print(df_reviews.head())
\ No newline at end of file
@@ -1,25 +1,20 @@
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-import pandas as pd
-from sklearn.metrics import accuracy_score, confusion_matrix
+import argparse
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 import seaborn as sns
 import matplotlib.pyplot as plt
 
-print("\n--- Aplicando Análise de Sentimento com VADER ---")
+from reviewStore import iter_reviews, read_reviews
+from sentimentScoring import VaderScorer
+from steamStore import SteamStore
+from textArena import TextArenaWriter
 
-# Inicializa o analisador VADER
-analyzer = SentimentIntensityAnalyzer()
+APP_ID = 261550  # Bannerlord
+TAMANHO_LOTE = 50_000  # Reviews por lote no modo streaming
+ARQUIVO_SCORES = "datasets/reviews_vader.parquet"
+ARENA_TEXTOS = "datasets/reviews_texto"  # Arena de textos (.utf8 + .offsets) lida pelos workers
 
-# Função para aplicar o VADER e retornar o score 'compound'
-def get_vader_score(texto):
-    return analyzer.polarity_scores(texto)['compound']
-
-df_reviews = pd.read_csv("datasets/steam_reviews_bannerlord.csv")
-
-# Aplica a função na coluna de texto
-df_reviews['vader_score'] = df_reviews['texto_review'].apply(get_vader_score)
-
-print("Análise com VADER concluída. Amostra dos resultados:")
-print(df_reviews[['texto_review', 'foi_recomendado', 'vader_score']].head())
 
 # Como interpretamos o score do VADER
 def classificar_vader(score):
@@ -30,45 +25,96 @@ def classificar_vader(score):
     else:
         return 'neu'
 
-df_reviews['vader_label'] = df_reviews['vader_score'].apply(classificar_vader)
-print("\nDataFrame com labels do VADER:")
-print(df_reviews[['texto_review', 'vader_label']].head())
-
-print("\n--- ETAPA 6: Avaliando a Performance do VADER ---")
 
-# --- Passo 1: Preparar os dados para comparação ---
-# O VADER classifica em 'pos', 'neg' e 'neu', mas o 'foi_recomendado' é apenas True/False.
-df_comparacao = df_reviews[df_reviews['vader_label'] != 'neu'].copy()
+# Matriz de confusão 2x2 (linhas: real False/True; colunas: previsto False/True) por contagem direta;
+# funciona com lotes vazios, ao contrário de confusion_matrix
+def contagens_confusao(y_real, y_previsto):
+    codigos = 2 * np.asarray(y_real, dtype=np.int64) + np.asarray(y_previsto, dtype=np.int64)
+    return np.bincount(codigos, minlength=4).reshape(2, 2)
 
-# Converte o label do VADER ('pos'/'neg') para o mesmo formato do gabarito (True/False)
-df_comparacao['vader_previsao_bool'] = (df_comparacao['vader_label'] == 'pos')
 
-# --- Passo 2: Extrair o "Gabarito" e as "Previsões" ---
-y_real = df_comparacao['foi_recomendado']
-y_previsto = df_comparacao['vader_previsao_bool']
+if __name__ == "__main__":
 
-# --- Passo 3: Calcular a Acurácia ---
-acuracia = accuracy_score(y_real, y_previsto)
-print(f"\nAcurácia do VADER: {acuracia:.2%}")
-print(f"(O VADER acertou a classificação em {acuracia:.2%} das reviews não-neutras)")
+    parser = argparse.ArgumentParser(description="Análise de sentimento das reviews com VADER.")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Processa as reviews em lotes, sem carregar o corpus inteiro na memória.")
+    parser.add_argument("--chunk-size", type=int, default=TAMANHO_LOTE,
+                        help="Reviews por lote no modo streaming.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processos que calculam o VADER (padrão: um por CPU).")
+    args = parser.parse_args()
 
-# --- Passo 4: Gerar e Visualizar a Matriz de Confusão ---
-cm = confusion_matrix(y_real, y_previsto)
+    print("\n--- Aplicando Análise de Sentimento com VADER ---")
 
-plt.figure(figsize=(8, 6))
-sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', 
-            xticklabels=['Previsto Negativo', 'Previsto Positivo'],
-            yticklabels=['Real Negativo', 'Real Positivo'])
-
-plt.title('Matriz de Confusão - Performance do VADER', fontsize=16)
-plt.ylabel('Valor Real (Avaliação do Usuário)', fontsize=12)
-plt.xlabel('Previsão do VADER', fontsize=12)
-plt.savefig("images/matriz_confusao_vader.png")
-plt.close()
-
-print("\nMatriz de Confusão salva em 'images/matriz_confusao_vader.png'")
-print("Análise da Matriz:")
-print(f"- Verdadeiros Negativos (Acerto): {cm[0][0]} reviews que eram 'Não Recomendadas' e o VADER previu como negativas.")
-print(f"- Falsos Positivos (Erro): {cm[0][1]} reviews que eram 'Não Recomendadas', mas o VADER previu como positivas.")
-print(f"- Falsos Negativos (Erro): {cm[1][0]} reviews que eram 'Recomendadas', mas o VADER previu como negativas.")
-print(f"- Verdadeiros Positivos (Acerto): {cm[1][1]} reviews que eram 'Recomendadas' e o VADER previu como positivas.")
\ No newline at end of file
+    # Só as colunas usadas, e só as partições do app analisado
+    colunas = ['steamid', 'texto_review', 'foi_recomendado']
+    if args.streaming:
+        lotes = iter_reviews(colunas, batch_size=args.chunk_size, app_id=APP_ID)
+    else:
+        lotes = [read_reviews(colunas, app_id=APP_ID)]
+
+    # Os scores de cada lote são gravados assim que calculados; só as contagens da matriz de confusão se acumulam
+    esquema_scores = pa.schema([("steamid", pa.int64()), ("foi_recomendado", pa.bool_()),
+                                ("vader_score", pa.float64()), ("vader_label", pa.string())])
+    cm = np.zeros((2, 2), dtype=np.int64)
+    total_reviews = 0
+    # Os textos de cada lote vão para a arena e os workers leem seus intervalos dela por índice,
+    # em vez de receberem cópias serializadas das strings
+    with pq.ParquetWriter(ARQUIVO_SCORES, esquema_scores) as escritor, SteamStore() as store, \
+            TextArenaWriter(ARENA_TEXTOS) as arena, VaderScorer(ARENA_TEXTOS, args.workers) as vader:
+        for df_reviews in lotes:
+            inicio, fim = arena.append(df_reviews['texto_review'])
+            df_reviews['vader_score'] = vader.scores(inicio, fim)
+            df_reviews['vader_label'] = df_reviews['vader_score'].apply(classificar_vader)
+
+            if total_reviews == 0:
+                print("Análise com VADER concluída. Amostra dos resultados:")
+                print(df_reviews[['texto_review', 'foi_recomendado', 'vader_score']].head())
+                print("\nDataFrame com labels do VADER:")
+                print(df_reviews[['texto_review', 'vader_label']].head())
+            total_reviews += len(df_reviews)
+
+            escritor.write_table(pa.Table.from_pandas(df_reviews[esquema_scores.names], schema=esquema_scores,
+                                                      preserve_index=False))
+            store.update_sentiment(APP_ID, df_reviews['steamid'], df_reviews['vader_score'])
+
+            # O VADER classifica em 'pos', 'neg' e 'neu', mas o 'foi_recomendado' é apenas True/False.
+            df_comparacao = df_reviews[df_reviews['vader_label'] != 'neu']
+            # Converte o label do VADER ('pos'/'neg') para o mesmo formato do gabarito (True/False)
+            y_previsto = df_comparacao['vader_label'] == 'pos'
+            cm += contagens_confusao(df_comparacao['foi_recomendado'], y_previsto)
+            if args.streaming:
+                print(f"{total_reviews} reviews processadas...")
+
+        # Sentimento dos autores que são membros do grupo, por join indexado no banco local
+        sentimento_grupo = store.group_reviewer_sentiment(APP_ID)
+
+    print(f"\nScores do VADER de {total_reviews} reviews salvos em '{ARQUIVO_SCORES}'")
+    print("\nSentimento por origem do autor (1 = membro do grupo):")
+    print(sentimento_grupo)
+
+    print("\n--- ETAPA 6: Avaliando a Performance do VADER ---")
+
+    # --- Acurácia a partir das contagens acumuladas: acertos / reviews não-neutras ---
+    acuracia = np.trace(cm) / cm.sum() if cm.sum() else 0.0
+    print(f"\nAcurácia do VADER: {acuracia:.2%}")
+    print(f"(O VADER acertou a classificação em {acuracia:.2%} das reviews não-neutras)")
+
+    # --- Visualizar a Matriz de Confusão (somada entre os lotes) ---
+    plt.figure(figsize=(8, 6))
+    sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', 
+                xticklabels=['Previsto Negativo', 'Previsto Positivo'],
+                yticklabels=['Real Negativo', 'Real Positivo'])
+
+    plt.title('Matriz de Confusão - Performance do VADER', fontsize=16)
+    plt.ylabel('Valor Real (Avaliação do Usuário)', fontsize=12)
+    plt.xlabel('Previsão do VADER', fontsize=12)
+    plt.savefig("images/matriz_confusao_vader.png")
+    plt.close()
+
+    print("\nMatriz de Confusão salva em 'images/matriz_confusao_vader.png'")
+    print("Análise da Matriz:")
+    print(f"- Verdadeiros Negativos (Acerto): {cm[0][0]} reviews que eram 'Não Recomendadas' e o VADER previu como negativas.")
+    print(f"- Falsos Positivos (Erro): {cm[0][1]} reviews que eram 'Não Recomendadas', mas o VADER previu como positivas.")
+    print(f"- Falsos Negativos (Erro): {cm[1][0]} reviews que eram 'Recomendadas', mas o VADER previu como negativas.")
+    print(f"- Verdadeiros Positivos (Acerto): {cm[1][1]} reviews que eram 'Recomendadas' e o VADER previu como positivas.")
\ No newline at end of file
@@ -1,14 +1,30 @@
+import argparse
 import os
 import requests
 import time
-import networkx as nx
 import xml.etree.ElementTree as ET
 
+from edgeStream import EdgeStreamWriter, finalize_edge_stream
+from graphCache import write_gml_cached
+from graphSnapshots import SnapshotStore, diff_summary, snapshot_from_csr
+from incrementalMetrics import CrawlProgressMetrics, IncrementalGraphMetrics
+from steamIds import SteamIdIndex
+from steamStore import SteamStore
+from triangleCounting import average_clustering
+
 API_KEY = os.getenv("STEAM_API_KEY")
 if not API_KEY:
     raise ValueError("A chave da API do Steam não foi definida na variável de ambiente 'STEAM_API_KEY'.")
 
 GROUP_URL = "https://steamcommunity.com/groups/mountandbladeIIbannerlord"
+PROGRESS_INTERVAL = 50  # A cada quantos membros as métricas parciais do grafo são exibidas
+ARQUIVO_ARESTAS = "rede_steam_bannerlord_group.edges"  # Pares (min, max) uint64 gravados durante o crawl
+ARQUIVO_GML = "rede_steam_bannerlord_group.gml"
+
+parser = argparse.ArgumentParser(description="Crawl da rede de amizades dos membros do grupo.")
+parser.add_argument("--incremental-clustering", action="store_true",
+                    help="Mantém triângulos e clustering durante o crawl (guarda a adjacência em memória)")
+args = parser.parse_args()
 
 
 # Função para extrair o ID de 64 bits de um grupo a partir de sua URL
@@ -109,25 +125,68 @@ if group_id:
     steam_ids = get_group_members(group_id)
 
     if steam_ids:
-        G = nx.Graph()
-        G.add_nodes_from(steam_ids)
-
-        print(f"\nIniciando a criação do grafo de amizades para {len(steam_ids)} membros...")
-
-        # Adicionar arestas com base em amizades mapeadas DENTRO do grupo
-        for i, steam_id in enumerate(steam_ids):
-            print(f"[{i + 1}/{len(steam_ids)}] Processando amizades de {steam_id}")
-            friends = get_friends(steam_id)
-
-            friends_in_group = [friend for friend in friends if friend in G]
-
-            for friend_id in friends_in_group:
-                G.add_edge(steam_id, friend_id)
-
-            time.sleep(0.3)  # Evita atingir o limite de requisições da API
-
-        nx.write_gml(G, "rede_steam_bannerlord_group.gml")
+        # Membros como uint64 com índices densos: o grafo do crawl é só de inteiros
+        membros = SteamIdIndex(steam_ids)
+        # Progresso do crawl em memória O(n): graus e componentes, sem guardar a adjacência;
+        # com --incremental-clustering, triângulos e clustering também são mantidos a cada aresta
+        if args.incremental_clustering:
+            metricas = IncrementalGraphMetrics()
+            metricas.add_nodes_from(range(len(membros)))
+        else:
+            metricas = CrawlProgressMetrics(len(membros))
+        store = SteamStore()
+        store.insert_users(membros.ids.tolist(), group_member=True)
+
+        print(f"\nIniciando a criação do grafo de amizades para {len(membros)} membros...")
+
+        # As arestas vão direto para o disco; nenhuma lista cresce com o número de amizades
+        with EdgeStreamWriter(ARQUIVO_ARESTAS) as arestas:
+            # Adicionar arestas com base em amizades mapeadas DENTRO do grupo
+            for i, steam_id in enumerate(membros.ids.tolist()):
+                print(f"[{i + 1}/{len(membros)}] Processando amizades de {steam_id}")
+                friends = get_friends(str(steam_id))
+
+                # Pertencimento ao grupo por busca vetorizada no índice, não por hash de strings
+                friends_in_group = membros.lookup(friends)
+                friends_in_group = friends_in_group[friends_in_group >= 0]
+
+                metricas.add_friends(i, friends_in_group, listed=len(friends) > 0)
+                arestas.append(steam_id, membros.ids[friends_in_group])
+                store.insert_friendships((steam_id, friend_id) for friend_id in membros.ids[friends_in_group].tolist())
+
+                if (i + 1) % PROGRESS_INTERVAL == 0:
+                    parcial = metricas.summary()
+                    print(f"   [PARCIAL] {parcial['arestas']} arestas, {parcial['componentes']} componentes "
+                          f"(maior: {parcial['maior_componente']}), grau médio {parcial['grau_medio']:.2f}")
+                    if args.incremental_clustering:
+                        print(f"   [PARCIAL] {parcial['triangulos']} triângulos, "
+                              f"clustering médio {parcial['clustering_medio']:.4f}")
+
+                time.sleep(0.3)  # Evita atingir o limite de requisições da API
+
+        # Ordena e deduplica os pares (cada amizade foi vista pelos dois lados) e monta o CSR;
+        # o GML sai direto dos arrays, junto com o cache binário lido pelos scripts de análise
+        G_csr = finalize_edge_stream(ARQUIVO_ARESTAS, membros)
+        write_gml_cached(G_csr, ARQUIVO_GML)
+        store.close()
+
+        # Guarda o crawl como snapshot versionado (delta para o anterior) e mostra o churn desde ele
+        snapshots = SnapshotStore()
+        anterior = snapshots.labels()[-1] if snapshots.labels() else None
+        rotulo = snapshots.unique_label(time.strftime("%Y-%m-%d_%H%M%S"))
+        atual = snapshot_from_csr(G_csr)
+        snapshot_anterior, diferenca = snapshots.add(rotulo, atual)
+        if diferenca is not None:
+            churn = diff_summary(snapshot_anterior, atual, diferenca)
+            print(f"\n Mudanças desde o crawl '{anterior}':")
+            print(f"   - Membros: +{churn['membros_entraram']} / -{churn['membros_sairam']}")
+            print(f"   - Amizades: +{churn['amizades_adicionadas']} / -{churn['amizades_removidas']}")
+            print(f"   - Membros com grau alterado: {churn['membros_grau_mudou']}")
 
         print(f"\n Grafo criado com sucesso!")
-        print(f"   - Vértices (membros do grupo): {G.number_of_nodes()}")
-        print(f"   - Arestas (amizades dentro do grupo): {G.number_of_edges()}")
+        print(f"   - Vértices (membros do grupo): {G_csr.n}")
+        print(f"   - Arestas (amizades dentro do grupo): {G_csr.indices.size // 2}")
+        print(f"   - Componentes conexos: {metricas.num_components} (maior: {metricas.largest_component})")
+        # Sem --incremental-clustering, triângulos e clustering só no grafo final, a partir do CSR
+        clustering = metricas.average_clustering() if args.incremental_clustering else average_clustering(G_csr)
+        print(f"   - Coeficiente médio de clustering: {clustering:.4f}")
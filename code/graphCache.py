@@ -0,0 +1,102 @@
+import hashlib
+import os
+
+import networkx as nx
+import numpy as np
+
+from csrGraph import CSRGraph, graph_to_csr, load_csr, save_csr, with_steamids
+from steamIds import format_steamids
+
+CACHE_SUFFIX = ".csr.npz"
+HASH_BLOCK = 1 << 20
+
+
+def _file_hash(path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def csr_to_graph(csr: CSRGraph) -> nx.Graph:
+    """
+    Reconstrói o nx.Graph (rótulos de csr.nodes, mesma ordem de nós) a partir dos arrays do CSR;
+    os SteamIDs viram chaves int, sem passar por texto.
+    """
+    G = nx.Graph()
+    G.add_nodes_from(csr.nodes)
+    rows = np.repeat(np.arange(csr.n), csr.degrees)
+    upper = rows < csr.indices
+    nodes = csr.nodes
+    G.add_edges_from(zip(map(nodes.__getitem__, rows[upper].tolist()),
+                         map(nodes.__getitem__, csr.indices[upper].tolist())))
+    return G
+
+
+def load_csr_cached(gml_path) -> CSRGraph:
+    """
+    CSR do grafo de um .gml, usando o snapshot binário <gml>.csr.npz quando ele corresponde ao arquivo.
+    Tamanho e mtime iguais bastam; se só o mtime mudou, o hash do conteúdo decide (e o cache é
+    atualizado). Em caso de falha o GML é lido uma vez e o cache é refeito. Só a estrutura é
+    guardada: atributos de nós e arestas do GML não entram no cache. Rótulos que são SteamIDs são
+    convertidos para ids uint64 uma vez, nessa leitura.
+    """
+    stat = os.stat(gml_path)
+    cache_path = str(gml_path) + CACHE_SUFFIX
+    content_hash = None
+    if os.path.exists(cache_path):
+        try:
+            csr, metadata = load_csr(cache_path)
+            same_size = int(metadata["fonte_tamanho"]) == stat.st_size
+            if same_size and int(metadata["fonte_mtime"]) == stat.st_mtime_ns:
+                return csr
+            if same_size:
+                content_hash = _file_hash(gml_path)
+                if str(metadata["fonte_hash"]) == content_hash:
+                    _save_cache(cache_path, csr, stat, content_hash)
+                    return csr
+        except (OSError, KeyError, ValueError) as e:
+            print(f"[AVISO] Cache de grafo inválido em '{cache_path}', refazendo: {e}")
+
+    csr = with_steamids(graph_to_csr(nx.read_gml(gml_path)))
+    _save_cache(cache_path, csr, stat, content_hash or _file_hash(gml_path))
+    return csr
+
+
+def _save_cache(cache_path, csr: CSRGraph, stat, content_hash: str):
+    try:
+        # np.savez acrescenta .npz a nomes sem essa extensão; o arquivo temporário precisa terminar em .npz
+        temporary = cache_path[:-len(".npz")] + ".tmp.npz"
+        save_csr(temporary, csr, fonte_tamanho=stat.st_size, fonte_mtime=stat.st_mtime_ns, fonte_hash=content_hash)
+        os.replace(temporary, cache_path)
+    except OSError as e:
+        print(f"[AVISO] Não foi possível gravar o cache do grafo em '{cache_path}': {e}")
+
+
+def write_gml_cached(csr: CSRGraph, gml_path):
+    """
+    Escreve o GML (mesmo formato de nx.write_gml, rótulos em csr.nodes) direto dos arrays do CSR,
+    sem montar um nx.Graph, e já grava o cache correspondente: a primeira leitura pula o parse.
+    Os SteamIDs só viram texto aqui, na escrita.
+    """
+    rows = np.repeat(np.arange(csr.n), csr.degrees)
+    upper = rows < csr.indices
+    with open(gml_path, "w", encoding="utf-8") as f:
+        f.write("graph [\n")
+        labels = format_steamids(csr.ids) if csr.ids is not None else csr.labels
+        for i, node in enumerate(labels):
+            f.write(f'  node [\n    id {i}\n    label "{node}"\n  ]\n')
+        for u, v in zip(rows[upper].tolist(), csr.indices[upper].tolist()):
+            f.write(f"  edge [\n    source {u}\n    target {v}\n  ]\n")
+        f.write("]\n")
+    # O cache guarda o que uma leitura fria do GML devolveria (rótulos SteamID como ids)
+    _save_cache(str(gml_path) + CACHE_SUFFIX, with_steamids(csr), os.stat(gml_path), _file_hash(gml_path))
+
+
+def load_graph_cached(gml_path) -> nx.Graph:
+    """
+    Como nx.read_gml (rótulos como nós), mas passando pelo cache binário de load_csr_cached; nós que
+    são SteamIDs voltam como int em vez de texto.
+    """
+    return csr_to_graph(load_csr_cached(gml_path))
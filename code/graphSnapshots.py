@@ -0,0 +1,265 @@
+import argparse
+import json
+import os
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from csrGraph import CSRGraph, sorted_unique
+from steamIds import STEAMID_DTYPE, format_steamids, parse_steamids
+
+SNAPSHOTS_DIR = "networks/snapshots"
+MANIFEST = "snapshots.json"
+# A cada quantos snapshots um é gravado completo; os demais guardam só o delta para o anterior
+KEYFRAME_INTERVAL = 10
+
+
+class GraphSnapshot(NamedTuple):
+    """Um crawl: SteamIDs uint64 ordenados e amizades (m, 2) como pares (menor, maior) em ordem lexicográfica."""
+    nodes: np.ndarray
+    edges: np.ndarray
+
+
+class SnapshotDiff(NamedTuple):
+    nodes_added: np.ndarray
+    nodes_removed: np.ndarray
+    edges_added: np.ndarray
+    edges_removed: np.ndarray
+
+
+def canonical_snapshot(nodes, src, dst) -> GraphSnapshot:
+    """Snapshot a partir de SteamIDs e arestas (em SteamIDs); laços, repetições e arestas para fora de nodes saem."""
+    nodes = sorted_unique(parse_steamids(nodes))
+    src, dst = parse_steamids(src), parse_steamids(dst)
+    low, high = np.minimum(src, dst), np.maximum(src, dst)
+    keep = (low != high) & _contains(nodes, low) & _contains(nodes, high)
+    keys = sorted_unique(_edge_keys(nodes, np.stack((low[keep], high[keep]), axis=1)))
+    return GraphSnapshot(nodes, _keys_to_edges(nodes, keys))
+
+
+def snapshot_from_csr(csr: CSRGraph) -> GraphSnapshot:
+    """Snapshot do CSR do crawl (csr.ids, como em finalize_edge_stream e no cache do GML)."""
+    ids = csr.ids if csr.ids is not None else parse_steamids(csr.labels)
+    rows = np.repeat(np.arange(csr.n), csr.degrees)
+    upper = rows < csr.indices
+    return canonical_snapshot(ids, ids[rows[upper]], ids[csr.indices[upper]])
+
+
+def _contains(sorted_ids: np.ndarray, values: np.ndarray) -> np.ndarray:
+    if len(sorted_ids) == 0:
+        return np.zeros(len(values), dtype=bool)
+    pos = np.minimum(np.searchsorted(sorted_ids, values), len(sorted_ids) - 1)
+    return sorted_ids[pos] == values
+
+
+def _edge_keys(universe: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """
+    Chave int64 u*N+v de cada aresta, com u e v como posições no array ordenado universe. O mapeamento
+    é monotônico, então arestas em ordem lexicográfica viram chaves ordenadas.
+    """
+    n = np.int64(len(universe))
+    return np.searchsorted(universe, edges[:, 0]).astype(np.int64) * n + np.searchsorted(universe, edges[:, 1])
+
+
+def _keys_to_edges(universe: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    n = np.int64(len(universe))
+    edges = np.empty((len(keys), 2), dtype=STEAMID_DTYPE)
+    if len(keys):
+        edges[:, 0] = universe[keys // n]
+        edges[:, 1] = universe[keys % n]
+    return edges
+
+
+def _sorted_difference(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Elementos do array ordenado a que não estão no array ordenado b (busca binária, sem reordenar)."""
+    return a[~_contains(b, a)]
+
+
+def _sorted_union(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.sort(np.concatenate((a, _sorted_difference(b, a))))
+
+
+def snapshot_diff(old: GraphSnapshot, new: GraphSnapshot) -> SnapshotDiff:
+    """Membros e amizades que entraram e saíram entre dois snapshots, por buscas sobre os arrays ordenados."""
+    universe = _sorted_union(old.nodes, new.nodes)
+    old_keys, new_keys = _edge_keys(universe, old.edges), _edge_keys(universe, new.edges)
+    return SnapshotDiff(
+        nodes_added=_sorted_difference(new.nodes, old.nodes),
+        nodes_removed=_sorted_difference(old.nodes, new.nodes),
+        edges_added=_keys_to_edges(universe, _sorted_difference(new_keys, old_keys)),
+        edges_removed=_keys_to_edges(universe, _sorted_difference(old_keys, new_keys)),
+    )
+
+
+def apply_diff(base: GraphSnapshot, diff: SnapshotDiff) -> GraphSnapshot:
+    """Reconstrói o snapshot seguinte a partir do anterior e do delta gravado."""
+    nodes = _sorted_union(_sorted_difference(base.nodes, diff.nodes_removed), diff.nodes_added)
+    universe = _sorted_union(base.nodes, diff.nodes_added)
+    keys = _sorted_difference(_edge_keys(universe, base.edges), _edge_keys(universe, diff.edges_removed))
+    keys = np.sort(np.concatenate((keys, _edge_keys(universe, diff.edges_added))))
+    return GraphSnapshot(nodes, _keys_to_edges(universe, keys))
+
+
+def degrees(snapshot: GraphSnapshot) -> np.ndarray:
+    """Grau de cada nó de snapshot.nodes (mesma ordem)."""
+    positions = np.searchsorted(snapshot.nodes, snapshot.edges.ravel())
+    return np.bincount(positions, minlength=len(snapshot.nodes))
+
+
+def degree_changes(old: GraphSnapshot, new: GraphSnapshot) -> pd.DataFrame:
+    """
+    Variação de grau dos membros presentes nos dois snapshots, só para quem mudou, da maior variação
+    absoluta para a menor.
+    """
+    common = old.nodes[_contains(new.nodes, old.nodes)]
+    before = degrees(old)[np.searchsorted(old.nodes, common)]
+    after = degrees(new)[np.searchsorted(new.nodes, common)]
+    changed = before != after
+    df = pd.DataFrame({
+        "steamid": format_steamids(common[changed]),
+        "grau_antes": before[changed],
+        "grau_depois": after[changed],
+    })
+    df["variacao"] = df["grau_depois"] - df["grau_antes"]
+    return df.reindex(df["variacao"].abs().sort_values(ascending=False, kind="stable").index).reset_index(drop=True)
+
+
+def diff_summary(old: GraphSnapshot, new: GraphSnapshot, diff: SnapshotDiff = None) -> dict:
+    """Resumo do churn entre dois crawls: entradas e saídas de membros e de amizades, e variação de grau."""
+    diff = diff if diff is not None else snapshot_diff(old, new)
+    changes = degree_changes(old, new)
+    return {
+        "membros_antes": len(old.nodes),
+        "membros_depois": len(new.nodes),
+        "membros_entraram": len(diff.nodes_added),
+        "membros_sairam": len(diff.nodes_removed),
+        "amizades_antes": len(old.edges),
+        "amizades_depois": len(new.edges),
+        "amizades_adicionadas": len(diff.edges_added),
+        "amizades_removidas": len(diff.edges_removed),
+        "membros_grau_mudou": len(changes),
+        "grau_medio_antes": 2 * len(old.edges) / len(old.nodes) if len(old.nodes) else 0.0,
+        "grau_medio_depois": 2 * len(new.edges) / len(new.nodes) if len(new.nodes) else 0.0,
+    }
+
+
+class SnapshotStore:
+    """
+    Crawls sucessivos num diretório: um keyframe completo a cada keyframe_interval snapshots e,
+    entre eles, só o delta para o snapshot anterior, de modo que o que não mudou não é regravado.
+    Um snapshot é reconstruído a partir do keyframe mais próximo, aplicando os deltas em sequência.
+    """
+
+    def __init__(self, root=SNAPSHOTS_DIR, keyframe_interval: int = KEYFRAME_INTERVAL):
+        self.root = root
+        self.keyframe_interval = keyframe_interval
+        os.makedirs(root, exist_ok=True)
+        manifest = os.path.join(root, MANIFEST)
+        self.entries = []
+        if os.path.exists(manifest):
+            with open(manifest, encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def labels(self) -> list:
+        return [entry["label"] for entry in self.entries]
+
+    def _path(self, label: str) -> str:
+        return os.path.join(self.root, f"{label}.npz")
+
+    def _save_manifest(self):
+        temporary = os.path.join(self.root, MANIFEST + ".tmp")
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(temporary, os.path.join(self.root, MANIFEST))
+
+    def unique_label(self, label: str) -> str:
+        """O próprio rótulo, ou ele com sufixo _2, _3, ... se já existir um snapshot com esse nome."""
+        labels = set(self.labels())
+        candidate, suffix = label, 2
+        while candidate in labels:
+            candidate, suffix = f"{label}_{suffix}", suffix + 1
+        return candidate
+
+    def add(self, label: str, snapshot: GraphSnapshot) -> tuple:
+        """
+        Grava o snapshot com o rótulo dado (ex.: a data do crawl), depois dos existentes. Retorna
+        (snapshot anterior, diff para ele), ambos None se for o primeiro: o anterior já precisou ser
+        reconstruído para o diff, então quem chama não precisa carregá-lo de novo.
+        """
+        if label in self.labels():
+            raise ValueError(f"Já existe um snapshot com o rótulo '{label}'")
+        previous = self.load(self.entries[-1]["label"]) if self.entries else None
+        diff = snapshot_diff(previous, snapshot) if previous is not None else None
+        keyframe = previous is None or len(self.entries) % self.keyframe_interval == 0
+        if keyframe:
+            np.savez(self._path(label), nodes=snapshot.nodes, edges=snapshot.edges)
+        else:
+            np.savez(self._path(label), **diff._asdict())
+        self.entries.append({"label": label, "keyframe": keyframe,
+                             "membros": len(snapshot.nodes), "amizades": len(snapshot.edges)})
+        self._save_manifest()
+        return previous, diff
+
+    def add_csr(self, label: str, csr: CSRGraph) -> tuple:
+        return self.add(label, snapshot_from_csr(csr))
+
+    def _read_diff(self, label: str) -> SnapshotDiff:
+        with np.load(self._path(label)) as data:
+            return SnapshotDiff(**{field: data[field] for field in SnapshotDiff._fields})
+
+    def load(self, label: str) -> GraphSnapshot:
+        labels = self.labels()
+        position = labels.index(label)
+        start = max(i for i in range(position + 1) if self.entries[i]["keyframe"])
+        with np.load(self._path(labels[start])) as data:
+            snapshot = GraphSnapshot(data["nodes"], data["edges"])
+        for i in range(start + 1, position + 1):
+            snapshot = apply_diff(snapshot, self._read_diff(labels[i]))
+        return snapshot
+
+    def iter_snapshots(self):
+        """(rótulo, snapshot) em ordem, reconstruindo cada um a partir do anterior: só um fica em memória."""
+        snapshot = None
+        for entry in self.entries:
+            if entry["keyframe"]:
+                with np.load(self._path(entry["label"])) as data:
+                    snapshot = GraphSnapshot(data["nodes"], data["edges"])
+            else:
+                snapshot = apply_diff(snapshot, self._read_diff(entry["label"]))
+            yield entry["label"], snapshot
+
+    def diff(self, old_label: str, new_label: str) -> SnapshotDiff:
+        return snapshot_diff(self.load(old_label), self.load(new_label))
+
+    def churn(self) -> pd.DataFrame:
+        """Resumo do churn entre cada par de crawls consecutivos, com dois snapshots em memória por vez."""
+        rows = []
+        previous_label, previous = None, None
+        for label, snapshot in self.iter_snapshots():
+            if previous is not None:
+                rows.append({"de": previous_label, "para": label, **diff_summary(previous, snapshot)})
+            previous_label, previous = label, snapshot
+        return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Churn entre crawls sucessivos da rede do grupo.")
+    parser.add_argument("--root", default=SNAPSHOTS_DIR, help="Diretório dos snapshots")
+    parser.add_argument("--de", dest="old", help="Rótulo do snapshot inicial (com --para, compara só os dois)")
+    parser.add_argument("--para", dest="new", help="Rótulo do snapshot final")
+    parser.add_argument("--saida", default="datasets/churn_rede.csv", help="CSV com o churn entre crawls consecutivos")
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.root)
+    if args.old and args.new:
+        old, new = store.load(args.old), store.load(args.new)
+        for key, value in diff_summary(old, new).items():
+            print(f"{key}: {value}")
+        print("\nMaiores variações de grau:")
+        print(degree_changes(old, new).head(20))
+    else:
+        df_churn = store.churn()
+        df_churn.to_csv(args.saida, index=False)
+        print(df_churn)
+        print(f"\nChurn de {len(store.entries)} snapshots salvo em '{args.saida}'")
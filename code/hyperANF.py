@@ -0,0 +1,131 @@
+import numpy as np
+
+from csrGraph import CSRGraph
+
+# Linhas do CSR processadas por bloco em cada passada (limita a cópia de registradores dos vizinhos)
+CHUNK_ROWS = 65_536
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    """Hash splitmix64 vetorizado (aritmética em uint64 com overflow intencional)."""
+    with np.errstate(over="ignore"):
+        z = x.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+def _bit_length(x: np.ndarray) -> np.ndarray:
+    """Número de bits significativos de cada uint64, por busca binária nos deslocamentos."""
+    x = x.copy()
+    length = np.zeros(x.shape, dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        big = x >= (np.uint64(1) << np.uint64(shift))
+        length[big] += shift
+        x[big] >>= np.uint64(shift)
+    return length + (x > 0)
+
+
+def _alpha(m: int) -> float:
+    if m == 16:
+        return 0.673
+    if m == 32:
+        return 0.697
+    if m == 64:
+        return 0.709
+    return 0.7213 / (1 + 1.079 / m)
+
+
+def init_registers(n: int, log2m: int = 6, seed: int = 0) -> np.ndarray:
+    """Contadores HyperLogLog (n x 2^log2m registradores uint8), cada nó contendo apenas a si mesmo."""
+    m = 1 << log2m
+    h = _splitmix64(np.arange(n, dtype=np.uint64) + np.uint64(seed) * np.uint64(n))
+    bucket = (h >> np.uint64(64 - log2m)).astype(np.int64)
+    rest = h & ((np.uint64(1) << np.uint64(64 - log2m)) - np.uint64(1))
+    rho = (64 - log2m) - _bit_length(rest) + 1
+
+    registers = np.zeros((n, m), dtype=np.uint8)
+    registers[np.arange(n), bucket] = rho
+    return registers
+
+
+def estimate(registers: np.ndarray) -> np.ndarray:
+    """Estimativa de cardinalidade de cada contador, com a correção de contagem linear para conjuntos pequenos."""
+    m = registers.shape[1]
+    raw = _alpha(m) * m * m / np.ldexp(1.0, -registers.astype(np.int64)).sum(axis=1)
+    zeros = (registers == 0).sum(axis=1)
+    small = (raw <= 2.5 * m) & (zeros > 0)
+    raw[small] = m * np.log(m / zeros[small])
+    return raw
+
+
+def _union_with_neighbors(csr: CSRGraph, registers: np.ndarray, chunk_rows: int) -> np.ndarray:
+    """Uma passada HyperANF: cada contador recebe o máximo registrador a registrador dos vizinhos."""
+    new = registers.copy()
+    deg = csr.degrees
+    for start in range(0, csr.n, chunk_rows):
+        stop = min(start + chunk_rows, csr.n)
+        rows = np.arange(start, stop)[deg[start:stop] > 0]
+        if not len(rows):
+            continue
+        lo, hi = csr.indptr[start], csr.indptr[stop]
+        neighbor_regs = registers[csr.indices[lo:hi]]
+        # reduceat sobre os offsets das linhas não vazias do bloco
+        merged = np.maximum.reduceat(neighbor_regs, csr.indptr[rows] - lo, axis=0)
+        new[rows] = np.maximum(new[rows], merged)
+    return new
+
+
+def neighbourhood_function(csr: CSRGraph, log2m: int = 6, max_iter: int = 1000,
+                           seed: int = 0, chunk_rows: int = CHUNK_ROWS) -> np.ndarray:
+    """
+    Função de vizinhança N(t): número estimado de pares (u, v) com distância <= t.
+    Para quando nenhum registrador muda; cada iteração é uma passada sobre as arestas.
+    """
+    registers = init_registers(csr.n, log2m, seed)
+    hop_plot = [estimate(registers).sum()]
+    for _ in range(max_iter):
+        new = _union_with_neighbors(csr, registers, chunk_rows)
+        if np.array_equal(new, registers):
+            break
+        registers = new
+        hop_plot.append(estimate(registers).sum())
+    return np.maximum.accumulate(np.asarray(hop_plot))
+
+
+def distance_statistics(hop_plot: np.ndarray, quantile: float = 0.9) -> dict:
+    """
+    Estatísticas de distância a partir da função de vizinhança.
+    O diâmetro efetivo é o menor t (interpolado) em que N(t) alcança a fração quantile dos pares
+    alcançáveis; a distância média considera só os pares distintos alcançáveis.
+    """
+    hop_plot = np.asarray(hop_plot, dtype=np.float64)
+    reachable = hop_plot - hop_plot[0]
+    total = reachable[-1]
+    if total <= 0:
+        return {"diametro_efetivo": 0.0, "distancia_media": 0.0, "diametro_minimo": 0, "hop_plot": hop_plot}
+
+    fraction = reachable / total
+    t = int(np.searchsorted(fraction, quantile))
+    if t == 0:
+        effective = 0.0
+    else:
+        gap = fraction[t] - fraction[t - 1]
+        effective = t - 1 + ((quantile - fraction[t - 1]) / gap if gap > 0 else 1.0)
+
+    increments = np.diff(hop_plot)
+    average = float(np.dot(np.arange(1, len(hop_plot)), increments) / total)
+    return {
+        "diametro_efetivo": float(effective),
+        "distancia_media": average,
+        "diametro_minimo": len(hop_plot) - 1,
+        "hop_plot": hop_plot,
+    }
+
+
+def approximate_distances(csr: CSRGraph, log2m: int = 6, runs: int = 1, seed: int = 0, **kwargs) -> dict:
+    """Executa HyperANF runs vezes com sementes diferentes e devolve as estatísticas da média dos hop plots."""
+    plots = [neighbourhood_function(csr, log2m=log2m, seed=seed + r, **kwargs) for r in range(runs)]
+    length = max(len(p) for p in plots)
+    padded = np.array([np.pad(p, (0, length - len(p)), mode="edge") for p in plots])
+    return distance_statistics(padded.mean(axis=0))
@@ -0,0 +1,207 @@
+import numpy as np
+
+
+class IncrementalGraphMetrics:
+    """
+    Mantém métricas de um grafo não-direcionado enquanto as arestas chegam.
+    Cada inserção custa O(min(grau(u), grau(v))): grau, componentes conexos (union-find),
+    triângulos e clustering local são atualizados apenas nos nós afetados.
+    """
+
+    def __init__(self):
+        self.adj = {}
+        self.triangles = {}
+        self.num_edges = 0
+        self.total_triangles = 0
+        self.num_components = 0
+        self.largest_component = 0
+        self._parent = {}
+        self._size = {}
+        self._clustering_sum = 0.0
+
+    # --- Inserções ---
+
+    def add_node(self, node):
+        """Adiciona um nó isolado (ignorado se já existir)."""
+        if node in self.adj:
+            return
+        self.adj[node] = set()
+        self.triangles[node] = 0
+        self._parent[node] = node
+        self._size[node] = 1
+        self.num_components += 1
+        self.largest_component = max(self.largest_component, 1)
+
+    def add_nodes_from(self, nodes):
+        for node in nodes:
+            self.add_node(node)
+
+    def add_friends(self, node, friends, listed: bool = True):
+        """
+        Insere as arestas node—amigo, com a mesma interface de CrawlProgressMetrics.add_friends;
+        amizades já vistas pelo outro lado são ignoradas por add_edge.
+        """
+        self.add_node(node)
+        for friend in np.asarray(friends).tolist():
+            self.add_edge(node, friend)
+
+    def add_edge(self, u, v) -> bool:
+        """
+        Insere a aresta (u, v). Retorna False se ela já existia ou é um laço,
+        o que permite alimentar a estrutura com amizades vistas pelos dois lados.
+        """
+        if u == v:
+            return False
+        self.add_node(u)
+        self.add_node(v)
+        adj_u, adj_v = self.adj[u], self.adj[v]
+        if v in adj_u:
+            return False
+
+        smaller, larger = (adj_u, adj_v) if len(adj_u) <= len(adj_v) else (adj_v, adj_u)
+        common = [w for w in smaller if w in larger]
+        affected = [u, v] + common
+
+        self._clustering_sum -= sum(self.local_clustering(x) for x in affected)
+        adj_u.add(v)
+        adj_v.add(u)
+        self.num_edges += 1
+        self.triangles[u] += len(common)
+        self.triangles[v] += len(common)
+        for w in common:
+            self.triangles[w] += 1
+        self.total_triangles += len(common)
+        self._clustering_sum += sum(self.local_clustering(x) for x in affected)
+
+        self._union(u, v)
+        return True
+
+    # --- Union-find ---
+
+    def _find(self, x):
+        parent = self._parent
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:  # compressão de caminho
+            parent[x], x = root, parent[x]
+        return root
+
+    def _union(self, u, v):
+        ru, rv = self._find(u), self._find(v)
+        if ru == rv:
+            return
+        if self._size[ru] < self._size[rv]:
+            ru, rv = rv, ru
+        self._parent[rv] = ru
+        self._size[ru] += self._size.pop(rv)
+        self.num_components -= 1
+        self.largest_component = max(self.largest_component, self._size[ru])
+
+    # --- Consultas ---
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.adj)
+
+    def degree(self, node) -> int:
+        return len(self.adj[node])
+
+    def local_clustering(self, node) -> float:
+        """Coeficiente de clustering local, com a mesma definição de nx.clustering."""
+        d = len(self.adj[node])
+        if d < 2:
+            return 0.0
+        return 2 * self.triangles[node] / (d * (d - 1))
+
+    def average_clustering(self) -> float:
+        """Clustering médio em O(1), a partir da soma mantida incrementalmente."""
+        return self._clustering_sum / self.num_nodes if self.num_nodes else 0.0
+
+    def component_of(self, node):
+        """Representante do componente conexo do nó."""
+        return self._find(node)
+
+    def connected(self, u, v) -> bool:
+        return self._find(u) == self._find(v)
+
+    def component_size(self, node) -> int:
+        return self._size[self._find(node)]
+
+    def summary(self) -> dict:
+        """Retrato das métricas globais, barato o suficiente para ser consultado a cada inserção."""
+        return {
+            "nos": self.num_nodes,
+            "arestas": self.num_edges,
+            "componentes": self.num_components,
+            "maior_componente": self.largest_component,
+            "triangulos": self.total_triangles,
+            "grau_medio": 2 * self.num_edges / self.num_nodes if self.num_nodes else 0.0,
+            "clustering_medio": self.average_clustering(),
+        }
+
+
+class CrawlProgressMetrics:
+    """
+    Métricas parciais do crawl em memória O(n), sem guardar a adjacência: grau por nó (array) e
+    componentes conexos (union-find em arrays), para nós 0..n-1 visitados em ordem crescente.
+    Cada amizade costuma aparecer duas vezes (na lista de cada lado); ela é contada pelo lado de
+    menor índice, ou pelo de maior índice quando a lista do outro não veio (perfil privado ou erro),
+    o que supõe listas de amigos simétricas, como são na Steam. O grafo exato vem do arquivo de arestas.
+    """
+
+    def __init__(self, n: int):
+        self.degrees = np.zeros(n, dtype=np.int64)
+        self._parent = np.arange(n, dtype=np.int64)
+        self._size = np.ones(n, dtype=np.int64)
+        self._listed = np.zeros(n, dtype=bool)
+        self.num_edges = 0
+        self.num_components = n
+        self.largest_component = 1 if n else 0
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.degrees)
+
+    def _find(self, x: int) -> int:
+        root = x
+        while self._parent[root] != root:
+            root = self._parent[root]
+        while self._parent[x] != root:
+            self._parent[x], x = root, self._parent[x]
+        return root
+
+    def _union(self, u: int, v: int):
+        ru, rv = self._find(u), self._find(v)
+        if ru == rv:
+            return
+        if self._size[ru] < self._size[rv]:
+            ru, rv = rv, ru
+        self._parent[rv] = ru
+        self._size[ru] += self._size[rv]
+        self.num_components -= 1
+        self.largest_component = max(self.largest_component, int(self._size[ru]))
+
+    def add_friends(self, node: int, friends, listed: bool = True):
+        """
+        Registra os amigos (índices) de node. listed diz se a lista de amigos dele veio da API,
+        mesmo que sem nenhum amigo no grupo.
+        """
+        friends = np.unique(np.asarray(friends, dtype=np.int64))
+        friends = friends[friends != node]
+        new = friends[(friends > node) | ~self._listed[friends]]
+        self._listed[node] = listed
+        self.degrees[node] += len(new)
+        np.add.at(self.degrees, new, 1)
+        self.num_edges += len(new)
+        for friend in new.tolist():
+            self._union(node, friend)
+
+    def summary(self) -> dict:
+        return {
+            "nos": self.num_nodes,
+            "arestas": self.num_edges,
+            "componentes": self.num_components,
+            "maior_componente": self.largest_component,
+            "grau_medio": 2 * self.num_edges / self.num_nodes if self.num_nodes else 0.0,
+        }
@@ -0,0 +1,56 @@
+import numpy as np
+
+from csrGraph import CSRGraph, graph_to_csr, induced_subgraph
+
+
+def core_numbers(csr: CSRGraph) -> np.ndarray:
+    """
+    Número de core de cada nó pelo algoritmo de baldes de Batagelj & Zaversnik, O(n + m).
+    Os nós ficam num vetor ordenado por grau; ao remover o nó de menor grau, cada vizinho
+    com grau maior desce um balde trocando de posição com o primeiro nó do seu balde.
+    """
+    n = csr.n
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    deg = csr.degrees.tolist()
+    indptr = csr.indptr.tolist()
+    indices = csr.indices.tolist()
+    max_deg = max(deg)
+
+    # Início de cada balde de grau no vetor ordenado (counting sort)
+    counts = np.bincount(deg, minlength=max_deg + 1)
+    bin_start = np.concatenate(([0], np.cumsum(counts)[:-1])).tolist()
+    order = np.argsort(deg, kind="stable").tolist()
+    pos = [0] * n
+    for i, v in enumerate(order):
+        pos[v] = i
+
+    for i in range(n):
+        v = order[i]
+        dv = deg[v]
+        for u in indices[indptr[v]:indptr[v + 1]]:
+            du = deg[u]
+            if du > dv:
+                pu = pos[u]
+                pw = bin_start[du]
+                w = order[pw]
+                if u != w:
+                    order[pu], order[pw] = w, u
+                    pos[u], pos[w] = pw, pu
+                bin_start[du] += 1
+                deg[u] = du - 1
+
+    return np.asarray(deg, dtype=np.int64)
+
+
+def k_core(csr: CSRGraph, k: int, cores: np.ndarray = None) -> tuple:
+    """k-core como CSR compacto, junto com os índices originais dos nós mantidos."""
+    if cores is None:
+        cores = core_numbers(csr)
+    return induced_subgraph(csr, cores >= k)
+
+
+def restrict_to_min_core(G, k: int):
+    """Restringe um grafo NetworkX ao seu k-core (nós com número de core >= k)."""
+    core, _ = k_core(graph_to_csr(G), k)
+    return G.subgraph(core.nodes).copy()
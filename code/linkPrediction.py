@@ -0,0 +1,203 @@
+import numpy as np
+import scipy.sparse as sp
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import roc_auc_score
+from sklearn.preprocessing import StandardScaler
+
+from csrGraph import CSRGraph, adjacency_matrix, edge_keys, edges_to_csr, has_edges
+from kCore import core_numbers
+from ownershipMatrix import edge_jaccard, edge_weighted_jaccard
+
+FEATURES = ("jaccard", "jaccard_ponderado", "vizinhos_comuns", "grau_min", "grau_max", "core_min", "core_max")
+MODELS = ("sgd", "boosting")
+# Pares processados por lote ao calcular atributos e ao treinar/avaliar o modelo linear
+CHUNK_PAIRS = 500_000
+# Rodadas sem nenhum par novo antes de desistir da amostragem (grafos quase completos)
+MAX_IDLE_ROUNDS = 20
+
+
+def positive_pairs(csr: CSRGraph) -> tuple:
+    """Todas as arestas como pares (u, v) com u < v, direto dos arrays do CSR."""
+    rows = np.repeat(np.arange(csr.n, dtype=np.int64), csr.degrees)
+    upper = rows < csr.indices
+    return rows[upper], csr.indices[upper]
+
+
+def _collect_non_edges(draw, keys: np.ndarray, n: int, num_pairs: int, rng) -> np.ndarray:
+    """Sorteia lotes de pares com draw(rng, tamanho) até juntar num_pairs não-arestas distintas (chaves u*n+v, u < v)."""
+    collected = np.zeros(0, dtype=np.int64)
+    idle = 0
+    while len(collected) < num_pairs and idle < MAX_IDLE_ROUNDS:
+        u, v = draw(rng, 2 * (num_pairs - len(collected)) + 16)
+        u, v = np.minimum(u, v), np.maximum(u, v)
+        valid = (u != v) & ~has_edges(keys, n, u, v)
+        before = len(collected)
+        collected = np.union1d(collected, u[valid] * n + v[valid])
+        idle = idle + 1 if len(collected) == before else 0
+    return rng.permutation(collected)[:num_pairs]
+
+
+def sample_negative_pairs(csr: CSRGraph, num_pairs: int, hard_fraction: float = 0.5, seed=None) -> tuple:
+    """
+    Pares de não-amigos (u < v) para treino. Uma fração hard_fraction são negativos difíceis,
+    amigos de amigos obtidos por passeios de dois passos sorteados direto no CSR; o resto é uniforme.
+    """
+    rng = np.random.default_rng(seed)
+    n = csr.n
+    keys = edge_keys(csr)
+    rows = np.repeat(np.arange(n, dtype=np.int64), csr.degrees)
+    degrees = csr.degrees
+
+    def two_hop(rng, size):
+        # Ponta de aresta aleatória (u -> z) e, em seguida, um vizinho aleatório de z
+        position = rng.integers(0, len(csr.indices), size)
+        u, z = rows[position], csr.indices[position]
+        v = csr.indices[csr.indptr[z] + (rng.random(size) * degrees[z]).astype(np.int64)]
+        return u, v
+
+    def uniform(rng, size):
+        return rng.integers(0, n, size), rng.integers(0, n, size)
+
+    num_hard = int(round(num_pairs * hard_fraction)) if len(csr.indices) else 0
+    hard = _collect_non_edges(two_hop, keys, n, num_hard, rng)
+    easy = _collect_non_edges(uniform, keys, n, num_pairs - len(hard), rng)
+    # Um par uniforme pode repetir um difícil; a chave única resolve
+    pairs = np.unique(np.concatenate((hard, easy)))
+    return pairs // n, pairs % n
+
+
+class PairFeaturizer:
+    """
+    Calcula a matriz de atributos (FEATURES) de lotes de pares (u, v) de forma vetorizada.
+    Atributos de grafo vêm de graph, que não deve conter as arestas usadas como rótulo.
+    """
+
+    def __init__(self, graph: CSRGraph, ownership: sp.csr_matrix, weights: sp.csr_matrix, cores: np.ndarray = None):
+        self.graph = graph
+        self.ownership = ownership
+        self.weights = weights
+        self.adjacency = adjacency_matrix(graph)
+        self.degrees = graph.degrees
+        self.cores = core_numbers(graph) if cores is None else cores
+
+    def __call__(self, u, v) -> np.ndarray:
+        u = np.asarray(u, dtype=np.int64)
+        v = np.asarray(v, dtype=np.int64)
+        common = np.asarray(self.adjacency[u].multiply(self.adjacency[v]).sum(axis=1)).ravel()
+        deg_u, deg_v = self.degrees[u], self.degrees[v]
+        return np.column_stack((
+            edge_jaccard(self.ownership, u, v),
+            edge_weighted_jaccard(self.weights, u, v),
+            common,
+            np.minimum(deg_u, deg_v),
+            np.maximum(deg_u, deg_v),
+            np.minimum(self.cores[u], self.cores[v]),
+            np.maximum(self.cores[u], self.cores[v]),
+        )).astype(np.float32)
+
+
+def build_features(featurizer: PairFeaturizer, u, v, path=None) -> np.ndarray:
+    """
+    Atributos de todos os pares, calculados em lotes de CHUNK_PAIRS. Com path, a matriz é gravada
+    num .npy mapeado em memória, e só um lote por vez fica na RAM.
+    """
+    shape = (len(u), len(FEATURES))
+    if path is None:
+        features = np.empty(shape, dtype=np.float32)
+    else:
+        features = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=shape)
+    for start in range(0, len(u), CHUNK_PAIRS):
+        stop = start + CHUNK_PAIRS
+        features[start:stop] = featurizer(u[start:stop], v[start:stop])
+    if path is not None:
+        features.flush()
+    return features
+
+
+def _chunks(indices: np.ndarray):
+    for start in range(0, len(indices), CHUNK_PAIRS):
+        yield indices[start:start + CHUNK_PAIRS]
+
+
+def train_and_evaluate(features: np.ndarray, labels: np.ndarray, is_test: np.ndarray, model: str = "sgd",
+                       epochs: int = 20, seed=None) -> dict:
+    """
+    Treina um classificador de amizade e mede a AUC nos pares de teste.
+    "sgd": regressão logística por SGD com partial_fit em lotes (out-of-core, serve para memmap), sobre
+    atributos padronizados, com passo constante e média dos pesos (a taxa "optimal" padrão diverge
+    com atributos de escalas tão diferentes);
+    "boosting": HistGradientBoosting, que carrega os pares de treino na memória.
+    Também mede a AUC do Jaccard sozinho, como referência. As AUCs são NaN se o teste tiver uma classe só.
+    """
+    if model not in MODELS:
+        raise ValueError(f"Modelo desconhecido: {model}. Use um de {MODELS}.")
+    rng = np.random.default_rng(seed)
+    train = np.flatnonzero(~is_test)
+    test = np.flatnonzero(is_test)
+    result = {"modelo": model, "n_treino": len(train), "n_teste": len(test)}
+
+    if model == "sgd":
+        scaler = StandardScaler()
+        for chunk in _chunks(train):
+            scaler.partial_fit(features[chunk])
+        classifier = SGDClassifier(loss="log_loss", alpha=1e-4, learning_rate="constant", eta0=0.01,
+                                   average=True, random_state=seed)
+        for _ in range(epochs):
+            for chunk in _chunks(rng.permutation(train)):
+                chunk = np.sort(chunk)  # leitura sequencial do memmap
+                classifier.partial_fit(scaler.transform(features[chunk]), labels[chunk], classes=[0, 1])
+        scores = np.concatenate([classifier.decision_function(scaler.transform(features[chunk]))
+                                 for chunk in _chunks(test)])
+        result["coeficientes"] = dict(zip(FEATURES, classifier.coef_[0].tolist()))
+    else:
+        classifier = HistGradientBoostingClassifier(random_state=seed)
+        classifier.fit(features[train], labels[train])
+        scores = np.concatenate([classifier.predict_proba(features[chunk])[:, 1] for chunk in _chunks(test)])
+
+    test_labels = labels[test]
+    if len(np.unique(test_labels)) < 2:
+        print("[AVISO] O conjunto de teste tem uma classe só; AUC indefinida.")
+        result["auc"] = result["auc_jaccard"] = float("nan")
+        return result
+    result["auc"] = float(roc_auc_score(test_labels, scores))
+    result["auc_jaccard"] = float(roc_auc_score(test_labels, features[test, FEATURES.index("jaccard")]))
+    return result
+
+
+def stratified_test_mask(labels: np.ndarray, test_fraction: float, rng) -> np.ndarray:
+    """Sorteia test_fraction de cada classe para o teste (ao menos um par por classe que tenha dois ou mais)."""
+    is_test = np.zeros(len(labels), dtype=bool)
+    for label in np.unique(labels):
+        members = np.flatnonzero(labels == label)
+        num_test = int(round(len(members) * test_fraction))
+        if len(members) > 1:
+            num_test = min(max(num_test, 1), len(members) - 1)
+        is_test[rng.choice(members, num_test, replace=False)] = True
+    return is_test
+
+
+def link_prediction(csr: CSRGraph, ownership: sp.csr_matrix, weights: sp.csr_matrix, negatives_per_positive: float = 1,
+                    hard_fraction: float = 0.5, positive_fraction: float = 0.2, test_fraction: float = 0.2,
+                    model: str = "sgd", features_path=None, seed=None) -> dict:
+    """
+    Pipeline completo de previsão de amizades a partir de atributos de biblioteca e de grafo.
+    Uma fração positive_fraction das arestas vira o conjunto de positivos e sai do grafo observado,
+    de onde vêm vizinhos comuns, graus e cores: assim positivos de treino e de teste são medidos
+    igualmente, sem a própria aresta. Com features_path, a matriz de atributos fica em disco
+    (memmap) e o treino linear roda em lotes.
+    """
+    rng = np.random.default_rng(seed)
+    all_u, all_v = positive_pairs(csr)
+    is_positive = rng.random(len(all_u)) < positive_fraction
+    pos_u, pos_v = all_u[is_positive], all_v[is_positive]
+    observed = edges_to_csr(csr.n, all_u[~is_positive], all_v[~is_positive])._replace(ids=csr.ids, labels=csr.labels)
+    neg_u, neg_v = sample_negative_pairs(csr, int(len(pos_u) * negatives_per_positive), hard_fraction, rng)
+
+    u = np.concatenate((pos_u, neg_u))
+    v = np.concatenate((pos_v, neg_v))
+    labels = np.concatenate((np.ones(len(pos_u), dtype=np.int8), np.zeros(len(neg_u), dtype=np.int8)))
+    is_test = stratified_test_mask(labels, test_fraction, rng)
+
+    features = build_features(PairFeaturizer(observed, ownership, weights), u, v, features_path)
+    return train_and_evaluate(features, labels, is_test, model, seed=seed)
@@ -1,14 +1,26 @@
+import argparse
 import networkx as nx
 import community as community_louvain
 import matplotlib.pyplot as plt
 import matplotlib.cm as cm
 import pandas as pd
 
+from connectedComponents import restrict_to_giant_component
+from graphCache import load_graph_cached
+from kCore import restrict_to_min_core
+
+parser = argparse.ArgumentParser(description="Detecção de comunidades com o método de Louvain.")
+parser.add_argument("--giant-component", action="store_true",
+                    help="Executa o Louvain e o layout apenas no maior componente conexo.")
+parser.add_argument("--min-core", type=int, default=0,
+                    help="Executa o Louvain e o layout apenas no k-core com k >= MIN_CORE.")
+args = parser.parse_args()
+
 # --- 1. Carregar o seu grafo GML ---
 gml_file_path = r'\networks\rede_steam_bannerlord_group.gml'
 
 try:
-    G = nx.read_gml(gml_file_path)
+    G = load_graph_cached(gml_file_path)
     print(f"✅ Grafo '{gml_file_path}' carregado com sucesso!")
     print(f"   - Número de nós: {G.number_of_nodes()}")
     print(f"   - Número de arestas: {G.number_of_edges()}")
@@ -16,6 +28,14 @@ except FileNotFoundError:
     print(f"❌ ERRO: O arquivo não foi encontrado no caminho especificado.")
     exit()
 
+if args.min_core > 0:
+    G = restrict_to_min_core(G, args.min_core)
+    print(f"   - Restrito ao {args.min_core}-core: {G.number_of_nodes()} nós e {G.number_of_edges()} arestas")
+
+if args.giant_component:
+    G = restrict_to_giant_component(G)
+    print(f"   - Restrito ao maior componente conexo: {G.number_of_nodes()} nós e {G.number_of_edges()} arestas")
+
 # --- 2. Aplicar o Método de Louvain ---
 if nx.is_directed(G):
     G_undirected = G.to_undirected()
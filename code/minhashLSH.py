@@ -0,0 +1,198 @@
+import numpy as np
+import scipy.sparse as sp
+
+from csrGraph import CSRGraph, edge_keys, has_edges
+from ownershipMatrix import edge_jaccard
+
+# Primo de Mersenne 2^31 - 1: (a * x + b) cabe em int64 para a, b, x < 2^31
+MERSENNE_PRIME = (1 << 31) - 1
+EMPTY_SIGNATURE = MERSENNE_PRIME
+# Limite de valores de hash (permutações x entradas) materializados por bloco
+CHUNK_HASHES = 16_000_000
+# Baldes LSH maiores que isto não viram pares candidatos (seriam O(tamanho²)); em similar_pairs seus
+# membros são comparados por Jaccard exato em blocos, sem materializar os pares abaixo do limiar
+MAX_BUCKET_SIZE = 1_000
+
+
+def minhash_signatures(matrix: sp.csr_matrix, num_perm: int = 128, seed: int = 0) -> np.ndarray:
+    """
+    Matriz de assinaturas MinHash (usuários x num_perm) das bibliotecas de jogos.
+    Cada permutação é aproximada por h(x) = (a x + b) mod p sobre o índice da coluna,
+    e o mínimo por usuário sai de um np.minimum.reduceat sobre as entradas do CSR.
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, MERSENNE_PRIME, size=num_perm, dtype=np.int64)
+    b = rng.integers(0, MERSENNE_PRIME, size=num_perm, dtype=np.int64)
+
+    n = matrix.shape[0]
+    signatures = np.full((n, num_perm), EMPTY_SIGNATURE, dtype=np.int64)
+    nonempty = np.flatnonzero(np.diff(matrix.indptr) > 0)
+    if not len(nonempty):
+        return signatures
+
+    columns = matrix.indices.astype(np.int64)
+    perm_block = max(1, CHUNK_HASHES // max(1, len(columns)))
+    for start in range(0, num_perm, perm_block):
+        stop = min(start + perm_block, num_perm)
+        hashed = (a[start:stop, None] * columns[None, :] + b[start:stop, None]) % MERSENNE_PRIME
+        signatures[nonempty, start:stop] = np.minimum.reduceat(hashed, matrix.indptr[nonempty], axis=1).T
+    return signatures
+
+
+def estimated_jaccard(signatures: np.ndarray, u, v) -> np.ndarray:
+    """Jaccard estimado pela fração de assinaturas iguais; pares com biblioteca vazia valem 0."""
+    su, sv = signatures[u], signatures[v]
+    estimate = (su == sv).mean(axis=1)
+    empty = (su[:, 0] == EMPTY_SIGNATURE) | (sv[:, 0] == EMPTY_SIGNATURE)
+    estimate[empty] = 0.0
+    return estimate
+
+
+def choose_bands(num_perm: int, threshold: float) -> tuple:
+    """
+    Escolhe (bandas, linhas por banda) com bandas * linhas <= num_perm cujo limiar
+    aproximado (1 / bandas) ^ (1 / linhas) fica mais próximo do limiar desejado.
+    """
+    best = None
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        error = abs((1.0 / bands) ** (1.0 / rows) - threshold)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+
+def lsh_candidate_pairs(signatures: np.ndarray, bands: int, rows: int,
+                        max_bucket_size: int = MAX_BUCKET_SIZE) -> tuple:
+    """
+    Pares candidatos (i < j) que coincidem em pelo menos uma banda inteira da assinatura.
+    Cada banda é reduzida a uma chave de 64 bits; usuários com a mesma chave caem no mesmo balde.
+    Baldes com mais de max_bucket_size membros não são expandidos em pares: voltam à parte, como
+    arrays de membros (sem repetir o mesmo conjunto de bandas diferentes). Retorna (pares, baldes_grandes).
+    """
+    n = signatures.shape[0]
+    nonempty = np.flatnonzero(signatures[:, 0] != EMPTY_SIGNATURE)
+    pairs = []
+    oversized = {}
+    for band in range(bands):
+        block = signatures[nonempty, band * rows:(band + 1) * rows].astype(np.uint64)
+        keys = np.zeros(len(nonempty), dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            for column in block.T:
+                keys = keys * np.uint64(0x100000001B3) ^ column
+
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        boundaries = np.flatnonzero(np.diff(sorted_keys)) + 1
+        starts = np.concatenate(([0], boundaries))
+        sizes = np.diff(np.concatenate((starts, [len(sorted_keys)])))
+        for start, size in zip(starts[(sizes > 1) & (sizes <= max_bucket_size)],
+                               sizes[(sizes > 1) & (sizes <= max_bucket_size)]):
+            members = nonempty[order[start:start + size]]
+            i, j = np.triu_indices(size, k=1)
+            pairs.append(np.stack((members[i], members[j]), axis=1))
+        for start, size in zip(starts[sizes > max_bucket_size], sizes[sizes > max_bucket_size]):
+            members = np.sort(nonempty[order[start:start + size]])
+            oversized.setdefault(members.tobytes(), members)
+
+    if not pairs:
+        return np.zeros((0, 2), dtype=np.int64), list(oversized.values())
+    pairs = np.sort(np.concatenate(pairs), axis=1)
+    keys = np.unique(pairs[:, 0] * n + pairs[:, 1])
+    return np.stack((keys // n, keys % n), axis=1), list(oversized.values())
+
+
+def _bucket_similar_pairs(matrix: sp.csr_matrix, members: np.ndarray, threshold: float) -> np.ndarray:
+    """
+    Pares (i < j) de um balde grande com Jaccard >= threshold, por produtos esparsos em blocos de linhas
+    (bloco x tamanho do balde interseções por vez), sem passar pela lista de todos os pares.
+    """
+    sub = matrix[members].astype(bool).astype(np.float32).tocsr()
+    sizes = np.diff(sub.indptr).astype(np.float64)
+    transposed = sub.T.tocsr()
+    block = max(1, CHUNK_HASHES // len(members))
+    pairs = []
+    for start in range(0, len(members), block):
+        stop = min(start + block, len(members))
+        intersection = (sub[start:stop] @ transposed).toarray()
+        union = sizes[start:stop, None] + sizes[None, :] - intersection
+        jaccard = np.divide(intersection, union, out=np.zeros_like(intersection), where=union != 0)
+        rows, columns = np.nonzero(jaccard >= threshold)
+        upper = columns > rows + start
+        pairs.append(np.stack((members[rows[upper] + start], members[columns[upper]]), axis=1))
+    return np.concatenate(pairs) if pairs else np.zeros((0, 2), dtype=np.int64)
+
+
+def similar_pairs(matrix: sp.csr_matrix, threshold: float, num_perm: int = 128, seed: int = 0) -> tuple:
+    """
+    Pares de usuários com Jaccard >= threshold, sem comparar todos contra todos. Os candidatos do LSH
+    são confirmados com o Jaccard exato; os baldes grandes demais para virar candidatos (ex.: muitas
+    bibliotecas idênticas) são verificados por inteiro, em blocos, então nenhum par deles se perde.
+    Como todo LSH, pares perto do limiar que não coincidem em nenhuma banda podem faltar.
+    Retorna (pares, jaccard), ordenados por par.
+    """
+    signatures = minhash_signatures(matrix, num_perm, seed)
+    bands, rows = choose_bands(num_perm, threshold)
+    candidates, oversized = lsh_candidate_pairs(signatures, bands, rows)
+    jaccard = edge_jaccard(matrix, candidates[:, 0], candidates[:, 1])
+    pairs = [candidates[jaccard >= threshold]]
+    pairs.extend(_bucket_similar_pairs(matrix, members, threshold) for members in oversized)
+    pairs = np.concatenate(pairs)
+
+    # Um par pode vir de um balde grande e também de um pequeno
+    n = matrix.shape[0]
+    keys = np.unique(pairs[:, 0].astype(np.int64) * n + pairs[:, 1])
+    pairs = np.stack((keys // n, keys % n), axis=1)
+    return pairs, edge_jaccard(matrix, pairs[:, 0], pairs[:, 1])
+
+
+def sample_non_edges(csr: CSRGraph, num_samples: int, seed: int = 0) -> np.ndarray:
+    """
+    Amostra uniforme (com reposição) de pares distintos (u, v) que não são arestas do grafo.
+    O tamanho da amostra é limitado ao número de não-pares; sem nenhum (n <= 1 ou grafo completo),
+    levanta ValueError.
+    """
+    rng = np.random.default_rng(seed)
+    keys = edge_keys(csr)
+    available = csr.n * (csr.n - 1) // 2 - len(keys) // 2
+    if available <= 0:
+        raise ValueError("O grafo não tem pares de nós não adjacentes para amostrar.")
+    num_samples = min(num_samples, available)
+    collected = []
+    remaining = num_samples
+    while remaining > 0:
+        u = rng.integers(0, csr.n, size=2 * remaining)
+        v = rng.integers(0, csr.n, size=2 * remaining)
+        ok = (u != v) & ~has_edges(keys, csr.n, u, v)
+        batch = np.stack((u[ok], v[ok]), axis=1)[:remaining]
+        collected.append(batch)
+        remaining -= len(batch)
+    return np.concatenate(collected)
+
+
+def non_edge_jaccard_distribution(matrix: sp.csr_matrix, csr: CSRGraph, num_samples: int = 100_000,
+                                  seed: int = 0) -> dict:
+    """
+    Estimativa da distribuição de Jaccard entre pares que NÃO são amigos.
+    A amostra é uniforme sobre os não-pares, então média e quantis são estimadores não viesados
+    da população; o erro padrão da média acompanha o resultado.
+    """
+    pairs = sample_non_edges(csr, num_samples, seed)
+    jaccard = edge_jaccard(matrix, pairs[:, 0], pairs[:, 1])
+    return {
+        "amostra": jaccard,
+        "media": float(jaccard.mean()),
+        "erro_padrao": float(jaccard.std(ddof=1) / np.sqrt(len(jaccard))) if len(jaccard) > 1 else 0.0,
+        "quantis": dict(zip((0.5, 0.9, 0.99), np.quantile(jaccard, [0.5, 0.9, 0.99]).tolist())),
+    }
+
+
+def friendship_rate_among_similar(csr: CSRGraph, pairs: np.ndarray) -> tuple:
+    """
+    Fração dos pares similares que são amigos, comparada à densidade do grafo
+    (a mesma fração esperada se amizade não dependesse das bibliotecas).
+    """
+    keys = edge_keys(csr)
+    rate = float(has_edges(keys, csr.n, pairs[:, 0], pairs[:, 1]).mean()) if len(pairs) else 0.0
+    density = len(keys) / (csr.n * (csr.n - 1)) if csr.n > 1 else 0.0
+    return rate, density
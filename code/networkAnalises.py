@@ -1,32 +1,85 @@
+import argparse
 import networkx as nx
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 
+from connectedComponents import giant_component
+from degreeDistribution import ccdf, degree_counts, fit_power_law, log_binned_histogram
+from graphCache import csr_to_graph, load_csr_cached
+from hyperANF import approximate_distances
+from kCore import k_core
+from triangleCounting import average_clustering
+
+parser = argparse.ArgumentParser(description="Análises estruturais da rede de amizades do grupo.")
+parser.add_argument("--giant-component", action="store_true",
+                    help="Restringe as análises ao maior componente conexo (descarta membros isolados).")
+parser.add_argument("--min-core", type=int, default=0,
+                    help="Restringe as análises ao k-core com k >= MIN_CORE (remove as caudas de grau baixo).")
+args = parser.parse_args()
 
 try:
-    G = nx.read_gml("networks/rede_steam_bannerlord_group.gml")
+    G_csr = load_csr_cached("networks/rede_steam_bannerlord_group.gml")
     print("Grafo carregado com sucesso.")
 except FileNotFoundError:
     print("Arquivo não encontrado.")
 
+# Recortes feitos direto no CSR
+if args.min_core > 0:
+    G_csr, _ = k_core(G_csr, args.min_core)
+    print(f"Análise restrita ao {args.min_core}-core: {G_csr.n} nós e {G_csr.indices.size // 2} arestas.")
 
-# --- Análises Originais ---
+if args.giant_component:
+    G_csr, _ = giant_component(G_csr)
+    print(f"Análise restrita ao maior componente conexo: {G_csr.n} nós.")
+
+# O nx.Graph só é montado para as centralidades e ego graphs do NetworkX
+G = csr_to_graph(G_csr)
 
-print(f"Número de vértices: {G.number_of_nodes()}")
-print(f"Número de arestas: {G.number_of_edges()}")
 
-# Distribuição de graus
-graus = [grau for _, grau in G.degree()]
-plt.hist(graus, bins=range(1, max(graus)+2), edgecolor='black')
-plt.title("Distribuição de graus dos usuários")
-plt.xlabel("Grau")
-plt.ylabel("Frequência")
+# --- Análises Originais ---
+
+print(f"Número de vértices: {G_csr.n}")
+print(f"Número de arestas: {G_csr.indices.size // 2}")
+
+# Distribuição de graus: bins logarítmicos e CCDF a partir de um único bincount
+contagem_graus = degree_counts(G_csr.degrees)
+bordas, densidade = log_binned_histogram(contagem_graus)
+graus_ccdf, prob_ccdf = ccdf(contagem_graus)
+ajuste = fit_power_law(contagem_graus)
+print(f"Cauda em lei de potência: alpha = {ajuste['alpha']:.2f} ± {ajuste['alpha_erro']:.2f} "
+      f"(xmin = {ajuste['xmin']}, {ajuste['n_cauda']} nós na cauda, KS = {ajuste['ks']:.3f})")
+
+fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+axes[0].bar(bordas[:-1], densidade, width=np.diff(bordas), align='edge', edgecolor='black')
+axes[0].set_xscale('log')
+axes[0].set_yscale('log')
+axes[0].set_title("Distribuição de graus dos usuários (bins logarítmicos)")
+axes[0].set_xlabel("Grau")
+axes[0].set_ylabel("Densidade")
+
+axes[1].loglog(graus_ccdf, prob_ccdf, marker='o', linestyle='none', markersize=3)
+graus_cauda = graus_ccdf[graus_ccdf >= ajuste['xmin']]
+if len(graus_cauda):
+    prob_xmin = prob_ccdf[graus_ccdf >= ajuste['xmin']][0]
+    axes[1].loglog(graus_cauda, prob_xmin * (graus_cauda / ajuste['xmin']) ** (1 - ajuste['alpha']),
+                   color='red', label=f"lei de potência (alpha = {ajuste['alpha']:.2f})")
+    axes[1].legend()
+axes[1].set_title("CCDF dos graus")
+axes[1].set_xlabel("Grau")
+axes[1].set_ylabel("P(K >= k)")
 plt.savefig("images/Freq_dist_group.png", dpi=300, bbox_inches='tight')
 plt.show()
 
-clustering = nx.average_clustering(G)
+clustering = average_clustering(G_csr)
 print(f"Coeficiente médio de clustering: {clustering:.4f}")
 
+# Distâncias aproximadas (HyperANF): poucas passadas sobre as arestas em vez de BFS entre todos os pares
+distancias = approximate_distances(G_csr, log2m=7, runs=3)
+print(f"Distância média aproximada: {distancias['distancia_media']:.2f}")
+print(f"Diâmetro efetivo (90% dos pares) aproximado: {distancias['diametro_efetivo']:.2f}")
+print(f"Diâmetro (limite inferior): {distancias['diametro_minimo']}")
+
 centralidade_grau = nx.degree_centrality(G)
 
 # Centralidade eigenvector
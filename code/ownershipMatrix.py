@@ -0,0 +1,154 @@
+from collections.abc import Mapping
+
+import numpy as np
+import scipy.sparse as sp
+
+
+def library_entries(libraries, appids=None) -> tuple:
+    """
+    Achata as bibliotecas em (linhas, colunas, horas jogadas, appids).
+    Cada biblioteca pode ser um conjunto de appids ou um dict appid -> playtime_forever;
+    bibliotecas ausentes (NaN, None) viram linhas vazias.
+    """
+    libraries = [lib if isinstance(lib, (Mapping, set, frozenset, list, tuple, np.ndarray)) else ()
+                 for lib in libraries]
+    sizes = np.fromiter((len(lib) for lib in libraries), dtype=np.int64, count=len(libraries))
+    total = int(sizes.sum())
+    flat = np.fromiter((appid for lib in libraries for appid in lib), dtype=np.int64, count=total)
+    playtime = np.fromiter(
+        (lib[appid] if isinstance(lib, Mapping) else 0.0 for lib in libraries for appid in lib),
+        dtype=np.float32, count=total,
+    )
+
+    if appids is None:
+        appids = np.unique(flat)
+    else:
+        appids = np.asarray(appids, dtype=np.int64)
+    columns = np.searchsorted(appids, flat)
+    known = columns < len(appids)
+    known[known] = appids[columns[known]] == flat[known]
+
+    rows = np.repeat(np.arange(len(libraries)), sizes)
+    return rows[known], columns[known], playtime[known], appids, len(libraries)
+
+
+def build_ownership_matrix(libraries, appids=None) -> tuple:
+    """
+    Monta a matriz de incidência usuário x jogo em CSR (linha i = biblioteca do i-ésimo usuário).
+    Retorna (matriz, appids), onde appids[j] é o appid da coluna j.
+    """
+    rows, columns, _, appids, n = library_entries(libraries, appids)
+    matrix = sp.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (rows, columns)),
+        shape=(n, len(appids)),
+    )
+    matrix.sum_duplicates()
+    matrix.data[:] = 1.0
+    return matrix, appids
+
+
+def build_playtime_matrix(libraries, appids) -> sp.csr_matrix:
+    """
+    Matriz usuário x jogo com o playtime_forever (minutos, float32) de cada jogo possuído,
+    nas mesmas colunas da matriz de posse. Jogos nunca jogados não pesam e ficam de fora.
+    """
+    rows, columns, playtime, appids, n = library_entries(libraries, appids)
+    matrix = sp.csr_matrix((playtime, (rows, columns)), shape=(n, len(appids)), dtype=np.float32)
+    matrix.eliminate_zeros()
+    return matrix
+
+
+def library_sizes(matrix: sp.csr_matrix) -> np.ndarray:
+    """Número de jogos de cada usuário (entradas não nulas por linha)."""
+    return np.diff(matrix.indptr)
+
+
+def owner_counts(matrix: sp.csr_matrix) -> np.ndarray:
+    """Número de donos de cada jogo (entradas não nulas por coluna)."""
+    return np.bincount(matrix.indices, minlength=matrix.shape[1])
+
+
+def binary_matrix(matrix: sp.csr_matrix) -> sp.csr_matrix:
+    """Cópia float32 da matriz com 1 em cada entrada (posse), para montar uma vez a partir de pesos."""
+    binary = matrix.tocsr(copy=True).astype(np.float32)
+    binary.data[:] = 1.0
+    return binary
+
+
+def row_intersections(matrix: sp.csr_matrix, u, v) -> np.ndarray:
+    """
+    Tamanho da interseção das linhas u[i] e v[i], via produto escalar esparso linha a linha.
+    A matriz precisa ser binária (build_ownership_matrix, read_ownership ou binary_matrix): ela não é
+    copiada a cada chamada.
+    """
+    return np.asarray(matrix[u].multiply(matrix[v]).sum(axis=1)).ravel()
+
+
+def edge_jaccard(matrix: sp.csr_matrix, u, v) -> np.ndarray:
+    """
+    Similaridade de Jaccard entre as bibliotecas de todos os pares (u[i], v[i]) numa chamada, sobre a
+    matriz de posse binária. A união vem dos tamanhos das bibliotecas: |A ∪ B| = |A| + |B| - |A ∩ B|.
+    """
+    u = np.asarray(u, dtype=np.int64)
+    v = np.asarray(v, dtype=np.int64)
+    if len(u) == 0:
+        return np.zeros(0)
+    intersection = row_intersections(matrix, u, v)
+    sizes = library_sizes(matrix)
+    union = sizes[u] + sizes[v] - intersection
+    return np.divide(intersection, union, out=np.zeros(len(u)), where=union != 0)
+
+
+def log_scale(weights: sp.csr_matrix) -> sp.csr_matrix:
+    """Aplica log(1 + x) aos pesos, para que poucas milhares de horas não dominem tudo."""
+    scaled = weights.tocsr(copy=True).astype(np.float32)
+    scaled.data = np.log1p(scaled.data)
+    return scaled
+
+
+def tfidf_weighting(weights: sp.csr_matrix) -> sp.csr_matrix:
+    """
+    Pondera cada coluna pelo idf = log(n_usuarios / (1 + donos)): jogos que quase todos têm
+    (bundles, free-to-play) pesam pouco, jogos de nicho pesam mais.
+    """
+    weights = weights.tocsr()
+    n = weights.shape[0]
+    owners = owner_counts(weights)
+    idf = np.log(n / (1.0 + owners)).clip(min=0).astype(np.float32)
+    return (weights @ sp.diags(idf)).tocsr()
+
+
+def normalize_rows(weights: sp.csr_matrix) -> sp.csr_matrix:
+    """Normaliza as linhas para norma L2 unitária (linhas vazias continuam vazias)."""
+    norms = np.sqrt(np.asarray(weights.multiply(weights).sum(axis=1)).ravel())
+    inverse = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+    return (sp.diags(inverse.astype(np.float32)) @ weights).tocsr()
+
+
+def edge_weighted_jaccard(weights: sp.csr_matrix, u, v) -> np.ndarray:
+    """
+    Jaccard ponderado sum(min(a, b)) / sum(max(a, b)) para todos os pares (u[i], v[i]).
+    Usa min = (a + b - |a - b|) / 2 e max = (a + b + |a - b|) / 2, então só precisa da
+    soma de cada linha e de uma diferença esparsa entre as linhas dos pares.
+    """
+    u = np.asarray(u, dtype=np.int64)
+    v = np.asarray(v, dtype=np.int64)
+    if len(u) == 0:
+        return np.zeros(0)
+    weights = weights.tocsr()
+    totals = np.asarray(weights.sum(axis=1), dtype=np.float64).ravel()
+    abs_diff = np.asarray(abs(weights[u] - weights[v]).sum(axis=1), dtype=np.float64).ravel()
+    pair_total = totals[u] + totals[v]
+    minimum = (pair_total - abs_diff) / 2
+    maximum = (pair_total + abs_diff) / 2
+    return np.divide(minimum, maximum, out=np.zeros(len(u)), where=maximum > 0)
+
+
+def edge_cosine(weights: sp.csr_matrix, u, v) -> np.ndarray:
+    """Cosseno entre as linhas de todos os pares (u[i], v[i])."""
+    u = np.asarray(u, dtype=np.int64)
+    v = np.asarray(v, dtype=np.int64)
+    if len(u) == 0:
+        return np.zeros(0)
+    normalized = normalize_rows(weights)
+    return np.asarray(normalized[u].multiply(normalized[v]).sum(axis=1), dtype=np.float64).ravel()
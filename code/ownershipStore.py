@@ -0,0 +1,114 @@
+import argparse
+import ast
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import scipy.sparse as sp
+
+from ownershipMatrix import library_entries
+
+# Formato longo: uma linha por (usuário, jogo), com tipos fixos
+OWNERSHIP_SCHEMA = pa.schema([
+    ("steamid", pa.uint64()),
+    ("appid", pa.uint32()),
+    ("playtime_forever", pa.uint32()),
+])
+ROW_GROUP_SIZE = 1_000_000
+# Appids abaixo deste limite são codificados por tabela densa em vez de ordenação
+DENSE_LOOKUP_LIMIT = 1 << 26
+
+
+def ownership_table(steamids, libraries) -> pa.Table:
+    """
+    Tabela (steamid, appid, playtime_forever) a partir das bibliotecas de cada usuário
+    (conjuntos de appids ou dicts appid -> playtime_forever), na ordem dos steamids.
+    """
+    rows, columns, playtime, appids, _ = library_entries(libraries)
+    steamids = np.asarray(steamids, dtype=np.uint64)
+    order = np.lexsort((columns, rows))
+    return pa.table({
+        "steamid": steamids[rows[order]],
+        "appid": appids[columns[order]].astype(np.uint32),
+        "playtime_forever": playtime[order].astype(np.uint32),
+    }, schema=OWNERSHIP_SCHEMA)
+
+
+def write_ownership(path, steamids, libraries):
+    pq.write_table(ownership_table(steamids, libraries), path, row_group_size=ROW_GROUP_SIZE, compression="zstd")
+
+
+def _dense_codes(values: np.ndarray) -> tuple:
+    """Valores distintos ordenados e o código de cada valor, por tabela densa quando o intervalo é pequeno."""
+    if len(values) and values.max() < DENSE_LOOKUP_LIMIT:
+        present = np.zeros(int(values.max()) + 1, dtype=bool)
+        present[values] = True
+        unique = np.flatnonzero(present)
+        lookup = np.cumsum(present) - 1
+        return unique, lookup[values]
+    return np.unique(values, return_inverse=True)
+
+
+def read_ownership(path, steamids=None) -> tuple:
+    """
+    Carrega o arquivo de posse direto como matrizes esparsas usuário x jogo, sem passar por objetos Python.
+    Com steamids, as linhas seguem essa ordem (usuários sem jogos viram linhas vazias) e só esses
+    usuários são lidos do arquivo; sem, as linhas são os usuários na ordem em que aparecem no arquivo.
+    Retorna (matriz de posse binária, matriz de playtime, steamids, appids), como build_ownership_matrix.
+    """
+    filters = None
+    if steamids is not None:
+        steamids = np.asarray(steamids, dtype=np.uint64)
+        filters = [("steamid", "in", pa.array(np.unique(steamids)))]
+    table = pq.read_table(path, filters=filters)
+    users = table.column("steamid").to_numpy()
+    games = table.column("appid").to_numpy()
+    playtime = table.column("playtime_forever").to_numpy().astype(np.float32)
+
+    # write_ownership grava as linhas de cada usuário contíguas: basta mapear o início de cada trecho
+    run_starts = np.flatnonzero(np.concatenate(([True], users[1:] != users[:-1]))) if len(users) else np.zeros(0, int)
+    run_users = users[run_starts]
+    run_lengths = np.diff(np.append(run_starts, len(users)))
+    if steamids is None:
+        steamids, run_rows = np.unique(run_users, return_inverse=True)
+        if len(steamids) == len(run_users):
+            steamids, run_rows = run_users, np.arange(len(run_users))
+    else:
+        by_id = np.argsort(steamids, kind="stable")
+        run_rows = by_id[np.searchsorted(steamids[by_id], run_users)]
+    rows = np.repeat(run_rows, run_lengths)
+    appids, columns = _dense_codes(games)
+    appids = appids.astype(np.int64)
+    shape = (len(steamids), len(appids))
+
+    ownership = sp.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, columns)), shape=shape)
+    ownership.sum_duplicates()
+    ownership.data[:] = 1.0
+    playtime_matrix = sp.csr_matrix((playtime, (rows, columns)), shape=shape, dtype=np.float32)
+    playtime_matrix.eliminate_zeros()
+    return ownership, playtime_matrix, steamids, appids
+
+
+def convert_legacy_csv(csv_path, parquet_path, users_csv_path=None):
+    """
+    Converte o steam_users_dataset.csv antigo (coluna set_jogos como texto "{10, 20, ...}")
+    para o arquivo de posse em formato longo. O CSV antigo não tem horas jogadas, que ficam 0.
+    Com users_csv_path, grava também o CSV de usuários sem a coluna set_jogos.
+    """
+    df = pd.read_csv(csv_path, dtype={"steamid": np.uint64})
+    libraries = [ast.literal_eval(texto) if isinstance(texto, str) and texto != "set()" else set()
+                 for texto in df["set_jogos"]]
+    write_ownership(parquet_path, df["steamid"], libraries)
+    if users_csv_path is not None:
+        df.drop(columns=["set_jogos"]).to_csv(users_csv_path, index=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Converte o CSV de usuários antigo para o arquivo de posse em Parquet.")
+    parser.add_argument("csv", help="CSV antigo com a coluna set_jogos")
+    parser.add_argument("parquet", help="Arquivo Parquet de saída (steamid, appid, playtime_forever)")
+    parser.add_argument("--users-csv", help="CSV de usuários reescrito sem a coluna set_jogos")
+    args = parser.parse_args()
+    convert_legacy_csv(args.csv, args.parquet, args.users_csv)
+    print(f"Posse de jogos salva em '{args.parquet}'")
@@ -0,0 +1,127 @@
+import argparse
+import os
+import uuid
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+REVIEWS_DIR = "datasets/reviews"
+
+# Colunas gravadas nos arquivos; app_id e mes ficam só nos nomes dos diretórios (partições hive)
+REVIEW_SCHEMA = pa.schema([
+    ("steamid", pa.int64()),
+    ("texto_review", pa.string()),
+    ("foi_recomendado", pa.bool_()),
+    ("votos_uteis", pa.int32()),
+    ("data_postagem", pa.timestamp("s", tz="UTC")),
+])
+PARTITIONING = ds.partitioning(pa.schema([("app_id", pa.int32()), ("mes", pa.string())]), flavor="hive")
+# Linhas por row group: um filtro que descarta um row group inteiro não lê nem descomprime seus textos
+ROW_GROUP_SIZE = 64_000
+
+
+def reviews_table(app_id: int, reviews) -> pa.Table:
+    """Tabela tipada a partir de reviews no formato coletado em getReviews (lista de dicts ou DataFrame)."""
+    df = pd.DataFrame(reviews, columns=["steamid", "texto_review", "foi_recomendado", "votos_uteis", "data_postagem"])
+    posted = pd.to_datetime(df["data_postagem"].astype(np.int64), unit="s", utc=True)
+    table = pa.Table.from_pandas(pd.DataFrame({
+        "steamid": df["steamid"].astype(np.int64),
+        "texto_review": df["texto_review"].astype(object).where(df["texto_review"].notna(), None),
+        "foi_recomendado": df["foi_recomendado"].astype(bool),
+        "votos_uteis": df["votos_uteis"].astype(np.int32),
+        "data_postagem": posted,
+    }), schema=REVIEW_SCHEMA, preserve_index=False)
+    return table.append_column("app_id", pa.array(np.full(len(df), app_id, dtype=np.int32))) \
+                .append_column("mes", pa.array(posted.dt.strftime("%Y-%m").to_numpy(), type=pa.string()))
+
+
+def write_reviews(app_id: int, reviews, root=REVIEWS_DIR):
+    """
+    Grava reviews do app no repositório particionado app_id=/mes=/. As reviews já gravadas do app são
+    lidas e unidas às novas, uma por (app_id, steamid), com a nova prevalecendo; as partições do app
+    são então reescritas. Rodar a coleta de novo atualiza o repositório em vez de duplicá-lo.
+    """
+    table = reviews_table(app_id, reviews)
+    if table.num_rows == 0:
+        return
+    if os.path.isdir(root):
+        existing = review_dataset(root).to_table(filter=pc.field("app_id") == app_id)
+        table = pa.concat_tables([existing.select(table.column_names).cast(table.schema), table])
+    # Última ocorrência de cada steamid (as novas vêm depois das já gravadas)
+    steamids = table.column("steamid").to_numpy()[::-1]
+    _, last = np.unique(steamids, return_index=True)
+    table = table.take(np.sort(len(steamids) - 1 - last))
+    # Ordenar por mês deixa cada partição num único arquivo
+    table = table.sort_by([("mes", "ascending"), ("data_postagem", "ascending")])
+    ds.write_dataset(
+        table, root, format="parquet", partitioning=PARTITIONING,
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        # Apaga só os diretórios app_id=/mes=/ reescritos; como a tabela traz tudo do app, nada se perde
+        existing_data_behavior="delete_matching",
+        file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+        max_rows_per_group=ROW_GROUP_SIZE, min_rows_per_group=min(ROW_GROUP_SIZE, table.num_rows),
+    )
+
+
+def review_dataset(root=REVIEWS_DIR) -> ds.Dataset:
+    return ds.dataset(root, format="parquet", partitioning=PARTITIONING)
+
+
+def review_filter(app_id: int = None, months=None, recommended: bool = None, start=None, end=None):
+    """
+    Monta a expressão de filtro. app_id e months (lista de "AAAA-MM") podam diretórios inteiros;
+    recommended e o intervalo [start, end) de data_postagem usam as estatísticas dos row groups.
+    """
+    conditions = []
+    if app_id is not None:
+        conditions.append(pc.field("app_id") == app_id)
+    if months is not None:
+        conditions.append(pc.field("mes").isin(list(months)))
+    if recommended is not None:
+        conditions.append(pc.field("foi_recomendado") == recommended)
+    if start is not None:
+        conditions.append(pc.field("data_postagem") >= pd.Timestamp(start, tz="UTC"))
+    if end is not None:
+        conditions.append(pc.field("data_postagem") < pd.Timestamp(end, tz="UTC"))
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def read_reviews(columns=None, root=REVIEWS_DIR, **filters) -> pd.DataFrame:
+    """
+    Lê só as colunas pedidas das partições e row groups que passam pelos filtros (ver review_filter).
+    Ex.: read_reviews(["texto_review"], app_id=261550, months=["2024-03"], recommended=True).
+    """
+    table = review_dataset(root).to_table(columns=columns, filter=review_filter(**filters))
+    return table.to_pandas()
+
+
+def iter_reviews(columns=None, batch_size: int = 50_000, root=REVIEWS_DIR, **filters):
+    """
+    Percorre as reviews em DataFrames de até batch_size linhas, com a mesma seleção de colunas e
+    filtros de read_reviews; a memória depende do tamanho do lote, não do tamanho do corpus.
+    """
+    scanner = review_dataset(root).scanner(columns=columns, filter=review_filter(**filters), batch_size=batch_size)
+    for batch in scanner.to_batches():
+        if batch.num_rows:
+            yield batch.to_pandas()
+
+
+def convert_reviews_csv(csv_path, app_id: int, root=REVIEWS_DIR):
+    """Importa o steam_reviews_bannerlord.csv antigo para o repositório particionado."""
+    write_reviews(app_id, pd.read_csv(csv_path), root)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Importa um CSV de reviews para o repositório Parquet particionado.")
+    parser.add_argument("csv", help="CSV no formato de getReviews.py")
+    parser.add_argument("--app-id", type=int, default=261550, help="App das reviews (padrão: Bannerlord)")
+    parser.add_argument("--root", default=REVIEWS_DIR, help="Diretório raiz do repositório de reviews")
+    args = parser.parse_args()
+    convert_reviews_csv(args.csv, args.app_id, args.root)
+    print(f"Reviews importadas para '{args.root}'")
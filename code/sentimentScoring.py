@@ -0,0 +1,65 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from textArena import TextArena
+
+# Reviews por tarefa enviada a um worker (cada tarefa é só (início, fim), não os textos)
+TASK_SIZE = 2_000
+
+# Estado de cada processo worker, preenchido uma vez pelo initializer
+_worker_state = {}
+
+
+def _init_worker(prefix):
+    _worker_state.update(prefix=prefix, analyzer=SentimentIntensityAnalyzer(), arena=None)
+
+
+def _score_range(start: int, stop: int) -> tuple:
+    """Score 'compound' do VADER dos textos start..stop-1, lidos da arena mapeada em memória."""
+    arena = _worker_state["arena"]
+    # A arena cresce a cada lote gravado; reabrir só quando o intervalo passa do que já está mapeado
+    if arena is None or stop > len(arena):
+        arena = _worker_state["arena"] = TextArena(_worker_state["prefix"])
+    analyzer = _worker_state["analyzer"]
+    scores = np.array([analyzer.polarity_scores(texto)["compound"] for texto in arena.texts(start, stop)])
+    return start, scores
+
+
+class VaderScorer:
+    """
+    Pool de processos que pontua intervalos de uma arena de textos (ver textArena) com o VADER.
+    Cada worker abre a arena por conta própria; só os índices e os scores trafegam entre processos.
+    """
+
+    def __init__(self, prefix, workers: int = None):
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = None
+        if self.workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                 initargs=(prefix,))
+        else:
+            _init_worker(prefix)
+
+    def scores(self, start: int, stop: int) -> np.ndarray:
+        result = np.zeros(stop - start)
+        tasks = [(a, min(a + TASK_SIZE, stop)) for a in range(start, stop, TASK_SIZE)]
+        if self._executor is None:
+            results = (_score_range(a, b) for a, b in tasks)
+        else:
+            results = self._executor.map(_score_range, *zip(*tasks)) if tasks else ()
+        for a, scores in results:
+            result[a - start:a - start + len(scores)] = scores
+        return result
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def __enter__(self) -> "VaderScorer":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
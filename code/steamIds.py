@@ -0,0 +1,55 @@
+import numpy as np
+
+# SteamID64 é um inteiro sem sinal de 64 bits; como texto são 17 dígitos
+STEAMID_DTYPE = np.uint64
+
+
+def parse_steamids(values) -> np.ndarray:
+    """Converte SteamIDs (texto ou inteiros, em qualquer iterável) para um array uint64."""
+    values = values if isinstance(values, np.ndarray) else np.asarray(list(values))
+    if len(values) == 0:
+        return np.zeros(0, dtype=STEAMID_DTYPE)
+    return values.astype(STEAMID_DTYPE, copy=False)
+
+
+def format_steamids(ids) -> list:
+    """SteamIDs de volta para texto; só deve ser usado na saída (GML, CSV, prints)."""
+    return [str(steamid) for steamid in np.asarray(ids, dtype=STEAMID_DTYPE).tolist()]
+
+
+class SteamIdIndex:
+    """
+    Mapeia SteamIDs uint64 para índices densos int32 (0..n-1, na ordem de primeira aparição),
+    para que grafos e tabelas usem arrays indexados por inteiro. As buscas são vetorizadas
+    (busca binária sobre uma cópia ordenada), sem dicionários de strings.
+    """
+
+    def __init__(self, steamids):
+        steamids = parse_steamids(steamids)
+        _, first = np.unique(steamids, return_index=True)
+        self.ids = steamids[np.sort(first)]
+        self._order = np.argsort(self.ids, kind="stable")
+        self._sorted = self.ids[self._order]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def lookup(self, steamids) -> np.ndarray:
+        """Índice denso de cada SteamID; -1 para os que não estão no índice."""
+        steamids = parse_steamids(steamids)
+        result = np.full(len(steamids), -1, dtype=np.int32)
+        if len(self.ids) == 0:
+            return result
+        pos = np.minimum(np.searchsorted(self._sorted, steamids), len(self._sorted) - 1)
+        found = self._sorted[pos] == steamids
+        result[found] = self._order[pos[found]]
+        return result
+
+    def contains(self, steamids) -> np.ndarray:
+        return self.lookup(steamids) >= 0
+
+    def steamid(self, index: int) -> int:
+        return int(self.ids[index])
+
+    def to_strings(self, indices=None) -> list:
+        return format_steamids(self.ids if indices is None else self.ids[np.asarray(indices)])
@@ -0,0 +1,158 @@
+import os
+import sqlite3
+
+import pandas as pd
+
+DB_PATH = "datasets/steam.db"
+# Linhas por executemany nas inserções em lote
+BATCH_SIZE = 50_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    steamid INTEGER PRIMARY KEY,
+    grau INTEGER,
+    centralidade_grau REAL,
+    coef_cluster REAL,
+    numero_core INTEGER,
+    total_jogos INTEGER,
+    membro_grupo INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS friendships (
+    steamid_a INTEGER NOT NULL,
+    steamid_b INTEGER NOT NULL,
+    PRIMARY KEY (steamid_a, steamid_b)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_friendships_b ON friendships (steamid_b);
+CREATE TABLE IF NOT EXISTS apps (
+    appid INTEGER PRIMARY KEY,
+    name TEXT
+);
+CREATE TABLE IF NOT EXISTS ownership (
+    steamid INTEGER NOT NULL,
+    appid INTEGER NOT NULL,
+    playtime_forever INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (steamid, appid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_ownership_appid ON ownership (appid);
+CREATE TABLE IF NOT EXISTS reviews (
+    app_id INTEGER NOT NULL,
+    steamid INTEGER NOT NULL,
+    texto_review TEXT,
+    foi_recomendado INTEGER,
+    votos_uteis INTEGER,
+    data_postagem INTEGER,
+    vader_score REAL,
+    PRIMARY KEY (app_id, steamid)
+);
+CREATE INDEX IF NOT EXISTS idx_reviews_steamid ON reviews (steamid);
+"""
+
+
+def _batches(rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class SteamStore:
+    """
+    Banco SQLite local com usuários, amizades, posse de jogos, reviews e apps, indexados para joins.
+    SteamIDs são guardados como INTEGER (cabem em int64). Cada inserção em lote roda numa transação.
+    """
+
+    def __init__(self, path=DB_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self) -> "SteamStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _insert_many(self, sql: str, rows):
+        with self.connection:
+            for batch in _batches(rows):
+                self.connection.executemany(sql, batch)
+
+    # --- Inserções em lote (coletores) ---
+
+    def insert_users(self, steamids, group_member: bool = False):
+        """
+        Registra usuários (só o steamid); métricas já gravadas não são apagadas. group_member marca os
+        membros do grupo analisado; usuários vindos da BFS ou de outras coletas ficam desmarcados, e uma
+        marcação já feita nunca é desfeita.
+        """
+        self._insert_many(
+            "INSERT INTO users (steamid, membro_grupo) VALUES (?, ?) "
+            "ON CONFLICT (steamid) DO UPDATE SET membro_grupo = MAX(membro_grupo, excluded.membro_grupo)",
+            ((int(s), int(group_member)) for s in steamids),
+        )
+
+    def upsert_user_metrics(self, df_users: pd.DataFrame):
+        """Grava as métricas de rede por usuário (DataFrame indexado por steamid, colunas como em users)."""
+        columns = ["grau", "centralidade_grau", "coef_cluster", "numero_core", "total_jogos"]
+        values = df_users[columns].astype(object)
+        values = values.where(values.notna(), None)
+        rows = ((int(steamid), *row) for steamid, row in zip(df_users.index, values.itertuples(index=False)))
+        self._insert_many(
+            f"INSERT INTO users (steamid, {', '.join(columns)}) VALUES (?, ?, ?, ?, ?, ?) "
+            f"ON CONFLICT (steamid) DO UPDATE SET "
+            + ", ".join(f"{column} = excluded.{column}" for column in columns),
+            rows,
+        )
+
+    def insert_friendships(self, pairs):
+        """Amizades como pares não ordenados; cada par é gravado uma vez como (menor, maior)."""
+        canonical = ((min(int(u), int(v)), max(int(u), int(v))) for u, v in pairs if int(u) != int(v))
+        self._insert_many("INSERT OR IGNORE INTO friendships VALUES (?, ?)", canonical)
+
+    def insert_apps(self, names: dict):
+        self._insert_many("INSERT OR REPLACE INTO apps VALUES (?, ?)", ((int(a), n) for a, n in names.items()))
+
+    def insert_ownership(self, steamid, games):
+        """Jogos de um usuário no formato da API GetOwnedGames (dicts com appid e playtime_forever)."""
+        rows = ((int(steamid), int(game["appid"]), int(game.get("playtime_forever", 0))) for game in games)
+        self._insert_many("INSERT OR REPLACE INTO ownership VALUES (?, ?, ?)", rows)
+
+    def insert_reviews(self, app_id: int, reviews):
+        """Reviews no formato coletado em getReviews (steamid, texto_review, foi_recomendado, votos_uteis, data_postagem)."""
+        rows = ((int(app_id), int(r["steamid"]), r["texto_review"], int(bool(r["foi_recomendado"])),
+                 int(r["votos_uteis"]), int(r["data_postagem"])) for r in reviews)
+        self._insert_many(
+            "INSERT INTO reviews (app_id, steamid, texto_review, foi_recomendado, votos_uteis, data_postagem) "
+            "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (app_id, steamid) DO UPDATE SET "
+            "texto_review = excluded.texto_review, foi_recomendado = excluded.foi_recomendado, "
+            "votos_uteis = excluded.votos_uteis, data_postagem = excluded.data_postagem",
+            rows,
+        )
+
+    def update_sentiment(self, app_id: int, steamids, scores):
+        rows = ((float(score), int(app_id), int(steamid)) for steamid, score in zip(steamids, scores))
+        self._insert_many("UPDATE reviews SET vader_score = ? WHERE app_id = ? AND steamid = ?", rows)
+
+    # --- Consultas (scripts de análise) ---
+
+    def group_reviewer_sentiment(self, app_id: int) -> pd.DataFrame:
+        """
+        Sentimento das reviews de um app separado entre autores que são membros do grupo (membro_grupo)
+        e os demais, por join indexado reviews x users (sem carregar as reviews na memória).
+        """
+        return pd.read_sql_query(
+            "SELECT (u.steamid IS NOT NULL) AS no_grupo, COUNT(*) AS reviews, "
+            "AVG(r.foi_recomendado) AS taxa_recomendacao, AVG(r.vader_score) AS vader_medio "
+            "FROM reviews r LEFT JOIN users u ON u.steamid = r.steamid AND u.membro_grupo = 1 "
+            "WHERE r.app_id = ? GROUP BY no_grupo ORDER BY no_grupo",
+            self.connection, params=(int(app_id),),
+        )
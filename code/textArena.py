@@ -0,0 +1,78 @@
+import numpy as np
+
+# Arquivos da arena: <prefixo>.utf8 (textos concatenados) e <prefixo>.offsets (int64, n + 1 posições)
+BLOB_SUFFIX = ".utf8"
+OFFSETS_SUFFIX = ".offsets"
+
+
+class TextArenaWriter:
+    """
+    Grava textos numa arena só de acréscimo: os bytes UTF-8 vão para um único arquivo e o início
+    de cada texto para um array de offsets int64. Cada append fica legível assim que retorna.
+    """
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self._blob = open(prefix + BLOB_SUFFIX, "wb")
+        self._offsets = open(prefix + OFFSETS_SUFFIX, "wb")
+        self._position = 0
+        self._count = 0
+        np.zeros(1, dtype="<i8").tofile(self._offsets)
+        self._offsets.flush()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, texts) -> tuple:
+        """Acrescenta os textos (None vira texto vazio) e retorna o intervalo de índices (início, fim) ocupado."""
+        encoded = [(texto or "").encode("utf-8") for texto in texts]
+        ends = self._position + np.cumsum([len(data) for data in encoded], dtype=np.int64)
+        self._blob.write(b"".join(encoded))
+        self._blob.flush()
+        ends.astype("<i8").tofile(self._offsets)
+        self._offsets.flush()
+        start = self._count
+        self._count += len(encoded)
+        if len(encoded):
+            self._position = int(ends[-1])
+        return start, self._count
+
+    def close(self):
+        self._blob.close()
+        self._offsets.close()
+
+    def __enter__(self) -> "TextArenaWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TextArena:
+    """
+    Leitura da arena por índice via memory map: processos diferentes abrem os mesmos arquivos e
+    compartilham as páginas do sistema operacional, sem serializar nem copiar o corpus.
+    """
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.offsets = np.memmap(prefix + OFFSETS_SUFFIX, dtype="<i8", mode="r")
+        size = int(self.offsets[-1])
+        # np.memmap não aceita arquivo vazio
+        self.blob = np.memmap(prefix + BLOB_SUFFIX, dtype=np.uint8, mode="r", shape=(size,)) if size else \
+            np.zeros(0, dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        if i < 0:
+            i += len(self)
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes().decode("utf-8")
+
+    def texts(self, start: int, stop: int) -> list:
+        """Textos start..stop-1, decodificados a partir de uma única fatia contígua do blob."""
+        stop = min(stop, len(self))
+        offsets = self.offsets[start:stop + 1] - self.offsets[start]
+        data = self.blob[self.offsets[start]:self.offsets[stop]].tobytes()
+        return [data[a:b].decode("utf-8") for a, b in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
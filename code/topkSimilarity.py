@@ -0,0 +1,103 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy.sparse as sp
+
+from ownershipMatrix import binary_matrix, log_scale, normalize_rows, tfidf_weighting
+
+METRICS = ("jaccard", "cosine", "playtime_cosine", "tfidf_cosine")
+WEIGHTED_METRICS = ("playtime_cosine", "tfidf_cosine")
+# Linhas por bloco: o pico de memória é ~ BLOCK_SIZE x n_usuarios floats por worker
+BLOCK_SIZE = 256
+
+# Estado de cada processo worker, preenchido uma vez pelo initializer (evita reenviar as matrizes por bloco)
+_worker_state = {}
+
+
+def _init_worker(metric, matrix, transposed, sizes, k):
+    _worker_state.update(metric=metric, matrix=matrix, transposed=transposed, sizes=sizes, k=k)
+
+
+def _block_scores(start: int, stop: int) -> np.ndarray:
+    state = _worker_state
+    products = (state["matrix"][start:stop] @ state["transposed"]).toarray()
+    if state["metric"] in WEIGHTED_METRICS:
+        return products
+    sizes = state["sizes"]
+    size_rows = sizes[start:stop, None]
+    if state["metric"] == "jaccard":
+        denominator = size_rows + sizes[None, :] - products
+    else:
+        denominator = np.sqrt(size_rows * sizes[None, :])
+    return np.divide(products, denominator, out=np.zeros_like(products), where=denominator > 0)
+
+
+def _top_k_block(start: int, stop: int) -> tuple:
+    """Top-k de um bloco de linhas; só a matriz densa do bloco existe na memória."""
+    scores = _block_scores(start, stop)
+    rows = np.arange(stop - start)
+    scores[rows, rows + start] = -np.inf  # o próprio usuário não conta
+    k = min(_worker_state["k"], scores.shape[1])
+    if k == 0:
+        return start, np.zeros((stop - start, 0), dtype=np.int64), np.zeros((stop - start, 0))
+
+    candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind="stable")
+    neighbors = np.take_along_axis(candidates, order, axis=1)
+    best = np.take_along_axis(candidate_scores, order, axis=1)
+
+    empty = ~(best > 0)
+    neighbors[empty] = -1
+    best[empty] = 0.0
+    return start, neighbors, best
+
+
+def top_k_similar(matrix: sp.csr_matrix, k: int = 10, metric: str = "jaccard", weights: sp.csr_matrix = None,
+                  block_size: int = BLOCK_SIZE, workers: int = None) -> tuple:
+    """
+    Para cada usuário, os k usuários com bibliotecas mais parecidas (exato, sem matriz N x N).
+    Blocos de linhas da matriz de posse são multiplicados pela matriz inteira em processos paralelos.
+    metric: "jaccard" e "cosine" sobre a posse binária; "playtime_cosine" sobre log(1 + horas) de weights
+    e "tfidf_cosine" sobre log(1 + horas) ponderado pelo idf de cada jogo.
+    Retorna (vizinhos, similaridades), ambos n x k; posições sem vizinho com similaridade > 0 ficam com -1.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Métrica desconhecida: {metric}. Use uma de {METRICS}.")
+    if metric in WEIGHTED_METRICS:
+        if weights is None:
+            raise ValueError(f"A métrica '{metric}' precisa da matriz de horas jogadas (weights).")
+        scaled = log_scale(weights)
+        if metric == "tfidf_cosine":
+            scaled = tfidf_weighting(scaled)
+        base = normalize_rows(scaled).astype(np.float32)
+        sizes = None
+    else:
+        base = binary_matrix(matrix)
+        sizes = np.diff(base.indptr).astype(np.float32)
+    # CSR: o produto csr @ csr de cada bloco usa a matriz direto, sem reconvertê-la a cada bloco
+    transposed = base.T.tocsr()
+    initargs = (metric, base, transposed, sizes, k)
+
+    n = base.shape[0]
+    k_out = min(k, n)
+    neighbors = np.full((n, k_out), -1, dtype=np.int64)
+    scores = np.zeros((n, k_out))
+    blocks = [(start, min(start + block_size, n)) for start in range(0, n, block_size)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(blocks) <= 1:
+        _init_worker(*initargs)
+        results = (_top_k_block(start, stop) for start, stop in blocks)
+        for start, block_neighbors, block_scores in results:
+            neighbors[start:start + len(block_neighbors)] = block_neighbors
+            scores[start:start + len(block_scores)] = block_scores
+        return neighbors, scores
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as executor:
+        starts, stops = zip(*blocks)
+        for start, block_neighbors, block_scores in executor.map(_top_k_block, starts, stops):
+            neighbors[start:start + len(block_neighbors)] = block_neighbors
+            scores[start:start + len(block_scores)] = block_scores
+    return neighbors, scores
@@ -3,6 +3,8 @@ import requests
 import time
 from collections import deque
 
+from steamStore import SteamStore
+
 # Retorna a chave da variável de ambiente
 API_KEY = os.getenv("STEAM_API_KEY")
 if not API_KEY:
@@ -18,14 +20,15 @@ def get_friends(steam_id):
     try:
         res = requests.get(url, params=params)
         data = res.json()
-        return [f["steamid"] for f in data.get("friendslist", {}).get("friends", [])]
+        # SteamIDs como inteiros desde a ingestão: conjuntos e filas de int são menores e mais rápidos que de str
+        return [int(f["steamid"]) for f in data.get("friendslist", {}).get("friends", [])]
     except Exception as e:
         print(f"Erro ao buscar amigos de {steam_id}: {e}")
         return []
 
 def collect_steam_ids(start_steamid, max_ids):
     visited = set()
-    queue = deque([start_steamid])
+    queue = deque([int(start_steamid)])
 
     while queue and len(visited) < max_ids:
         current = queue.popleft()
@@ -52,4 +55,7 @@ with open("steam_ids.txt", "w") as f:
     for sid in steam_ids:
         f.write(f"{sid}\n")
 
+with SteamStore() as store:
+    store.insert_users(steam_ids)
+
 print(f"\n✅ Coletados {len(steam_ids)} SteamIDs válidos.")
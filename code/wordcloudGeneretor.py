@@ -1,11 +1,29 @@
 from wordcloud import WordCloud
+from wordcloud.tokenization import process_tokens, score
+from collections import Counter
+import argparse
 import matplotlib.pyplot as plt
-import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import nltk
 import spacy
 import os
+import re
 import string
 
+from reviewStore import iter_reviews, read_reviews
+
+APP_ID = 261550  # Bannerlord
+TAMANHO_LOTE = 20_000  # Reviews por lote no modo streaming
+ARQUIVO_PROCESSADAS = "datasets/reviews_processadas.parquet"
+
+parser = argparse.ArgumentParser(description="Nuvens de palavras das reviews (geral, positivas e negativas).")
+parser.add_argument("--streaming", action="store_true",
+                    help="Processa as reviews em lotes, acumulando só as frequências dos termos.")
+parser.add_argument("--chunk-size", type=int, default=TAMANHO_LOTE,
+                    help="Reviews por lote no modo streaming.")
+args = parser.parse_args()
+
 try:
     nlp_en = spacy.load("en_core_web_sm")
     stopwords_en = nltk.corpus.stopwords.words('english')
@@ -26,14 +44,67 @@ def preprocessar_texto_en(texto):
     tokens_lemmatizados = [token.lemma_ for token in doc]
     return ' '.join(tokens_lemmatizados)
 
-df_reviews = pd.read_csv("datasets/steam_reviews_bannerlord.csv")
+# Só o texto e o rótulo são usados aqui; as demais colunas nem são lidas do disco
+colunas = ['texto_review', 'foi_recomendado']
+if args.streaming:
+    lotes = iter_reviews(colunas, batch_size=args.chunk_size, app_id=APP_ID)
+else:
+    lotes = [read_reviews(colunas, app_id=APP_ID)]
+
+# Unigramas e bigramas contados com a mesma tokenização do WordCloud.process_text e somados entre os
+# lotes; as colocações só são decididas no fim, sobre as contagens totais, para que o resultado não
+# dependa do tamanho do lote. Os textos processados vão para o disco lote a lote.
+processador = WordCloud()
+stopwords_nuvem = {palavra.lower() for palavra in processador.stopwords}
+contagens = {categoria: {'unigramas': Counter(), 'bigramas': Counter(), 'ultima': None}
+             for categoria in ('geral', 'positivas', 'negativas')}
+
+
+def contar_termos(texto, contagem):
+    palavras = re.findall(r"\w[\w']*", texto)
+    palavras = [p[:-2] if p.lower().endswith("'s") else p for p in palavras]
+    palavras = [p for p in palavras if not p.isdigit()]
+    if not palavras:
+        return
+    # O bigrama entre o fim do lote anterior e o início deste também conta, como numa passada única
+    anteriores = [contagem['ultima']] + palavras[:-1] if contagem['ultima'] is not None else palavras[:-1]
+    seguintes = palavras if contagem['ultima'] is not None else palavras[1:]
+    contagem['bigramas'].update(f"{a} {b}" for a, b in zip(anteriores, seguintes)
+                                if a.lower() not in stopwords_nuvem and b.lower() not in stopwords_nuvem)
+    contagem['unigramas'].update(p for p in palavras if p.lower() not in stopwords_nuvem)
+    contagem['ultima'] = palavras[-1]
 
-if 'texto_processado' not in df_reviews.columns:
-    print("Realizando pré-processamento dos textos em inglês...")
-    df_reviews['texto_processado'] = df_reviews['texto_review'].apply(preprocessar_texto_en)
-    print("Pré-processamento concluído.")
 
-    texto_geral = " ".join(review for review in df_reviews['texto_processado'])
+def frequencias_com_colocacoes(contagem):
+    """Como unigrams_and_bigrams do wordcloud, mas a partir das contagens acumuladas de todos os lotes."""
+    unigramas, forma_padrao = process_tokens(contagem['unigramas'].elements(), processador.normalize_plurals)
+    bigramas, _ = process_tokens(contagem['bigramas'].elements(), processador.normalize_plurals)
+    originais = dict(unigramas)
+    n_palavras = sum(contagem['unigramas'].values())
+    for bigrama, quantidade in bigramas.items():
+        primeira, segunda = bigrama.split(" ")
+        palavra1, palavra2 = forma_padrao[primeira.lower()], forma_padrao[segunda.lower()]
+        if score(quantidade, originais[palavra1], originais[palavra2], n_palavras) > processador.collocation_threshold:
+            unigramas[palavra1] -= quantidade
+            unigramas[palavra2] -= quantidade
+            unigramas[bigrama] = quantidade
+    return {termo: quantidade for termo, quantidade in unigramas.items() if quantidade > 0}
+
+
+esquema_processadas = pa.schema([("texto_processado", pa.string()), ("foi_recomendado", pa.bool_())])
+print("Realizando pré-processamento dos textos em inglês...")
+with pq.ParquetWriter(ARQUIVO_PROCESSADAS, esquema_processadas) as escritor:
+    for df_reviews in lotes:
+        df_reviews['texto_processado'] = df_reviews['texto_review'].apply(preprocessar_texto_en)
+        escritor.write_table(pa.Table.from_pandas(df_reviews[esquema_processadas.names],
+                                                  schema=esquema_processadas, preserve_index=False))
+
+        positivas = df_reviews['foi_recomendado'] == True
+        contar_termos(" ".join(df_reviews['texto_processado']), contagens['geral'])
+        contar_termos(" ".join(df_reviews.loc[positivas, 'texto_processado']), contagens['positivas'])
+        contar_termos(" ".join(df_reviews.loc[~positivas, 'texto_processado']), contagens['negativas'])
+frequencias = {categoria: frequencias_com_colocacoes(contagem) for categoria, contagem in contagens.items()}
+print("Pré-processamento concluído.")
 
 wordcloud_geral = WordCloud(
     width=800, 
@@ -41,7 +112,7 @@ wordcloud_geral = WordCloud(
     background_color='white', 
     colormap='viridis',
     min_font_size=10
-).generate(texto_geral)
+).generate_from_frequencies(frequencias['geral'])
 
 plt.figure(figsize=(10, 5))
 plt.imshow(wordcloud_geral, interpolation='bilinear')
@@ -51,23 +122,17 @@ plt.savefig("images/wordcloud_geral.png")
 plt.close()
 print("Nuvem de palavras geral salva em 'images/wordcloud_geral.png'")
 
-df_positivas = df_reviews[df_reviews['foi_recomendado'] == True]
-df_negativas = df_reviews[df_reviews['foi_recomendado'] == False]
-
-texto_positivo = " ".join(review for review in df_positivas['texto_processado'])
-texto_negativo = " ".join(review for review in df_negativas['texto_processado'])
-
 # Criando a figura com dois subplots, lado a lado
 fig, axes = plt.subplots(1, 2, figsize=(20, 10))
 
 # Nuvem Positiva
-wordcloud_pos = WordCloud(width=800, height=800, background_color='white', colormap='Greens').generate(texto_positivo)
+wordcloud_pos = WordCloud(width=800, height=800, background_color='white', colormap='Greens').generate_from_frequencies(frequencias['positivas'])
 axes[0].imshow(wordcloud_pos, interpolation='bilinear')
 axes[0].set_title('Palavras em Reviews Positivas', fontsize=20)
 axes[0].axis("off")
 
 # Nuvem Negativa
-wordcloud_neg = WordCloud(width=800, height=800, background_color='black', colormap='Reds').generate(texto_negativo)
+wordcloud_neg = WordCloud(width=800, height=800, background_color='black', colormap='Reds').generate_from_frequencies(frequencias['negativas'])
 axes[1].imshow(wordcloud_neg, interpolation='bilinear')
 axes[1].set_title('Palavras em Reviews Negativas', fontsize=20)
 axes[1].axis("off")
@@ -0,0 +1,27 @@
+import os
+import sys
+
+import networkx as nx
+import pytest
+import scipy.sparse as sp
+
+# Os módulos ficam em code/ e se importam pelo nome (como ao rodar os scripts de dentro de code/)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "code"))
+
+
+@pytest.fixture
+def random_libraries():
+    """Fábrica de matrizes de posse aleatórias (usuários x jogos, CSR binária), reprodutíveis pela semente."""
+    def build(num_users, num_games, density, seed):
+        matrix = sp.random(num_users, num_games, density=density, format="csr", random_state=seed)
+        matrix.data[:] = 1
+        return matrix
+    return build
+
+
+@pytest.fixture
+def random_graph():
+    """Fábrica de grafos G(n, m) aleatórios do NetworkX (nós 0..n-1), reprodutíveis pela semente."""
+    def build(n, m, seed):
+        return nx.gnm_random_graph(n, m, seed=seed)
+    return build
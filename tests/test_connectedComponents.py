@@ -0,0 +1,26 @@
+import networkx as nx
+import numpy as np
+
+from connectedComponents import components_from_csr, giant_component, restrict_to_giant_component
+from csrGraph import graph_to_csr
+
+
+def test_components_match_networkx(random_graph):
+    graph = random_graph(500, 400, seed=0)  # esparso: muitos componentes e nós isolados
+    csr = graph_to_csr(graph)
+    uf = components_from_csr(csr, chunk_edges=37)
+    labels = uf.component_labels()
+
+    found = {}
+    for node, label in zip(csr.nodes, labels.tolist()):
+        found.setdefault(label, set()).add(node)
+    expected = list(nx.connected_components(graph))
+    assert sorted(map(sorted, found.values())) == sorted(map(sorted, expected))
+    assert uf.component_sizes().tolist() == sorted(map(len, expected), reverse=True)
+
+    largest = max(expected, key=len)
+    assert found[0] == largest
+    giant, kept = giant_component(csr)
+    assert set(giant.nodes) == largest
+    np.testing.assert_array_equal(np.asarray(csr.nodes)[kept], giant.nodes)
+    assert nx.utils.graphs_equal(restrict_to_giant_component(graph), graph.subgraph(largest))
@@ -0,0 +1,63 @@
+import numpy as np
+from scipy import stats
+
+import correlationTests
+from correlationTests import bootstrap_ci, correlation, correlation_report, permutation_test
+
+
+def _data(n, seed):
+    rng = np.random.default_rng(seed)
+    x = rng.poisson(3, n).astype(float)  # com empates
+    return x, 0.3 * x + rng.normal(size=n)
+
+
+def test_correlation_matches_scipy():
+    x, y = _data(500, 0)
+    assert np.isclose(correlation(x, y, "pearson"), stats.pearsonr(x, y)[0])
+    assert np.isclose(correlation(x, y, "spearman"), stats.spearmanr(x, y)[0])
+
+
+def test_spearman_bootstrap_is_pearson_on_fixed_ranks():
+    x, y = _data(2_000, 1)
+    spearman = bootstrap_ci(x, y, "spearman", 300, seed=3)
+    on_ranks = bootstrap_ci(stats.rankdata(x), stats.rankdata(y), "pearson", 300, seed=3)
+    assert np.isclose(spearman["ic_inferior"], on_ranks["ic_inferior"])
+    assert np.isclose(spearman["ic_superior"], on_ranks["ic_superior"])
+    assert spearman["ic_inferior"] < spearman["r"] < spearman["ic_superior"]
+
+
+def test_bootstrap_interval_close_to_scipy():
+    x, y = _data(1_000, 2)
+    ours = bootstrap_ci(x, y, "pearson", 2_000, seed=0)
+    reference = stats.bootstrap((x, y), lambda a, b: stats.pearsonr(a, b)[0], paired=True, vectorized=False,
+                                n_resamples=2_000, method="percentile", random_state=0).confidence_interval
+    assert abs(ours["ic_inferior"] - reference.low) < 0.01
+    assert abs(ours["ic_superior"] - reference.high) < 0.01
+
+
+def test_permutation_p_value():
+    rng = np.random.default_rng(4)
+    x, y = rng.normal(size=200), rng.normal(size=200)
+    ours = permutation_test(x, y, "pearson", 2_000, seed=0)["p"]
+    reference = stats.permutation_test((x,), lambda a: stats.pearsonr(a, y)[0], permutation_type="pairings",
+                                       n_resamples=2_000, random_state=0).pvalue
+    assert abs(ours - reference) < 0.05
+    assert permutation_test(*_data(500, 5), "spearman", 500, seed=0)["p"] <= 1 / 501 + 1e-12
+
+
+def test_report_respects_requested_sizes():
+    report = correlation_report(*_data(300, 6), n_permutations=50, n_resamples=50, seed=0)
+    assert set(report) == {"pearson", "spearman"}
+    assert report["spearman"]["permutacoes"] == 50
+
+
+def test_report_shares_resamples_and_does_not_depend_on_workers(monkeypatch):
+    x, y = _data(400, 7)
+    monkeypatch.setattr(correlationTests, "CHUNK_ELEMENTS", 400 * 30)  # vários lotes
+    report = correlation_report(x, y, n_permutations=200, n_resamples=200, seed=1, workers=1)
+    assert correlation_report(x, y, n_permutations=200, n_resamples=200, seed=1, workers=2) == report
+    for method in ("pearson", "spearman"):
+        assert permutation_test(x, y, method, 200, seed=1)["extremos"] == report[method]["extremos"]
+        interval = bootstrap_ci(x, y, method, 200, seed=1)
+        assert np.isclose(interval["ic_inferior"], report[method]["ic_inferior"])
+        assert np.isclose(interval["ic_superior"], report[method]["ic_superior"])
@@ -0,0 +1,28 @@
+import warnings
+
+import numpy as np
+
+from degreeDistribution import ccdf, degree_counts, fit_power_law, log_binned_histogram
+
+
+def test_all_isolated_nodes_give_empty_distribution():
+    counts = degree_counts(np.zeros(10, dtype=np.int64))
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        degrees, probabilities = ccdf(counts)
+        edges, density = log_binned_histogram(counts)
+        fit = fit_power_law(counts)
+        fixed = fit_power_law(counts, xmin=3)
+    assert len(degrees) == 0 and len(probabilities) == 0
+    assert not density.any()
+    assert fit == {"alpha": 0.0, "alpha_erro": 0.0, "xmin": 1, "n_cauda": 0, "ks": 0.0}
+    assert fixed["n_cauda"] == 0 and fixed["xmin"] == 3
+
+
+def test_power_law_fit_recovers_exponent():
+    rng = np.random.default_rng(0)
+    degrees = np.floor(rng.pareto(1.5, 20_000) + 1).astype(np.int64)
+    fit = fit_power_law(degree_counts(degrees))
+    # O arredondamento para baixo distorce os graus pequenos: o xmin escolhido pelo KS tem de pulá-los
+    assert fit["xmin"] > 1
+    assert abs(fit["alpha"] - 2.5) < 0.2
@@ -0,0 +1,70 @@
+import networkx as nx
+import numpy as np
+
+from csrGraph import graph_to_csr, with_steamids
+from edgeStream import EdgeStreamWriter, finalize_edge_stream, read_edge_stream
+from incrementalMetrics import CrawlProgressMetrics
+from steamIds import SteamIdIndex
+
+BASE = 76561198000000000
+
+
+def _crawl(tmp_path, graph, private=()):
+    """Simula o crawl de getUserNetwork: cada membro lista os amigos (os privados não listam nenhum)."""
+    ids = np.array([BASE + 7 * node for node in graph.nodes()], dtype=np.uint64)
+    members = SteamIdIndex(ids)
+    metrics = CrawlProgressMetrics(len(members))
+    path = str(tmp_path / "rede.edges")
+    with EdgeStreamWriter(path) as writer:
+        for i, node in enumerate(graph.nodes()):
+            friends = [] if node in private else [BASE + 7 * f for f in graph.neighbors(node)]
+            friends_in_group = members.lookup(friends)
+            metrics.add_friends(i, friends_in_group[friends_in_group >= 0], listed=len(friends) > 0)
+            writer.append(ids[i], members.ids[friends_in_group[friends_in_group >= 0]])
+    return path, members, metrics
+
+
+def test_finalize_matches_networkx(tmp_path):
+    graph = nx.relabel_nodes(nx.gnm_random_graph(300, 1500, seed=1), lambda n: (n * 37) % 300)
+    path, members, _ = _crawl(tmp_path, graph)
+    assert len(read_edge_stream(path)) == 2 * graph.number_of_edges()
+
+    csr = finalize_edge_stream(path, members)
+    expected = graph_to_csr(nx.relabel_nodes(graph, lambda n: str(BASE + 7 * n)))
+    assert csr.ids.dtype == np.uint64
+    np.testing.assert_array_equal(csr.ids, with_steamids(expected).ids)
+    np.testing.assert_array_equal(csr.indptr, expected.indptr)
+    for i in range(csr.n):
+        np.testing.assert_array_equal(csr.indices[csr.indptr[i]:csr.indptr[i + 1]],
+                                      np.sort(expected.indices[expected.indptr[i]:expected.indptr[i + 1]]))
+
+
+def test_finalize_drops_loops_unknown_ids_and_keeps_isolated_nodes(tmp_path):
+    path = str(tmp_path / "rede.edges")
+    with EdgeStreamWriter(path) as writer:
+        writer.append(BASE + 1, np.array([BASE + 1, BASE + 2, BASE + 99], dtype=np.uint64))
+        writer.append(BASE + 2, np.array([BASE + 1], dtype=np.uint64))
+    with EdgeStreamWriter(path, append=True) as writer:
+        assert writer.count == 3
+    csr = finalize_edge_stream(path, np.array([BASE + 3, BASE + 2, BASE + 1], dtype=np.uint64))
+    assert csr.ids.tolist() == [BASE + 3, BASE + 2, BASE + 1]
+    assert csr.degrees.tolist() == [0, 1, 1]
+
+    # Sem lista de nós: os que aparecem nas arestas, em ordem crescente
+    assert finalize_edge_stream(path).ids.tolist() == [BASE + 1, BASE + 2, BASE + 99]
+
+
+def test_crawl_progress_metrics_match_networkx(tmp_path):
+    graph = nx.powerlaw_cluster_graph(400, 3, 0.3, seed=2)
+    graph.add_nodes_from(range(400, 420))  # isolados
+    private = set(range(0, 400, 9))
+    _, _, metrics = _crawl(tmp_path, graph, private)
+
+    # Amizades com perfis privados só aparecem pelo outro lado; entre dois privados não aparecem
+    seen = graph.copy()
+    seen.remove_edges_from([(u, v) for u, v in graph.edges() if u in private and v in private])
+    assert metrics.num_edges == seen.number_of_edges()
+    assert metrics.degrees.tolist() == [seen.degree(n) for n in seen.nodes()]
+    components = list(nx.connected_components(seen))
+    assert metrics.num_components == len(components)
+    assert metrics.largest_component == max(map(len, components))
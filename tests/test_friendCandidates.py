@@ -0,0 +1,28 @@
+import networkx as nx
+import numpy as np
+
+from csrGraph import graph_to_csr
+from friendCandidates import friend_of_friend_candidates
+
+
+def test_adamic_adar_top_k_matches_networkx(random_graph):
+    graph = random_graph(150, 450, seed=0)
+    csr = graph_to_csr(graph)
+    k = 5
+    result = friend_of_friend_candidates(csr, k=k, block_size=16, workers=1)
+    assert friend_of_friend_candidates(csr, k=k, block_size=16, workers=2)["adamic_adar"][1].tolist() == \
+        result["adamic_adar"][1].tolist()
+    neighbors, scores = result["adamic_adar"]
+
+    expected = {}
+    for u, v, score in nx.adamic_adar_index(graph):
+        if score > 0:
+            expected.setdefault(u, {})[v] = score
+            expected.setdefault(v, {})[u] = score
+    for node in csr.nodes:
+        candidates = expected.get(node, {})
+        best = sorted(candidates.values(), reverse=True)[:k]
+        np.testing.assert_allclose(scores[node, :len(best)], best)
+        assert (neighbors[node, len(best):] == -1).all()
+        for candidate, score in zip(neighbors[node, :len(best)].tolist(), scores[node, :len(best)].tolist()):
+            assert np.isclose(candidates[candidate], score)
@@ -0,0 +1,24 @@
+import networkx as nx
+import numpy as np
+
+from csrGraph import graph_to_csr
+from gameAssortativity import game_assortativity
+
+
+def test_assortativity_matches_networkx(random_graph, random_libraries):
+    graph = random_graph(300, 1_200, seed=0)
+    matrix = random_libraries(300, 20, 0.1, seed=1).tolil()
+    matrix[:, 18] = 0  # ninguém possui
+    matrix[:, 19] = 1  # todos possuem
+    matrix = matrix.tocsr()
+    appids = np.arange(1_000, 1_020)
+    result = game_assortativity(graph_to_csr(graph), matrix, appids)
+
+    dense = matrix.toarray() > 0
+    for column in range(18):
+        nx.set_node_attributes(graph, dict(enumerate(dense[:, column].tolist())), "possui")
+        assert np.isclose(result["assortatividade"][column], nx.attribute_assortativity_coefficient(graph, "possui"))
+        owners = np.flatnonzero(dense[:, column])
+        assert result["arestas_entre_donos"][column] == graph.subgraph(owners.tolist()).number_of_edges()
+    assert result["assortatividade"][18:].isna().all()
+    assert result["appid"].tolist() == appids.tolist()
@@ -0,0 +1,27 @@
+import numpy as np
+
+from gameLibrary import LibraryMatrix
+from ownershipMatrix import build_ownership_matrix
+
+
+def test_library_matrix_matches_sets_and_ownership_matrix(random_libraries):
+    ownership = random_libraries(200, 300, 0.05, seed=0)
+    appids = np.random.default_rng(0).choice(100_000, 300, replace=False)
+    libraries = [set(appids[ownership.indices[ownership.indptr[row]:ownership.indptr[row + 1]]].tolist())
+                 for row in range(ownership.shape[0])] + [None, set()]
+    matrix = LibraryMatrix.from_libraries(libraries)
+    ownership, appids = build_ownership_matrix(libraries)
+    np.testing.assert_array_equal(matrix.appids, appids)
+    assert (matrix.matrix != ownership).nnz == 0
+
+    rng = np.random.default_rng(1)
+    u, v = rng.integers(0, len(libraries), 500), rng.integers(0, len(libraries), 500)
+    sets = [lib or set() for lib in libraries]
+    expected = [len(sets[a] & sets[b]) / len(sets[a] | sets[b]) if sets[a] | sets[b] else 0.0
+                for a, b in zip(u.tolist(), v.tolist())]
+    np.testing.assert_allclose(matrix.pairwise_jaccard(u, v), expected)
+
+    owners = {appid: sum(appid in lib for lib in sets) for appid in matrix.appids.tolist()}
+    assert matrix.game_frequencies().tolist() == [owners[a] for a in matrix.appids.tolist()]
+    assert matrix.sizes.tolist() == [len(lib) for lib in sets]
+    assert set(matrix.library(3).tolist()) == sets[3]
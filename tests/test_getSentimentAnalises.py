@@ -0,0 +1,16 @@
+import numpy as np
+from sklearn.metrics import confusion_matrix
+
+from getSentimentAnalises import contagens_confusao
+
+
+def test_matches_confusion_matrix():
+    rng = np.random.default_rng(0)
+    y_real, y_previsto = rng.random(500) < 0.6, rng.random(500) < 0.5
+    np.testing.assert_array_equal(contagens_confusao(y_real, y_previsto),
+                                  confusion_matrix(y_real, y_previsto, labels=[False, True]))
+
+
+def test_empty_batch_counts_nothing():
+    cm = contagens_confusao(np.zeros(0, dtype=bool), np.zeros(0, dtype=bool))
+    assert cm.shape == (2, 2) and cm.sum() == 0
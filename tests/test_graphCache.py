@@ -0,0 +1,86 @@
+import os
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from csrGraph import edges_to_csr, graph_to_csr, load_csr, save_csr
+from graphCache import CACHE_SUFFIX, csr_to_graph, load_csr_cached, load_graph_cached, write_gml_cached
+
+
+def _edges(G):
+    return {frozenset(edge) for edge in G.edges()}
+
+
+@pytest.mark.parametrize("labels", [
+    ["76561198000000001", "76561198000000002", "3"],
+    ["007", "08", "9"],  # zeros à esquerda
+    [str(2 ** 64), "1"],  # não cabe em uint64
+    ["a", "b", "c"],
+])
+def test_save_and_load_keep_labels(tmp_path, labels):
+    csr = edges_to_csr(len(labels), [0], [1], labels)
+    save_csr(str(tmp_path / "g.npz"), csr, extra=np.int64(5))
+    loaded, metadata = load_csr(str(tmp_path / "g.npz"))
+    assert loaded.nodes == labels
+    np.testing.assert_array_equal(loaded.indptr, csr.indptr)
+    np.testing.assert_array_equal(loaded.indices, csr.indices)
+    assert int(metadata["extra"]) == 5
+
+
+def test_cold_and_cached_reads_agree(tmp_path):
+    G = nx.Graph()
+    G.add_nodes_from(["007", "08", "76561198000000001", "isolado"])
+    G.add_edges_from([("007", "08"), ("08", "76561198000000001")])
+    path = str(tmp_path / "rede.gml")
+    nx.write_gml(G, path)
+
+    cold = load_graph_cached(path)
+    assert os.path.exists(path + CACHE_SUFFIX)
+    cached = load_graph_cached(path)
+    for H in (cold, cached):
+        assert list(H.nodes()) == list(nx.read_gml(path).nodes())
+        assert _edges(H) == _edges(G)
+
+
+def test_cache_is_rebuilt_when_the_gml_changes(tmp_path):
+    path = str(tmp_path / "rede.gml")
+    nx.write_gml(nx.path_graph(["1", "2", "3"]), path)
+    assert load_csr_cached(path).indices.size == 4
+
+    nx.write_gml(nx.complete_graph(["1", "2", "3", "4"]), path)
+    assert load_csr_cached(path).indices.size == 12
+
+    # Só o mtime mudou: o hash do conteúdo confirma o cache
+    os.utime(path, ns=(0, 0))
+    assert load_csr_cached(path).indices.size == 12
+
+
+def test_write_gml_cached_round_trip(tmp_path):
+    G = nx.relabel_nodes(nx.gnm_random_graph(60, 150, seed=3), lambda n: str(76561198000000000 + n))
+    G.add_node("76561199999999999")
+    csr = graph_to_csr(G)
+    path = str(tmp_path / "rede.gml")
+    write_gml_cached(csr, path)
+    assert _edges(nx.read_gml(path)) == _edges(G)
+    assert list(nx.read_gml(path).nodes()) == csr.nodes
+    assert _edges(csr_to_graph(load_csr_cached(path))) == {frozenset(map(int, edge)) for edge in G.edges()}
+
+
+def test_steamid_labels_are_parsed_once_and_kept_as_uint64(tmp_path):
+    ids = [76561198000000000 + 5 * n for n in range(40)]
+    G = nx.relabel_nodes(nx.gnm_random_graph(40, 90, seed=4), dict(enumerate(map(str, ids))))
+    path = str(tmp_path / "rede.gml")
+    nx.write_gml(G, path)
+
+    for _ in range(2):  # leitura fria e pelo cache
+        csr = load_csr_cached(path)
+        assert csr.ids.dtype == np.uint64 and csr.ids.tolist() == ids and csr.labels is None
+        H = csr_to_graph(csr)
+        assert list(H.nodes()) == ids
+        assert _edges(H) == {frozenset(map(int, edge)) for edge in G.edges()}
+
+    # A escrita formata os ids de volta para o mesmo texto
+    write_gml_cached(csr, str(tmp_path / "copia.gml"))
+    assert list(nx.read_gml(str(tmp_path / "copia.gml")).nodes()) == list(G.nodes())
+    assert load_csr_cached(str(tmp_path / "copia.gml")).ids.tolist() == ids
@@ -0,0 +1,91 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from csrGraph import graph_to_csr
+from graphSnapshots import SnapshotStore, canonical_snapshot, degree_changes, diff_summary, snapshot_diff
+
+BASE = 76561198000000000
+
+
+def _crawls(num_crawls, seed):
+    """Crawls sucessivos de um grupo com entrada e saída de membros e de amizades."""
+    rng = np.random.default_rng(seed)
+    nodes = set(range(200))
+    edges = {tuple(sorted(map(int, rng.choice(200, 2, replace=False)))) for _ in range(600)}
+    crawls = []
+    for k in range(num_crawls):
+        nodes -= set(rng.choice(sorted(nodes), 10, replace=False).tolist())
+        nodes |= set(range(200 + 15 * k, 215 + 15 * k))
+        edges = {(u, v) for u, v in edges if u in nodes and v in nodes}
+        edges -= set(list(sorted(edges))[:20])
+        members = sorted(nodes)
+        edges |= {tuple(sorted(map(int, rng.choice(members, 2, replace=False)))) for _ in range(60)}
+        G = nx.Graph()
+        G.add_nodes_from(str(BASE + n) for n in nodes)
+        G.add_edges_from((str(BASE + u), str(BASE + v)) for u, v in edges)
+        crawls.append(G)
+    return crawls
+
+
+def _as_sets(snapshot):
+    return set(snapshot.nodes.tolist()), set(map(tuple, snapshot.edges.tolist()))
+
+
+def _expected_sets(G):
+    return ({int(n) for n in G.nodes()}, {tuple(sorted((int(u), int(v)))) for u, v in G.edges()})
+
+
+def test_store_round_trip_with_keyframes_and_deltas(tmp_path):
+    crawls = _crawls(7, seed=1)
+    store = SnapshotStore(str(tmp_path), keyframe_interval=3)
+    for k, G in enumerate(crawls):
+        previous, diff = store.add_csr(f"2026-{k + 1:02d}", graph_to_csr(G))
+        assert (previous is None) == (k == 0)
+        if k:
+            assert _as_sets(previous) == _expected_sets(crawls[k - 1])
+
+    reopened = SnapshotStore(str(tmp_path))
+    assert [entry["keyframe"] for entry in reopened.entries] == [True, False, False, True, False, False, True]
+    for (label, snapshot), G in zip(reopened.iter_snapshots(), crawls):
+        assert _as_sets(snapshot) == _expected_sets(G)
+        np.testing.assert_array_equal(reopened.load(label).edges, snapshot.edges)
+    assert len(reopened.churn()) == len(crawls) - 1
+
+
+def test_diff_and_degree_changes_match_sets_and_networkx(tmp_path):
+    old_graph, _, _, new_graph = _crawls(4, seed=2)
+    old, new = (canonical_snapshot(*_arrays(G)) for G in (old_graph, new_graph))
+    diff = snapshot_diff(old, new)
+    old_nodes, old_edges = _expected_sets(old_graph)
+    new_nodes, new_edges = _expected_sets(new_graph)
+    assert set(diff.nodes_added.tolist()) == new_nodes - old_nodes
+    assert set(diff.nodes_removed.tolist()) == old_nodes - new_nodes
+    assert set(map(tuple, diff.edges_added.tolist())) == new_edges - old_edges
+    assert set(map(tuple, diff.edges_removed.tolist())) == old_edges - new_edges
+
+    changes = degree_changes(old, new)
+    common = set(old_graph) & set(new_graph)
+    assert len(changes) == sum(old_graph.degree(n) != new_graph.degree(n) for n in common)
+    for row in changes.itertuples():
+        assert (row.grau_antes, row.grau_depois) == (old_graph.degree(row.steamid), new_graph.degree(row.steamid))
+    summary = diff_summary(old, new, diff)
+    assert summary["amizades_adicionadas"] == len(new_edges - old_edges)
+
+
+def _arrays(G):
+    nodes = [int(n) for n in G.nodes()]
+    src, dst = zip(*((int(u), int(v)) for u, v in G.edges()))
+    return np.array(nodes, dtype=np.uint64), np.array(src, dtype=np.uint64), np.array(dst, dtype=np.uint64)
+
+
+def test_labels_are_unique(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    snapshot = canonical_snapshot(*_arrays(nx.relabel_nodes(nx.path_graph(3), lambda n: str(BASE + n))))
+    label = store.unique_label("2026-10-19_120000")
+    store.add(label, snapshot)
+    assert store.unique_label(label) == f"{label}_2"
+    store.add(store.unique_label(label), snapshot)
+    assert store.unique_label(label) == f"{label}_3"
+    with pytest.raises(ValueError):
+        store.add(label, snapshot)
@@ -0,0 +1,33 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from incrementalMetrics import IncrementalGraphMetrics
+
+
+def test_incremental_triangles_and_clustering_match_networkx():
+    G = nx.gnp_random_graph(120, 0.08, seed=3)
+    metrics = IncrementalGraphMetrics()
+    metrics.add_nodes_from(G.nodes)
+    rng = np.random.default_rng(3)
+    # Cada amizade chega pelas listas dos dois lados, como no crawl
+    visited = set()
+    for step, node in enumerate(rng.permutation(G.number_of_nodes()).tolist()):
+        metrics.add_friends(node, sorted(G[node]))
+        visited.add(node)
+        if step == 60:
+            # No meio do crawl, o grafo parcial tem as arestas de algum nó já visitado
+            partial = nx.Graph()
+            partial.add_nodes_from(G)
+            partial.add_edges_from((u, v) for u, v in G.edges if u in visited or v in visited)
+            assert metrics.total_triangles == sum(nx.triangles(partial).values()) // 3
+            assert metrics.average_clustering() == pytest.approx(nx.average_clustering(partial))
+
+    triangles = nx.triangles(G)
+    clustering = nx.clustering(G)
+    assert metrics.num_edges == G.number_of_edges()
+    assert metrics.total_triangles == sum(triangles.values()) // 3
+    assert all(metrics.triangles[v] == triangles[v] for v in G)
+    assert all(metrics.local_clustering(v) == pytest.approx(clustering[v]) for v in G)
+    assert metrics.average_clustering() == pytest.approx(nx.average_clustering(G))
+    assert metrics.num_components == nx.number_connected_components(G)
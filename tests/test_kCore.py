@@ -0,0 +1,18 @@
+import networkx as nx
+
+from csrGraph import graph_to_csr
+from kCore import core_numbers, k_core, restrict_to_min_core
+
+
+def test_core_numbers_match_networkx(random_graph):
+    graph = random_graph(400, 1_600, seed=0)
+    graph.add_nodes_from(range(400, 405))  # nós isolados ficam com core 0
+    csr = graph_to_csr(graph)
+    expected = nx.core_number(graph)
+    cores = core_numbers(csr)
+    assert cores.tolist() == [expected[node] for node in csr.nodes]
+
+    k = int(cores.max())
+    core, _ = k_core(csr, k, cores)
+    assert set(core.nodes) == set(nx.k_core(graph, k))
+    assert nx.utils.graphs_equal(restrict_to_min_core(graph, 3), nx.k_core(graph, 3))
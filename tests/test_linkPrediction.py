@@ -0,0 +1,51 @@
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from linkPrediction import FEATURES, stratified_test_mask, train_and_evaluate
+
+
+def _features(num_pairs, seed):
+    # Atributos em escalas bem diferentes (frações, contagens, graus), como os de PairFeaturizer
+    rng = np.random.default_rng(seed)
+    labels = (rng.random(num_pairs) < 0.5).astype(np.int8)
+    features = np.column_stack([
+        rng.beta(1, 8, num_pairs) + 0.05 * labels,
+        rng.beta(1, 8, num_pairs),
+        rng.poisson(2 + 6 * labels),
+        rng.integers(1, 50, num_pairs),
+        rng.integers(50, 800, num_pairs),
+        rng.integers(1, 10, num_pairs),
+        rng.integers(10, 40, num_pairs),
+    ]).astype(np.float32)
+    assert features.shape[1] == len(FEATURES)
+    return features, labels
+
+
+def test_sgd_matches_logistic_regression():
+    for seed in range(3):
+        features, labels = _features(20_000, seed)
+        is_test = stratified_test_mask(labels, 0.2, np.random.default_rng(seed))
+        result = train_and_evaluate(features, labels, is_test, "sgd", seed=seed)
+        reference = make_pipeline(StandardScaler(), LogisticRegression(max_iter=1000))
+        reference.fit(features[~is_test], labels[~is_test])
+        expected = roc_auc_score(labels[is_test], reference.decision_function(features[is_test]))
+        assert result["auc"] >= expected - 0.01
+        assert result["coeficientes"]["vizinhos_comuns"] > 0
+
+
+def test_single_class_test_split_gives_nan_auc():
+    features, labels = _features(1_000, 0)
+    is_test = (labels == 1) & (np.arange(len(labels)) % 5 == 0)
+    result = train_and_evaluate(features, labels, is_test, "sgd", seed=0)
+    assert np.isnan(result["auc"]) and np.isnan(result["auc_jaccard"])
+
+
+def test_stratified_test_mask_keeps_both_classes():
+    labels = np.array([1] * 3 + [0] * 97, dtype=np.int8)
+    for seed in range(20):
+        is_test = stratified_test_mask(labels, 0.1, np.random.default_rng(seed))
+        assert set(labels[is_test].tolist()) == {0, 1}
+        assert set(labels[~is_test].tolist()) == {0, 1}
@@ -0,0 +1,50 @@
+import networkx as nx
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from csrGraph import edge_keys, graph_to_csr, has_edges
+from minhashLSH import MAX_BUCKET_SIZE, sample_non_edges, similar_pairs
+from ownershipMatrix import edge_jaccard
+
+
+def test_oversized_bucket_pairs_are_kept(random_libraries):
+    identical = 1_500
+    assert identical > MAX_BUCKET_SIZE
+    library = sp.csr_matrix(np.tile((np.arange(50) % 3 == 0).astype(np.float32), (identical, 1)))
+    others = random_libraries(300, 50, 0.2, seed=1)
+    matrix = sp.vstack([library, others]).tocsr()
+
+    pairs, jaccard = similar_pairs(matrix, 0.9)
+    inside = pairs[(pairs[:, 0] < identical) & (pairs[:, 1] < identical)]
+    assert len(inside) == identical * (identical - 1) // 2
+    assert np.all(jaccard >= 0.9)
+
+
+def test_similar_pairs_against_brute_force(random_libraries):
+    matrix = random_libraries(400, 30, 0.3, seed=2)
+    matrix = sp.vstack([matrix, matrix[:40]]).tocsr()  # alguns pares com Jaccard 1
+    u, v = np.triu_indices(matrix.shape[0], k=1)
+    exact = edge_jaccard(matrix, u, v)
+    expected = {(a, b) for a, b, j in zip(u.tolist(), v.tolist(), exact.tolist()) if j >= 0.8}
+
+    pairs, jaccard = similar_pairs(matrix, 0.8)
+    found = set(map(tuple, pairs.tolist()))
+    assert found <= expected
+    assert len(found) >= 0.95 * len(expected)
+    np.testing.assert_allclose(jaccard, edge_jaccard(matrix, pairs[:, 0], pairs[:, 1]))
+
+
+@pytest.mark.parametrize("graph", [nx.empty_graph(1), nx.complete_graph(6), nx.empty_graph(0)])
+def test_sample_non_edges_without_non_edges_raises(graph):
+    with pytest.raises(ValueError):
+        sample_non_edges(graph_to_csr(graph), 10)
+
+
+def test_sample_non_edges_on_almost_complete_graph():
+    graph = nx.complete_graph(6)
+    graph.remove_edge(0, 1)
+    csr = graph_to_csr(graph)
+    pairs = sample_non_edges(csr, 100, seed=0)
+    assert len(pairs) == 1
+    assert not has_edges(edge_keys(csr), csr.n, pairs[:, 0], pairs[:, 1]).any()
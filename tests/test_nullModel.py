@@ -0,0 +1,27 @@
+import networkx as nx
+import numpy as np
+
+from nullModel import degree_preserving_rewire, null_distribution
+
+
+def test_rewire_preserves_degrees_without_loops_or_multi_edges(random_graph):
+    graph = random_graph(200, 800, seed=0)
+    src, dst = map(np.array, zip(*graph.edges()))
+    new_src, new_dst = degree_preserving_rewire(src, dst, 200, swaps_per_edge=5, seed=1)
+
+    rewired = nx.Graph()
+    rewired.add_nodes_from(graph)
+    rewired.add_edges_from(zip(new_src.tolist(), new_dst.tolist()))
+    assert nx.number_of_selfloops(rewired) == 0
+    assert rewired.number_of_edges() == len(new_src) == graph.number_of_edges()  # sem arestas repetidas
+    assert dict(rewired.degree()) == dict(graph.degree())
+    assert len(set(map(frozenset, rewired.edges())) & set(map(frozenset, graph.edges()))) < 0.2 * len(src)
+
+
+def test_null_distribution_does_not_depend_on_workers(random_graph, random_libraries):
+    graph = random_graph(100, 300, seed=2)
+    src, dst = map(np.array, zip(*graph.edges()))
+    matrix = random_libraries(100, 40, 0.2, seed=3)
+    serial = null_distribution(matrix, src, dst, n_rewirings=6, swaps_per_edge=2, workers=1, seed=4)
+    parallel = null_distribution(matrix, src, dst, n_rewirings=6, swaps_per_edge=2, workers=2, seed=4)
+    np.testing.assert_array_equal(serial["nulo"], parallel["nulo"])
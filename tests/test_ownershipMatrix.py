@@ -0,0 +1,34 @@
+import numpy as np
+
+from ownershipMatrix import (binary_matrix, build_ownership_matrix, build_playtime_matrix, edge_cosine,
+                             edge_weighted_jaccard, row_intersections)
+
+
+def _playtime_libraries(seed):
+    rng = np.random.default_rng(seed)
+    return [{int(appid): int(rng.integers(0, 500)) for appid in rng.choice(80, rng.integers(0, 25), replace=False)}
+            for _ in range(60)]
+
+
+def test_intersections_and_weighted_similarities_match_brute_force():
+    libraries = _playtime_libraries(0)
+    ownership, appids = build_ownership_matrix(libraries)
+    playtime = build_playtime_matrix(libraries, appids)
+    rng = np.random.default_rng(1)
+    u, v = rng.integers(0, len(libraries), 300), rng.integers(0, len(libraries), 300)
+
+    played = [{appid for appid, minutes in lib.items() if minutes > 0} for lib in libraries]
+    binary = binary_matrix(playtime)
+    assert row_intersections(binary, u, v).tolist() == [len(played[a] & played[b]) for a, b in zip(u, v)]
+    assert row_intersections(ownership, u, v).tolist() == [len(libraries[a].keys() & libraries[b].keys())
+                                                           for a, b in zip(u, v)]
+
+    dense = playtime.toarray().astype(np.float64)
+    minimum, maximum = np.minimum(dense[u], dense[v]).sum(axis=1), np.maximum(dense[u], dense[v]).sum(axis=1)
+    expected = np.divide(minimum, maximum, out=np.zeros(len(u)), where=maximum > 0)
+    np.testing.assert_allclose(edge_weighted_jaccard(playtime, u, v), expected, rtol=1e-5)
+
+    norms = np.linalg.norm(dense, axis=1)
+    expected = np.divide((dense[u] * dense[v]).sum(axis=1), norms[u] * norms[v],
+                         out=np.zeros(len(u)), where=norms[u] * norms[v] > 0)
+    np.testing.assert_allclose(edge_cosine(playtime, u, v), expected, rtol=1e-5, atol=1e-7)
@@ -0,0 +1,30 @@
+import pandas as pd
+
+from reviewStore import read_reviews, write_reviews
+
+
+def _reviews(steamids, texto="ok", mes_base=1_700_000_000):
+    return [{"steamid": steamid, "texto_review": f"{texto} {steamid}", "foi_recomendado": steamid % 2 == 0,
+             "votos_uteis": 1, "data_postagem": mes_base + steamid * 86_400 * 20} for steamid in steamids]
+
+
+def test_rewriting_the_same_reviews_does_not_duplicate(tmp_path):
+    root = str(tmp_path / "reviews")
+    write_reviews(10, _reviews(range(10)), root)
+    write_reviews(10, _reviews(range(10)), root)
+    assert len(read_reviews(root=root, app_id=10)) == 10
+
+
+def test_new_reviews_are_merged_and_replace_old_versions(tmp_path):
+    root = str(tmp_path / "reviews")
+    write_reviews(10, _reviews(range(10)), root)
+    write_reviews(20, _reviews(range(4)), root)
+    write_reviews(10, _reviews(range(5, 15), texto="editada"), root)
+
+    df = read_reviews(root=root, app_id=10).sort_values("steamid")
+    assert df["steamid"].tolist() == list(range(15))
+    textos = dict(zip(df["steamid"], df["texto_review"]))
+    assert textos[0] == "ok 0" and textos[5] == "editada 5" and textos[14] == "editada 14"
+    # Outro app não é tocado
+    assert len(read_reviews(root=root, app_id=20)) == 4
+    assert len(read_reviews(root=root, app_id=10, months=[pd.Timestamp(1_700_000_000, unit="s").strftime("%Y-%m")])) > 0
@@ -0,0 +1,17 @@
+from steamStore import SteamStore
+
+
+def _review(steamid, recomendado):
+    return {"steamid": steamid, "texto_review": "x", "foi_recomendado": recomendado, "votos_uteis": 0,
+            "data_postagem": 1_700_000_000}
+
+
+def test_group_sentiment_only_counts_group_members(tmp_path):
+    with SteamStore(str(tmp_path / "steam.db")) as store:
+        store.insert_users([1, 2], group_member=True)
+        store.insert_users([2, 3, 4])  # BFS: o 2 continua membro, 3 e 4 não são
+        store.insert_reviews(10, [_review(1, True), _review(2, True), _review(3, False), _review(4, False),
+                                  _review(5, False)])
+        df = store.group_reviewer_sentiment(10).set_index("no_grupo")
+    assert df.loc[1, "reviews"] == 2 and df.loc[1, "taxa_recomendacao"] == 1.0
+    assert df.loc[0, "reviews"] == 3 and df.loc[0, "taxa_recomendacao"] == 0.0
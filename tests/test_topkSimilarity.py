@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from topkSimilarity import top_k_similar
+
+
+@pytest.mark.parametrize("metric", ["jaccard", "cosine"])
+def test_top_k_matches_dense_brute_force(metric, random_libraries):
+    matrix = random_libraries(120, 40, 0.15, seed=0)
+    dense = matrix.toarray()
+    intersection = dense @ dense.T
+    sizes = dense.sum(axis=1)
+    if metric == "jaccard":
+        denominator = sizes[:, None] + sizes[None, :] - intersection
+    else:
+        denominator = np.sqrt(sizes[:, None] * sizes[None, :])
+    expected = np.divide(intersection, denominator, out=np.zeros_like(intersection), where=denominator > 0)
+    np.fill_diagonal(expected, -np.inf)
+
+    neighbors, scores = top_k_similar(matrix, k=5, metric=metric, block_size=16, workers=1)
+    best = -np.sort(-expected, axis=1)[:, :5]
+    np.testing.assert_allclose(scores, np.where(best > 0, best, 0), rtol=1e-5)
+    for row in range(matrix.shape[0]):
+        valid = neighbors[row] >= 0
+        np.testing.assert_allclose(expected[row, neighbors[row, valid]], scores[row, valid], rtol=1e-5)
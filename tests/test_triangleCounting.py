@@ -0,0 +1,25 @@
+import networkx as nx
+import numpy as np
+
+from csrGraph import graph_to_csr
+from triangleCounting import average_clustering, clustering_dict, local_clustering, triangle_counts
+
+
+def test_exact_counts_and_clustering_match_networkx(random_graph):
+    graph = random_graph(300, 2_000, seed=0)
+    csr = graph_to_csr(graph)
+    # Blocos pequenos forçam a contagem a atravessar vários lotes de cunhas
+    triangles = nx.triangles(graph)
+    assert triangle_counts(csr, chunk_wedges=500).tolist() == [triangles[node] for node in csr.nodes]
+    assert triangle_counts(csr).tolist() == [triangles[node] for node in csr.nodes]
+
+    expected = nx.clustering(graph)
+    np.testing.assert_allclose(local_clustering(csr), [expected[node] for node in csr.nodes])
+    assert clustering_dict(csr).keys() == expected.keys()
+    assert average_clustering(csr) == nx.average_clustering(graph)
+
+
+def test_sampling_estimates_within_epsilon(random_graph):
+    graph = random_graph(300, 2_000, seed=1)
+    csr = graph_to_csr(graph)
+    assert abs(average_clustering(csr, "sampling", epsilon=0.01, seed=0) - nx.average_clustering(graph)) < 0.01